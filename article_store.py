@@ -0,0 +1,116 @@
+"""
+증분 기사 저장소 - 정규화된 URL 기준으로 실행 간 중복 제거
+이미 관계 추출을 마친 기사는 다시 LLM에 보내지 않음
+"""
+
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from storage_utils import load_json, save_json_atomic
+
+ARTICLE_STORE_FILE = 'article_store.json'
+
+# URL 정규화 시 제거할 추적용 파라미터 (utm_* 는 접두어로 따로 제거)
+# ref/from/sid 등은 언론사에 따라 기사 식별에 쓰이므로 남겨 둠
+TRACKING_PARAMS = {'fbclid', 'gclid'}
+
+
+def canonicalize_url(url):
+    """
+    기사 URL 정규화
+
+    http/https 통일, 호스트 소문자, 추적 파라미터(utm_* 등)와 #fragment 제거,
+    쿼리 파라미터 정렬, 끝 슬래시 제거
+    """
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+class ArticleStore:
+    """정규화 URL -> 기사 메타데이터, 최초/최근 수집 시각, 관계 추출 결과"""
+
+    def __init__(self, path=ARTICLE_STORE_FILE):
+        self.path = path
+        self.articles = load_json(path, {})
+
+    def observe(self, articles):
+        """
+        이번 실행에서 수집된 기사를 기록하고 아직 추출하지 않은 기사만 반환
+        (같은 실행 안에서 여러 피드에 중복된 기사도 하나로 합침).
+        사전 분류로 건너뛴 기사도 추출 완료가 아니므로 다시 반환해 현재 규칙으로 재판정
+        """
+        now = time.time()
+        new_articles = []
+        seen = set()
+        for article in articles:
+            key = canonicalize_url(article['url']) or article['title']
+            if key in seen:
+                continue
+            seen.add(key)
+
+            entry = self.articles.get(key)
+            if entry is None:
+                entry = self.articles[key] = {
+                    'title': article['title'],
+                    'url': article['url'],
+                    'date': article.get('date', ''),
+                    'source': article.get('source', ''),
+                    'first_seen': now,
+                }
+            entry['last_seen'] = now
+
+            if 'extracted_at' not in entry:
+                new_articles.append(article)
+        return new_articles
+
+    def record_extraction(self, article, relationships, skipped=False):
+        """
+        관계 추출 결과 저장 (관계가 없어도 추출 완료로 기록, 사전 분류 판정이 있으면 함께)
+
+        skipped=True 면 사전 분류(on 모드)로 LLM 추출을 건너뛴 기사로, extracted_at 없이
+        triage_skipped_at 만 기록 (추출 완료로 보지 않으므로 평가 정답에서도 빠짐)
+        """
+        key = canonicalize_url(article['url']) or article['title']
+        entry = self.articles.setdefault(key, {
+            'title': article['title'],
+            'url': article['url'],
+            'date': article.get('date', ''),
+            'source': article.get('source', ''),
+            'first_seen': time.time(),
+            'last_seen': time.time(),
+        })
+        if skipped:
+            entry['triage_skipped_at'] = time.time()
+        else:
+            entry['extracted_at'] = time.time()
+            entry['relationships'] = relationships
+            entry.pop('triage_skipped_at', None)
+        if article.get('triage'):
+            entry['triage'] = article['triage']  # 사전 분류 판정 (평가용)
+
+    def all_relationships(self):
+        """저장소 전체의 누적 관계 목록"""
+        relationships = []
+        for entry in self.articles.values():
+            relationships.extend(entry.get('relationships', []))
+        return relationships
+
+    def save(self):
+        save_json_atomic(self.path, self.articles)
+
+    def summary(self):
+        extracted = sum(1 for e in self.articles.values() if 'extracted_at' in e)
+        skipped = sum(1 for e in self.articles.values()
+                      if 'triage_skipped_at' in e and 'extracted_at' not in e)
+        return (f"기사 저장소: 전체 {len(self.articles)}개 (관계 추출 완료 {extracted}개"
+                + (f", 사전 분류로 건너뜀 {skipped}개" if skipped else "") + ")")
@@ -0,0 +1,162 @@
+"""
+기사 사전 분류 - LLM 호출 전에 후보자 동시 언급 수, 관계 단서 어휘, 기사 분류(섹션)로
+관계가 나올 가능성이 낮은 기사는 건너뛰고 애매한 기사는 저렴한 모델로 보냄
+
+모드 (--triage 또는 ARTICLE_TRIAGE 환경변수):
+    off     사전 분류 안 함 (기본)
+    shadow  판정만 기록하고 모든 기사를 기존 모델로 추출 (평가용 정답 수집)
+    on      판정대로 건너뜀/저렴한 모델/기존 모델
+
+판정 근거(features)는 기사 저장소에 함께 기록되어 benchmarks/eval_triage.py 로
+건너뜀 비율과 놓친 관계를 실제 LLM 결과와 비교할 수 있음
+"""
+
+import os
+import re
+import threading
+
+TRIAGE_MODES = ('off', 'shadow', 'on')
+
+SKIP, LIGHT, FULL = 'skip', 'light', 'full'
+
+# 관계 유형별 단서 어휘 (relation_type 과 같은 분류)
+RELATION_CUES = {
+    '경쟁': ['경쟁', '맞대결', '양자대결', '다자대결', '격돌', '접전', '각축', '추격', '경선',
+           '공천', '여론조사', '지지율', '앞서', '오차범위'],
+    '정치적동맹': ['단일화', '연대', '손잡', '손을 잡', '동맹', '러닝메이트', '선대위', '캠프',
+              '합류', '영입', '원팀'],
+    '협력': ['협력', '공조', '협약'],
+    '지지': ['지지 선언', '지지선언', '지지를 선언', '지지한다', '지지했다', '응원', '힘을 실',
+           '추대', '지원 유세', '지원사격', '지원 사격'],
+    '비판': ['비판', '비난', '공세', '공격', '저격', '반박', '맹공', '책임론', '의혹', '고발',
+           '사퇴', '질타', '꼬집', '날을 세', '공방', '네거티브'],
+    '학연': ['동문', '동창', '선후배', '선배', '후배', '동기'],
+    '지연': ['고향', '동향', '향우회', '같은 지역'],
+    '사제': ['스승', '제자', '은사'],
+}
+
+# 관계가 거의 나오지 않는 기사 분류 (제목 머리말, RSS category, URL 경로)
+SKIP_SECTIONS = ['인사', '부고', '포토', '사진', '동정', '알림', '게시판', '일정', '날씨', '운세',
+                 '카드뉴스', '영상', '스포츠', '행사', '수상', '기부']
+_SKIP_URL_HINTS = ('photo', 'obituary', 'people', 'sports', 'gallery')
+
+_TITLE_TAG_RE = re.compile(r'^\s*[\[【<(]([^\]】>)]{1,12})[\]】>)]')
+
+
+def triage_mode(mode=None):
+    """명시한 모드 또는 ARTICLE_TRIAGE 환경변수 (기본 off)"""
+    mode = (mode or os.environ.get('ARTICLE_TRIAGE', 'off')).strip().lower()
+    if mode not in TRIAGE_MODES:
+        raise ValueError(f"사전 분류 모드는 {'/'.join(TRIAGE_MODES)} 중 하나: {mode}")
+    return mode
+
+
+def article_section(article):
+    """기사 분류 추정 (RSS category → 제목 머리말 [인사] 등 → URL 경로 힌트, 모르면 '')"""
+    section = (article.get('section') or '').strip()
+    if section:
+        return section
+    match = _TITLE_TAG_RE.match(article.get('title', ''))
+    if match:
+        return match.group(1).strip()
+    url = (article.get('url') or '').lower()
+    for hint in _SKIP_URL_HINTS:
+        if f'/{hint}' in url:
+            return hint
+    return ''
+
+
+def is_skip_section(section):
+    section = section.lower()
+    return bool(section) and (any(s in section for s in SKIP_SECTIONS)
+                              or section in _SKIP_URL_HINTS)
+
+
+def relation_cues(text):
+    """본문에 나타난 관계 유형별 단서 어휘 수 {'비판': 2, ...}"""
+    found = {}
+    for relation, cues in RELATION_CUES.items():
+        count = sum(text.count(cue) for cue in cues)
+        if count:
+            found[relation] = count
+    return found
+
+
+def route_for(features):
+    """
+    판정 규칙 (features 만으로 결정하므로 평가 스크립트에서 저장된 features 로 다시 계산 가능)
+
+    - 후보자 2명 이상 + 관계 단서 → full
+    - 후보자 2명 이상, 단서 없음 → light (동시 언급만 있는 경우가 많음)
+    - 후보자 1명 + 단서 → light (후보자와 관련 인물의 관계는 나올 수 있음)
+    - 후보자 1명, 단서 없음 또는 인사/부고/포토 등 분류 → skip
+    """
+    mentions = len(features['mentioned'])
+    cues = features['cues']
+    if mentions == 0:
+        return SKIP
+    if mentions >= 2:
+        return FULL if cues else LIGHT
+    if features['skip_section'] or not cues:
+        return SKIP
+    return LIGHT
+
+
+def was_skipped(article):
+    """on 모드 판정으로 실제로 LLM 추출을 건너뛴 기사인지 (route 가 기록한 article['triage'] 기준)"""
+    triage = article.get('triage')
+    return bool(triage) and triage['mode'] == 'on' and triage['route'] == SKIP
+
+
+class ArticleTriage:
+    """기사 사전 분류기"""
+
+    def __init__(self, matcher, mode=None):
+        """
+        Args:
+            matcher: CandidateMatcher
+            mode: 'off' / 'shadow' / 'on' (기본: ARTICLE_TRIAGE 환경변수 또는 off)
+        """
+        self.matcher = matcher
+        self.mode = triage_mode(mode)
+        self.counts = {SKIP: 0, LIGHT: 0, FULL: 0}
+        self._lock = threading.Lock()  # 파이프라인 추출 워커 스레드에서 동시에 호출
+
+    @property
+    def enabled(self):
+        return self.mode != 'off'
+
+    def features(self, article):
+        text = article.get('title', '') + " " + article.get('content', '')
+        section = article_section(article)
+        return {
+            'mentioned': self.matcher.mentioned(text),
+            'cues': relation_cues(text),
+            'section': section,
+            'skip_section': is_skip_section(section),
+        }
+
+    def route(self, article):
+        """
+        기사 판정 후 실제로 따를 경로 반환 (판정은 article['triage'] 에 기록해 저장소에 남김)
+
+        Returns:
+            str: 'skip' / 'light' / 'full' (off 모드와 shadow 모드는 항상 'full')
+        """
+        if not self.enabled:
+            return FULL
+        features = self.features(article)
+        route = route_for(features)
+        with self._lock:
+            self.counts[route] += 1
+        article['triage'] = {'route': route, 'mode': self.mode, 'features': features}
+        return route if self.mode == 'on' else FULL
+
+    def summary(self):
+        total = sum(self.counts.values())
+        if not total:
+            return f"사전 분류 ({self.mode}): 판정한 기사 없음"
+        action = "적용" if self.mode == 'on' else "기록만"
+        return (f"사전 분류 ({self.mode}, {action}): {total}건 중 건너뜀 {self.counts[SKIP]}건 "
+                f"({self.counts[SKIP] / total:.0%}), 저렴한 모델 {self.counts[LIGHT]}건, "
+                f"기존 모델 {self.counts[FULL]}건")
@@ -0,0 +1,104 @@
+"""
+html_to_text vs BeautifulSoup get_text 벤치마크 및 결과 동일성 검증
+
+사용법:
+    python benchmarks/bench_html_text.py feeds/*.xml       # 저장된 피드 파일
+    python benchmarks/bench_html_text.py --live --save feeds  # 설정된 RSS를 받아 저장 후 측정
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser
+import http_client
+from bs4 import BeautifulSoup
+
+from html_text import html_to_text
+
+
+def load_feed_bytes(paths, live=False, save_dir=None):
+    """피드 원본 바이트 로드 (파일 또는 실시간 수집)"""
+    feeds = {}
+    for pattern in paths:
+        for path in glob.glob(pattern):
+            with open(path, 'rb') as f:
+                feeds[path] = f.read()
+
+    if live:
+        from local_news_crawler import REGIONAL_NEWS_SOURCES
+        for source_name, info in REGIONAL_NEWS_SOURCES.items():
+            for url in info['rss']:
+                try:
+                    feeds[url] = http_client.get(url).content
+                except Exception as e:
+                    print(f"  ❌ {source_name}: {url} ({e})")
+        if save_dir:
+            os.makedirs(save_dir, exist_ok=True)
+            for i, (name, content) in enumerate(feeds.items()):
+                with open(os.path.join(save_dir, f"feed_{i:03d}.xml"), 'wb') as f:
+                    f.write(content)
+    return feeds
+
+
+def collect_summaries(feeds):
+    summaries = []
+    for content in feeds.values():
+        for entry in feedparser.parse(content).entries:
+            summaries.append(entry.get('summary', entry.get('description', '')))
+    return summaries
+
+
+def time_it(fn, items, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML->텍스트 변환 벤치마크")
+    parser.add_argument('paths', nargs='*', help="피드 XML 파일 (glob 가능)")
+    parser.add_argument('--live', action='store_true', help="설정된 RSS 주소에서 직접 수집")
+    parser.add_argument('--save', help="--live 로 받은 피드를 저장할 디렉터리")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    feeds = load_feed_bytes(args.paths, args.live, args.save)
+    summaries = collect_summaries(feeds)
+    if not summaries:
+        print("⚠️  측정할 요약문이 없습니다. 피드 파일을 지정하거나 --live 를 사용하세요.")
+        return
+
+    bs_text = lambda s: BeautifulSoup(s, 'html.parser').get_text()
+
+    # 결과 동일성 (공백 정규화 후 비교)
+    mismatches = []
+    for s in summaries:
+        expected = ' '.join(bs_text(s).split())
+        actual = ' '.join(html_to_text(s).split())
+        if expected != actual:
+            mismatches.append((s, expected, actual))
+
+    bs_time = time_it(bs_text, summaries, args.repeat)
+    fast_time = time_it(html_to_text, summaries, args.repeat)
+
+    print("=" * 60)
+    print(f"피드 {len(feeds)}개, 요약문 {len(summaries)}개")
+    print("=" * 60)
+    print(f"BeautifulSoup : {bs_time * 1000:8.1f} ms")
+    print(f"html_to_text  : {fast_time * 1000:8.1f} ms  ({bs_time / max(fast_time, 1e-9):.1f}배)")
+    print(f"결과 불일치    : {len(mismatches)}개")
+    for s, expected, actual in mismatches[:5]:
+        print(f"\n  원문: {s[:120]!r}\n  BS  : {expected[:120]!r}\n  fast: {actual[:120]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+수집 단계 벤치마크 - 로컬 합성 데이터 서버(fixture_server.py)를 상대로 수집기를 실행하고
+단계별 처리량, 요청 지연 p50/p99, 최대 메모리(tracemalloc), CPU 시간을 보고
+
+단계:
+    rss_serial         LocalNewsCollector.collect_all() (앞쪽 --serial-feeds 개 언론사만, 피드당 0.5초 대기 포함)
+    rss_concurrent     collect_all(concurrent=True), 빈 피드 캐시
+    rss_warm           같은 수집 다시 실행 (ETag 조건부 요청 → 304)
+    rss_watermark      조건부 요청 없이 다시 실행 (200 응답을 워터마크까지만 스트리밍 파싱)
+    naver_serial       crawl_naver_news (페이지당 1초 대기 포함)
+    naver_sharded      crawl_naver_news_sharded (일 단위 구간)
+    candidate_filter   CandidateMatcher.mentions_any (candidate_filter_naive: 이름별 부분 문자열 검사)
+
+사용법:
+    python benchmarks/bench_ingestion.py --feeds 300 --entries 40 --latency 0.02 0.08 --error-rate 0.02
+    python benchmarks/bench_ingestion.py --stages rss_concurrent candidate_filter --json bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 수집기 모듈은 candidates_data.json 을 현재 디렉터리에서 읽음
+START_DIR = os.getcwd()
+os.chdir(ROOT)
+# 벤치마크에서는 네이버 속도 제한기가 측정을 지배하지 않도록 예산을 크게 둠
+os.environ.setdefault('NAVER_RPM', '100000')
+# 기록/재생 모드가 켜져 있으면 로컬 서버 대신 아카이브를 측정하게 되므로 끔
+os.environ.pop('HTTP_ARCHIVE_MODE', None)
+
+import http_client
+from candidate_matcher import CandidateMatcher
+from feed_cache import FeedCache
+from fixture_server import FixtureData, FixtureServer
+from rss_registry import RssRegistry
+
+STAGES = ['rss_serial', 'rss_concurrent', 'rss_warm', 'rss_watermark', 'naver_serial',
+          'naver_sharded', 'candidate_filter']
+
+
+def percentile(values, q):
+    return http_client.HttpMetrics._percentile(values, q)
+
+
+class StageResult:
+    def __init__(self, name, items, unit, wall, cpu, peak_bytes, latencies, requests, errors):
+        self.name = name
+        self.items = items
+        self.unit = unit
+        self.wall = wall
+        self.cpu = cpu
+        self.peak_bytes = peak_bytes
+        self.latencies = latencies
+        self.requests = requests
+        self.errors = errors
+
+    def as_dict(self):
+        return {
+            'stage': self.name,
+            'items': self.items,
+            'unit': self.unit,
+            'wall_s': round(self.wall, 3),
+            'cpu_s': round(self.cpu, 3),
+            'throughput_per_s': round(self.items / self.wall, 1) if self.wall else 0,
+            'p50_ms': round(percentile(self.latencies, 0.5) * 1000, 2),
+            'p99_ms': round(percentile(self.latencies, 0.99) * 1000, 2),
+            'peak_mb': round(self.peak_bytes / 1024 / 1024, 2),
+            'requests': self.requests,
+            'errors': self.errors,
+        }
+
+
+def run_stage(name, fn, unit, verbose=False):
+    """
+    fn() 을 실행하며 측정 (fn 은 (처리 건수, 항목별 지연 리스트 또는 None) 반환)
+
+    지연 리스트가 없으면 이 단계 동안 http_client 에 기록된 요청 지연을 사용
+    """
+    first_record = len(http_client.metrics.records)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+
+    output = None if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output or contextlib.nullcontext():
+        items, latencies = fn()
+
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    records = http_client.metrics.records[first_record:]
+    errors = sum(1 for r in records if r['error'] or (r['status'] or 0) >= 400)
+    if latencies is None:
+        latencies = [r['elapsed'] for r in records]
+    return StageResult(name, items, unit, wall, cpu, peak, latencies, len(records), errors)
+
+
+def make_collector(sources, state_dir):
+    from local_news_crawler import LocalNewsCollector
+    return LocalNewsCollector(
+        sources=sources, alert_feeds=[],
+        feed_cache=FeedCache(os.path.join(state_dir, 'feed_cache.json')),
+        rss_registry=RssRegistry(os.path.join(state_dir, 'rss_registry.json')))
+
+
+def collect(collector, concurrent):
+    """
+    수집 단계 실행 (처리 건수는 수집기가 실제로 반환한 기사 수 기준,
+    죽은 주소/오류 응답/후보자 미언급으로 빠진 항목은 세지 않음)
+    """
+    return len(collector.collect_all(concurrent=concurrent)), None
+
+
+def keywords_for(data, count):
+    return [f"{name} 충북" for name in data.candidates[:count]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 단계 벤치마크 (로컬 합성 데이터 서버 사용)")
+    parser.add_argument('--feeds', type=int, default=300)
+    parser.add_argument('--entries', type=int, default=40, help="피드당 기사 수")
+    parser.add_argument('--mention-rate', type=float, default=0.3)
+    parser.add_argument('--hosts', type=int, default=32, help="루프백 주소 수 (macOS 는 1)")
+    parser.add_argument('--latency', type=float, nargs=2, default=(0.02, 0.08),
+                        metavar=('MIN', 'MAX'), help="서버 응답 지연 범위 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--dead-rate', type=float, default=0.05)
+    parser.add_argument('--serial-feeds', type=int, default=10,
+                        help="rss_serial 단계에서 수집할 언론사 수")
+    parser.add_argument('--keywords', type=int, default=3, help="네이버 단계 검색 키워드 수")
+    parser.add_argument('--days', type=int, default=7, help="네이버 검색 기간")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--verbose', action='store_true', help="수집기 출력 표시")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    data = FixtureData(args.feeds, args.entries, args.mention_rate, seed=args.seed)
+    server = FixtureServer(data, hosts=args.hosts, latency=tuple(args.latency),
+                           error_rate=args.error_rate, dead_rate=args.dead_rate)
+    results = []
+    total_entries = args.feeds * args.entries
+
+    with server, tempfile.TemporaryDirectory() as state_dir:
+        sources = server.sources()
+        print(f"합성 데이터: 언론사 {args.feeds}개 x {args.entries}건 = {total_entries:,}건, "
+              f"호스트 {args.hosts}개, 지연 {args.latency[0]}~{args.latency[1]}초, "
+              f"오류율 {args.error_rate:.0%}, 죽은 주소 {args.dead_rate:.0%}")
+
+        if 'rss_serial' in args.stages:
+            subset = dict(list(sources.items())[:args.serial_feeds])
+            serial_dir = os.path.join(state_dir, 'serial')
+            os.makedirs(serial_dir)
+            collector = make_collector(subset, serial_dir)
+            results.append(run_stage(
+                'rss_serial', lambda: collect(collector, False),
+                'articles', args.verbose))
+
+        if {'rss_concurrent', 'rss_warm', 'rss_watermark'} & set(args.stages):
+            collector = make_collector(sources, state_dir)
+            results.append(run_stage(
+                'rss_concurrent', lambda: collect(collector, True),
+                'articles', args.verbose))
+            if 'rss_warm' in args.stages:
+                collector = make_collector(sources, state_dir)
+                results.append(run_stage(
+                    'rss_warm', lambda: collect(collector, True),
+                    'articles', args.verbose))
+            if 'rss_watermark' in args.stages:
+                # 조건부 요청을 지원하지 않는 서버처럼 검증자를 지우고 워터마크만 남김
+                collector = make_collector(sources, state_dir)
+                for entry in collector.feed_cache.entries.values():
+                    entry['etag'] = entry['last_modified'] = None
+                results.append(run_stage(
+                    'rss_watermark', lambda: collect(collector, True),
+                    'articles', args.verbose))
+
+        if 'naver_serial' in args.stages or 'naver_sharded' in args.stages:
+            from news_crawler import NewsRelationshipExtractor
+            extractor = NewsRelationshipExtractor(search_url=server.search_url)
+            keywords = keywords_for(data, args.keywords)
+
+            def crawl(fn):
+                return sum(len(fn(keyword)) for keyword in keywords), None
+
+            if 'naver_serial' in args.stages:
+                results.append(run_stage(
+                    'naver_serial',
+                    lambda: crawl(lambda k: extractor.crawl_naver_news(k, days=args.days)),
+                    'articles', args.verbose))
+            if 'naver_sharded' in args.stages:
+                results.append(run_stage(
+                    'naver_sharded',
+                    lambda: crawl(lambda k: extractor.crawl_naver_news_sharded(k, days=args.days)),
+                    'articles', args.verbose))
+
+        if 'candidate_filter' in args.stages:
+            texts = list(data.all_texts())
+            matcher = CandidateMatcher.from_file()
+
+            def timed_filter(fn):
+                latencies = []
+                for text in texts:
+                    started = time.perf_counter()
+                    fn(text)
+                    latencies.append(time.perf_counter() - started)
+                return len(texts), latencies
+
+            results.append(run_stage(
+                'candidate_filter',
+                lambda: timed_filter(matcher.mentions_any), 'texts', args.verbose))
+            results.append(run_stage(
+                'candidate_filter_naive',
+                lambda: timed_filter(lambda text: any(n in text for n in matcher.names)),
+                'texts', args.verbose))
+
+        served = server.served
+
+    print("\n" + "=" * 100)
+    print(f"{'단계':<24}{'건수':>9}{'소요(초)':>10}{'CPU(초)':>10}{'처리량/초':>12}"
+          f"{'p50(ms)':>10}{'p99(ms)':>10}{'최대 MB':>10}{'요청':>8}{'오류':>6}")
+    print("=" * 100)
+    for result in results:
+        r = result.as_dict()
+        print(f"{r['stage']:<24}{r['items']:>9,}{r['wall_s']:>10.2f}{r['cpu_s']:>10.2f}"
+              f"{r['throughput_per_s']:>12,.1f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+              f"{r['peak_mb']:>10.1f}{r['requests']:>8}{r['errors']:>6}")
+    print(f"\n서버 응답 {served:,}건")
+
+    if args.json:
+        with open(os.path.join(START_DIR, args.json), 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [r.as_dict() for r in results]},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+LLM 단계 부하 벤치마크 - 로컬 stub LLM 서버(stub_llm_server.py)와 합성 데이터 서버(fixture_server.py)를
+상대로 추출/분석 단계를 실행하고 처리량, LLM 지연 p50/p95/p99, 재시도, 파싱 실패를 보고 (API 할당량 사용 없음)
+
+단계:
+    extract_local   LocalNewsCollector.process_articles (합성 기사 --articles 건, --batch-tokens 로 묶음 모드)
+    extract_news    NewsRelationshipExtractor.collect_all_relationships (네이버 검색은 합성 서버,
+                    --concurrency 로 비동기 동시 추출)
+    echo            SocialEchoCollector.run_analysis (카페/블로그 검색은 합성 서버, --pages 페이지씩)
+    simulate        PoliticalEventAgent.simulate_event 를 --events 건 동시 실행
+
+지연/오류는 llm_telemetry 기록에서 단계별로 집계. 실제 API 주소/키는 쓰지 않도록 모든 제공자를
+LLM_BASE_URL(stub 서버)로 보내고, 응답 캐시는 끔 (LLM_CACHE=0)
+
+사용법:
+    python benchmarks/bench_llm.py --articles 3000 --latency-median 0.8 --rate-429 0.05 --malformed-rate 0.02
+    python benchmarks/bench_llm.py --stages extract_news --concurrency 32 --hedge-after 2 --json bench_llm.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 수집기 모듈은 candidates_data.json 을 현재 디렉터리에서 읽음
+START_DIR = os.getcwd()
+os.chdir(ROOT)
+STATE_DIR = tempfile.mkdtemp(prefix='bench_llm_')
+# 실제 API 로 나가지 않도록 제공자별 주소를 지우고 stub 서버 주소(LLM_BASE_URL)만 사용
+for name in ('ANTHROPIC_BASE_URL', 'GEMINI_BASE_URL', 'HTTP_ARCHIVE_MODE'):
+    os.environ.pop(name, None)
+os.environ['ANTHROPIC_API_KEY'] = 'stub'
+os.environ['GEMINI_API_KEY'] = 'stub'
+os.environ['LLM_CACHE'] = '0'
+os.environ['LLM_TELEMETRY_FILE'] = os.path.join(STATE_DIR, 'llm_calls.jsonl')
+# 속도 제한기는 기본적으로 측정을 지배하지 않게 크게 두고, 환경변수로 실제 예산을 주면 그대로 사용
+for provider in ('GEMINI', 'ANTHROPIC', 'NAVER'):
+    os.environ.setdefault(f'{provider}_RPM', '100000')
+for provider in ('GEMINI', 'ANTHROPIC'):
+    os.environ.setdefault(f'{provider}_TPM', '1000000000')
+
+from fixture_server import FixtureData, FixtureServer
+from llm_telemetry import _percentile, telemetry
+from stub_llm_server import StubLLMServer
+
+STAGES = ['extract_local', 'extract_news', 'echo', 'simulate']
+
+
+class StageResult:
+    def __init__(self, name, items, unit, wall, records, stub_before, stub_after):
+        self.name = name
+        self.items = items
+        self.unit = unit
+        self.wall = wall
+        self.records = records
+        self.served = {k: stub_after[k] - stub_before[k] for k in stub_after}
+
+    def as_dict(self):
+        calls = [r for r in self.records if r['attempts']]
+        latencies = [r['latency'] for r in calls]
+        return {
+            'stage': self.name,
+            'items': self.items,
+            'unit': self.unit,
+            'wall_s': round(self.wall, 3),
+            'throughput_per_s': round(self.items / self.wall, 1) if self.wall else 0,
+            'llm_calls': len(self.records),
+            'llm_calls_per_s': round(len(self.records) / self.wall, 1) if self.wall else 0,
+            'p50_ms': round(_percentile(latencies, 0.5) * 1000, 1),
+            'p95_ms': round(_percentile(latencies, 0.95) * 1000, 1),
+            'p99_ms': round(_percentile(latencies, 0.99) * 1000, 1),
+            'retries': sum(r['retries'] for r in self.records),
+            'parse_failures': sum(1 for r in self.records if r['parse_failed']),
+            'errors': sum(1 for r in self.records if r['error']),
+            'input_tokens': sum(r['input_tokens'] for r in self.records),
+            'output_tokens': sum(r['output_tokens'] for r in self.records),
+            'stub_requests': self.served['requests'],
+            'stub_429': self.served['rate_limited'],
+            'stub_malformed': self.served['malformed'],
+        }
+
+
+def run_stage(name, fn, unit, stub, verbose=False):
+    """fn() 을 실행하며 측정 (fn 은 처리 건수 반환), 이 단계 동안의 LLM 호출 기록으로 지연 집계"""
+    os.environ['PIPELINE_STAGE'] = f'bench_{name}'
+    first_record = len(telemetry.records)
+    stub_before = dict(stub.stats)
+    started = time.perf_counter()
+
+    output = None if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output or contextlib.nullcontext():
+        items = fn()
+
+    wall = time.perf_counter() - started
+    return StageResult(name, items, unit, wall, telemetry.records[first_record:],
+                       stub_before, dict(stub.stats))
+
+
+def synthetic_articles(data, count):
+    """후보자 언급 합성 기사 count 건 (LocalNewsCollector 수집 결과 형식)"""
+    articles = []
+    feed = index = 0
+    while len(articles) < count and feed < data.feeds:
+        entry = data.entry(feed, index)
+        if entry['mentioned']:
+            articles.append({
+                'title': entry['title'],
+                'content': ' '.join([entry['summary']] + entry['body']),
+                'url': f"http://outlet{feed}.example/news/{index}",
+                'date': '',
+                'source': f"합성언론{feed:04d}",
+                'section': '정치',
+                'keyword': '후보자명',
+            })
+        index += 1
+        if index == data.entries_per_feed:
+            feed, index = feed + 1, 0
+    return articles
+
+
+def extract_local(articles, batch_tokens):
+    from local_news_crawler import LocalNewsCollector
+    collector = LocalNewsCollector(sources={}, alert_feeds=[])
+    collector.process_articles(articles, batch_token_budget=batch_tokens)
+    return len(articles)
+
+
+def extract_news(search_url, keywords, days, concurrency):
+    from news_crawler import NewsRelationshipExtractor
+    extractor = NewsRelationshipExtractor(search_url=search_url)
+    extractor.collect_all_relationships(keywords, days=days, concurrency=concurrency,
+                                        shard_days=1)
+    return len(extractor.default_search_keywords() if keywords is None else keywords)
+
+
+@contextlib.contextmanager
+def _chdir(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def echo(search_url, pages, workers):
+    from social_echo_collector import SocialEchoCollector
+    collector = SocialEchoCollector(search_url=search_url)
+    # 결과 파일(community_sentiment_*.json/csv)이 저장소의 실제 결과를 덮어쓰지 않도록 임시 폴더에서 실행
+    with _chdir(STATE_DIR):
+        collector.run_analysis(max_pages=pages, max_workers=workers)
+    return len(collector.candidates)
+
+
+def simulate(events, workers):
+    from political_event_agent import PoliticalEventAgent
+    agent = PoliticalEventAgent()
+    descriptions = [f"합성 사건 {i}: 충북 지역 현안 발표" for i in range(events)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(agent.simulate_event, descriptions))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 단계 부하 벤치마크 (로컬 stub LLM 서버 사용)")
+    parser.add_argument('--articles', type=int, default=500, help="extract_local 합성 기사 수")
+    parser.add_argument('--batch-tokens', type=int, default=None,
+                        help="extract_local 묶음 모드 토큰 예산 (없으면 기사별 요청)")
+    parser.add_argument('--keywords', type=int, default=3, help="extract_news 검색 키워드 수")
+    parser.add_argument('--days', type=int, default=7, help="extract_news 검색 기간")
+    parser.add_argument('--naver-results', type=int, default=25, help="검색 구간당 합성 결과 수")
+    parser.add_argument('--concurrency', type=int, default=16, help="extract_news 동시 추출 수")
+    parser.add_argument('--pages', type=int, default=3, help="echo 출처별 수집 페이지 수")
+    parser.add_argument('--echo-workers', type=int, default=None,
+                        help="echo 동시 분석 후보자 수 (기본: 전체)")
+    parser.add_argument('--events', type=int, default=50, help="simulate 사건 수")
+    parser.add_argument('--workers', type=int, default=8, help="simulate 동시 실행 수")
+    parser.add_argument('--latency-median', type=float, default=0.8, help="stub 응답 지연 중앙값 (초)")
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help="stub 로그정규 지연 sigma")
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--replay-cache', help="기록된 응답을 돌려줄 llm_cache.sqlite")
+    parser.add_argument('--hedge-after', type=float, default=None,
+                        help="헤지 요청 기준 (초, LLM_HEDGE_AFTER)")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--verbose', action='store_true', help="수집기 출력 표시")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.hedge_after:
+        os.environ['LLM_HEDGE_AFTER'] = str(args.hedge_after)
+    data = FixtureData(feeds=max(1, args.articles // 10), naver_results=args.naver_results,
+                       mention_rate=0.3, seed=args.seed)
+    fixtures = FixtureServer(data, hosts=1)
+    stub = StubLLMServer(latency_median=args.latency_median, latency_sigma=args.latency_sigma,
+                         rate_429=args.rate_429, malformed_rate=args.malformed_rate,
+                         replay_cache=args.replay_cache, seed=args.seed)
+    results = []
+
+    with fixtures, stub:
+        os.environ['LLM_BASE_URL'] = stub.url
+        print(f"stub LLM 서버 {stub.url}: 지연 중앙값 {args.latency_median}초 (sigma {args.latency_sigma}), "
+              f"429 {args.rate_429:.0%}, 깨진 응답 {args.malformed_rate:.0%}"
+              + (f", 기록 재생 {args.replay_cache}" if args.replay_cache else ""))
+
+        if 'extract_local' in args.stages:
+            articles = synthetic_articles(data, args.articles)
+            results.append(run_stage(
+                'extract_local', lambda: extract_local(articles, args.batch_tokens),
+                'articles', stub, args.verbose))
+
+        if 'extract_news' in args.stages:
+            keywords = [f"{name} 충북" for name in data.candidates[:args.keywords]]
+            results.append(run_stage(
+                'extract_news',
+                lambda: extract_news(fixtures.search_url, keywords, args.days, args.concurrency),
+                'keywords', stub, args.verbose))
+
+        if 'echo' in args.stages:
+            results.append(run_stage(
+                'echo', lambda: echo(fixtures.search_url, args.pages, args.echo_workers), 'candidates', stub, args.verbose))
+
+        if 'simulate' in args.stages:
+            results.append(run_stage(
+                'simulate', lambda: simulate(args.events, args.workers), 'events', stub,
+                args.verbose))
+
+    print("\n" + "=" * 118)
+    print(f"{'단계':<16}{'건수':>8}{'소요(초)':>10}{'LLM 호출':>10}{'호출/초':>9}{'p50(ms)':>10}"
+          f"{'p95(ms)':>10}{'p99(ms)':>10}{'재시도':>8}{'파싱 실패':>10}{'오류':>6}{'stub 429':>10}")
+    print("=" * 118)
+    for result in results:
+        r = result.as_dict()
+        print(f"{r['stage']:<16}{r['items']:>8,}{r['wall_s']:>10.2f}{r['llm_calls']:>10,}"
+              f"{r['llm_calls_per_s']:>9.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+              f"{r['p99_ms']:>10.1f}{r['retries']:>8}{r['parse_failures']:>10}{r['errors']:>6}"
+              f"{r['stub_429']:>10}")
+    print(f"\n{stub.summary()}")
+    print(f"LLM 호출 기록: {os.environ['LLM_TELEMETRY_FILE']}")
+    if telemetry.events:
+        print("정책: " + ", ".join(f"{k} {v}회" for k, v in sorted(telemetry.events.items())))
+
+    if args.json:
+        with open(os.path.join(START_DIR, args.json), 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': [r.as_dict() for r in results],
+                       'stub': stub.stats, 'policy_events': telemetry.events},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
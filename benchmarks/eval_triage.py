@@ -0,0 +1,148 @@
+"""
+기사 사전 분류 평가 - 기사 저장소(article_store.json)에 기록된 판정 근거와 실제 LLM 추출 결과를 비교
+
+--triage shadow 로 수집한 기사는 판정과 무관하게 기존 모델로 추출했으므로 정답으로 쓸 수 있음
+(on 모드로 수집한 기사 중 light 로 추출한 기사는 정답에서 빼고 개수만 보고).
+저장된 features 로 현재 article_triage.route_for 규칙을 다시 적용하므로 규칙이나 어휘를 바꾼 뒤
+다시 수집하지 않고 바로 비교 가능 (단서 어휘 자체를 바꾸면 features 를 새로 기록해야 함)
+
+보고 항목:
+    경로별 기사 수와 그중 실제 관계가 나온 기사/관계 수
+    건너뜀 비율 (절약되는 LLM 호출)
+    놓친 관계: skip 으로 판정됐지만 LLM 이 관계를 추출한 기사 (제목과 관계 유형)
+
+사용법:
+    python local_news_crawler.py --pipeline --triage shadow
+    python benchmarks/eval_triage.py --store article_store.json --show 20
+"""
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from article_triage import FULL, LIGHT, SKIP, route_for
+from storage_utils import load_json
+
+ROUTES = [SKIP, LIGHT, FULL]
+
+
+def extraction_tier(triage):
+    """기록된 판정으로 실제 추출에 쓴 등급 (on 모드만 판정을 따르고 shadow 는 항상 기존 모델)"""
+    return triage['route'] if triage['mode'] == 'on' else FULL
+
+
+def ground_truth(entries):
+    """
+    정답으로 쓸 수 있는 기사 (판정 근거가 있고 기존 모델(full)로 추출한 기사)
+
+    on 모드에서 skip 된 기사는 저장소에 extracted_at 없이 triage_skipped_at 으로만
+    기록되므로 LLM 결과가 없어 제외. on 모드에서 light 로 추출한 기사는 사전 분류가 고른
+    저렴한 모델의 결과라 분류 자체를 평가하는 정답으로 쓰면 순환이 되므로 제외
+
+    Returns:
+        tuple: (정답 기사 리스트, {'skipped': 건너뛴 기사 수, 'light': 저렴한 모델로만 추출한 기사 수})
+    """
+    usable = []
+    excluded = {SKIP: 0, LIGHT: 0}
+    for entry in entries:
+        triage = entry.get('triage')
+        if 'extracted_at' not in entry:
+            if 'triage_skipped_at' in entry:
+                excluded[SKIP] += 1
+            continue
+        if not triage:
+            continue
+        tier = extraction_tier(triage)
+        if tier != FULL:
+            excluded[tier] += 1
+            continue
+        usable.append(entry)
+    return usable, excluded
+
+
+def evaluate(entries):
+    """
+    Returns:
+        dict: 경로별 통계와 놓친 기사 목록
+    """
+    by_route = {route: {'articles': 0, 'with_relationships': 0, 'relationships': 0}
+                for route in ROUTES}
+    missed = []
+    for entry in entries:
+        route = route_for(entry['triage']['features'])
+        relationships = entry.get('relationships') or []
+        stats = by_route[route]
+        stats['articles'] += 1
+        stats['relationships'] += len(relationships)
+        if relationships:
+            stats['with_relationships'] += 1
+            if route == SKIP:
+                missed.append(entry)
+
+    total = len(entries)
+    total_relationships = sum(s['relationships'] for s in by_route.values())
+    missed_relationships = by_route[SKIP]['relationships']
+    return {
+        'articles': total,
+        'by_route': by_route,
+        'skip_rate': by_route[SKIP]['articles'] / total if total else 0,
+        'relationships': total_relationships,
+        'missed_relationships': missed_relationships,
+        'relationship_recall': (1 - missed_relationships / total_relationships
+                                if total_relationships else 1.0),
+        'missed': missed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기사 사전 분류 평가 (기록된 LLM 추출 결과 기준)")
+    parser.add_argument('--store', default=os.path.join(ROOT, 'article_store.json'))
+    parser.add_argument('--show', type=int, default=10, help="출력할 놓친 기사 수")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    store = load_json(args.store, {})
+    entries, excluded = ground_truth(store.values())
+    notes = [f"{label} {excluded[route]}건" for route, label in
+             ((SKIP, "on 모드로 건너뛴 기사"), (LIGHT, "저렴한 모델로만 추출한 기사"))
+             if excluded[route]]
+    print(f"기사 저장소 {len(store)}건 중 판정 근거가 있고 기존 모델로 추출한 기사 {len(entries)}건"
+          + (f" (제외: {', '.join(notes)})" if notes else ""))
+    if not entries:
+        print("⚠️  평가할 기사가 없습니다. --triage shadow 로 먼저 수집하세요.")
+        return
+
+    result = evaluate(entries)
+    print("\n" + "=" * 60)
+    print(f"{'경로':<8}{'기사':>8}{'관계 있는 기사':>16}{'관계':>8}")
+    print("=" * 60)
+    for route in ROUTES:
+        s = result['by_route'][route]
+        print(f"{route:<8}{s['articles']:>8}{s['with_relationships']:>16}{s['relationships']:>8}")
+    print(f"\n건너뜀 비율: {result['skip_rate']:.1%} "
+          f"(LLM 호출 {result['by_route'][SKIP]['articles']}건 절약, "
+          f"저렴한 모델 {result['by_route'][LIGHT]['articles']}건)")
+    print(f"관계 재현율: {result['relationship_recall']:.1%} "
+          f"(전체 {result['relationships']}개 중 놓친 관계 {result['missed_relationships']}개, "
+          f"기사 {len(result['missed'])}건)")
+
+    for entry in result['missed'][:args.show]:
+        types = sorted({r.get('relation_type', '?') for r in entry['relationships']})
+        features = entry['triage']['features']
+        print(f"  - {entry['title'][:50]} | 관계: {', '.join(types)} | "
+              f"후보자 {len(features['mentioned'])}명, 분류 '{features['section']}'")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({**result, 'excluded': excluded,
+                   'missed': [e['url'] for e in result['missed']]},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+수집기 벤치마크용 로컬 HTTP 서버 - 합성 RSS 피드 / 네이버 검색 결과 / 기사 페이지
+
+루프백 주소 여러 개(127.0.0.1, 127.0.0.2, ...)에 같은 서버를 띄워 언론사마다 다른 호스트로 보이게 하므로
+PoliteFetcher 의 도메인별 동시성 제한이 실제 여러 언론사를 상대할 때처럼 동작
+(macOS 는 127.0.0.2 이상이 기본으로 없으므로 --hosts 1 사용)
+
+경로:
+    /outlet{i}/rss/allArticle.xml    언론사 i 의 RSS (ETag 조건부 요청 지원)
+    /outlet{i}/rss/old.xml           dead_rate 비율의 언론사에 설정되는 죽은 주소 (404)
+    /outlet{i}/news/{j}              기사 페이지 (#article-view-content-div)
+    /search.naver?query=&start=&ds=  네이버 형식 검색 결과 (구간마다 naver_results 건)
+    /search.naver?where=cafe&query=  네이버 카페/블로그 형식 검색 결과 (where=blog, 같은 반응이 반복됨)
+
+사용법:
+    python benchmarks/fixture_server.py --feeds 300 --entries 40 --latency 0.02 0.08 --error-rate 0.02
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from email.utils import formatdate
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FILLER_WORDS = [
+    '충북', '청주', '충주', '제천', '도정', '예산', '간담회', '지역', '발전', '공약', '정책',
+    '선거', '도민', '의회', '경제', '교통', '오송', '바이오', '청년', '농업', '관광', '복지',
+    '일자리', '기자회견', '협약', '토론회', '지지', '비판', '연대', '행사', '방문', '발표',
+]
+
+
+def _load_candidate_names():
+    with open(os.path.join(ROOT, 'candidates_data.json'), encoding='utf-8') as f:
+        return [c['name'] for c in json.load(f)['candidates']]
+
+
+class FixtureData:
+    """seed 로 결정되는 합성 기사 데이터 (같은 설정이면 실행마다 같은 내용)"""
+
+    def __init__(self, feeds=300, entries_per_feed=40, mention_rate=0.3,
+                 naver_results=25, seed=0):
+        self.feeds = feeds
+        self.entries_per_feed = entries_per_feed
+        self.mention_rate = mention_rate
+        self.naver_results = naver_results
+        self.seed = seed
+        self.candidates = _load_candidate_names()
+
+    def rng(self, *key):
+        digest = hashlib.sha256(repr((self.seed,) + key).encode('utf-8')).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+
+    def _sentence(self, rng, words=12):
+        return ' '.join(rng.choice(FILLER_WORDS) for _ in range(words)) + '.'
+
+    def entry(self, feed, index):
+        """언론사 feed 의 index 번째 기사 (title, summary, body 문단, 후보자 언급 여부)"""
+        rng = self.rng('entry', feed, index)
+        mentioned = rng.random() < self.mention_rate
+        title = self._sentence(rng, 6)
+        summary = self._sentence(rng, 20)
+        body = [self._sentence(rng, 25) for _ in range(6)]
+        if mentioned:
+            names = rng.sample(self.candidates, k=min(2, len(self.candidates)))
+            title = f"{names[0]} {title}"
+            summary = f"{' '.join(names)} {summary}"
+            body[2] = f"{names[0]} 후보는 {names[-1]} 후보와 {body[2]}"
+        return {'title': title, 'summary': summary, 'body': body, 'mentioned': mentioned}
+
+    def all_texts(self):
+        """모든 피드 항목의 제목 + 요약 (후보자 필터 벤치마크 입력)"""
+        for feed in range(self.feeds):
+            for index in range(self.entries_per_feed):
+                entry = self.entry(feed, index)
+                yield entry['title'] + " " + entry['summary']
+
+
+class FixtureServer:
+    """
+    여러 루프백 주소에 뜨는 합성 데이터 서버 (백그라운드 스레드)
+
+    with FixtureServer(FixtureData(feeds=300)) as server:
+        sources = server.sources()
+    """
+
+    def __init__(self, data=None, hosts=32, port=0, latency=(0.0, 0.0), error_rate=0.0,
+                 dead_rate=0.0):
+        """
+        Args:
+            data: FixtureData (기본 설정 사용 시 None)
+            hosts: 사용할 루프백 주소 수 (언론사는 주소에 나눠 배치)
+            port: 포트 (0 이면 첫 주소에서 빈 포트를 받아 모든 주소에 사용)
+            latency: 응답 지연 범위 (초, 균등분포)
+            error_rate: 503 응답 비율
+            dead_rate: 설정된 RSS 주소가 죽은 주소인 언론사 비율 (자동 탐지 경로 측정용)
+        """
+        self.data = data or FixtureData()
+        self.hosts = [f'127.0.0.{i + 1}' for i in range(hosts)]
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.dead_rate = dead_rate
+        self.served = 0
+        self._lock = threading.Lock()
+        self._servers = []
+        self._rng = random.Random(self.data.seed)
+        self._rss_bodies = {}
+
+    def host_for(self, feed):
+        return self.hosts[feed % len(self.hosts)]
+
+    def base_url(self, feed):
+        return f"http://{self.host_for(feed)}:{self.port}/outlet{feed}"
+
+    @property
+    def search_url(self):
+        return f"http://{self.hosts[0]}:{self.port}/search.naver"
+
+    def is_dead(self, feed):
+        return self.data.rng('dead', feed).random() < self.dead_rate
+
+    def sources(self):
+        """REGIONAL_NEWS_SOURCES 형식의 언론사 설정"""
+        sources = {}
+        for feed in range(self.data.feeds):
+            path = '/rss/old.xml' if self.is_dead(feed) else '/rss/allArticle.xml'
+            sources[f"합성언론{feed:04d}"] = {
+                'rss': [self.base_url(feed) + path],
+                'search_url': self.base_url(feed),
+                'type': '합성',
+            }
+        return sources
+
+    # ------------------------------------------------------------------ 응답 생성
+
+    def rss_body(self, feed):
+        # 서버 쪽 생성 비용이 측정(같은 프로세스의 CPU 시간)에 섞이지 않도록 피드 본문은 한 번만 생성
+        body = self._rss_bodies.get(feed)
+        if body is None:
+            body = self._rss_bodies[feed] = self._build_rss_body(feed)
+        return body
+
+    def _build_rss_body(self, feed):
+        items = []
+        for index in range(self.data.entries_per_feed):
+            entry = self.data.entry(feed, index)
+            items.append(
+                f"<item><title>{escape(entry['title'])}</title>"
+                f"<link>{self.base_url(feed)}/news/{index}</link>"
+                f"<description>{escape('<p>' + entry['summary'] + '</p>')}</description>"
+                f"<pubDate>{formatdate(1760000000 - index * 600)}</pubDate></item>")
+        return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                f'<title>outlet{feed}</title>{"".join(items)}</channel></rss>').encode('utf-8')
+
+    def article_body(self, feed, index):
+        entry = self.data.entry(feed, index)
+        paragraphs = ''.join(f"<p>{escape(p)}</p>" for p in entry['body'])
+        return (f"<html><head><title>{escape(entry['title'])}</title></head><body>"
+                f"<nav>{'메뉴 ' * 30}</nav><div id=\"article-view-content-div\">{paragraphs}</div>"
+                f"<footer>{'저작권 ' * 20}</footer></body></html>").encode('utf-8')
+
+    def search_body(self, query, start, ds):
+        """구간(ds)마다 naver_results 건이 있는 것처럼 start 부터 최대 10건"""
+        items = []
+        for rank in range(start, min(start + 10, self.data.naver_results + 1)):
+            rng = self.data.rng('naver', query, ds, rank)
+            feed = rng.randrange(self.data.feeds)
+            index = rng.randrange(self.data.entries_per_feed)
+            entry = self.data.entry(feed, index)
+            items.append(
+                f'<div class="news_area"><a class="news_tit" href="{self.base_url(feed)}/news/{index}">'
+                f'{escape(query)} {escape(entry["title"])}</a>'
+                f'<div class="news_dsc">{escape(entry["summary"])}</div>'
+                f'<div class="info_group"><span class="info">{escape(ds)}</span></div></div>')
+        return (f'<html><body><div class="list_news">{"".join(items)}</div>'
+                f'</body></html>').encode('utf-8')
+
+    def community_body(self, query, where, start):
+        """카페/블로그 검색 결과 20건 (검색어마다 정해진 반응 몇 개가 반복되는 에코 체임버 형태)"""
+        pool_rng = self.data.rng('community', query)
+        pool = [self.data._sentence(pool_rng, 15) for _ in range(6)]
+        rng = self.data.rng('community', query, where, start)
+        items = []
+        for _ in range(20):
+            snippet = rng.choice(pool)
+            items.append(
+                f'<div class="api_ani_send"><a class="api_txt_lines total_tit">'
+                f'{escape(query)} {escape(self.data._sentence(rng, 5))}</a>'
+                f'<div class="api_txt_lines dsc_txt">{escape(query.split()[0])} {escape(snippet)}</div></div>')
+        return f'<html><body>{"".join(items)}</body></html>'.encode('utf-8')
+
+    def respond(self, handler):
+        low, high = self.latency
+        with self._lock:
+            self.served += 1
+            delay = self._rng.uniform(low, high)
+            failed = self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return 503, 'text/plain', b'unavailable', {}
+
+        parts = urlsplit(handler.path)
+        segments = parts.path.strip('/').split('/')
+        if parts.path == '/search.naver':
+            query = parse_qs(parts.query)
+            where = query.get('where', [''])[0]
+            if where in ('cafe', 'blog'):
+                body = self.community_body(query.get('query', [''])[0], where,
+                                           int(query.get('start', ['1'])[0]))
+                return 200, 'text/html; charset=utf-8', body, {}
+            body = self.search_body(query.get('query', [''])[0],
+                                    int(query.get('start', ['1'])[0]),
+                                    query.get('ds', [''])[0])
+            return 200, 'text/html; charset=utf-8', body, {}
+        if not segments[0].startswith('outlet'):
+            return 404, 'text/plain', b'not found', {}
+        feed = int(segments[0][len('outlet'):])
+        rest = '/'.join(segments[1:])
+        if rest == 'rss/allArticle.xml':
+            etag = f'"{self.data.seed}-{feed}-{self.data.entries_per_feed}"'
+            if handler.headers.get('If-None-Match') == etag:
+                return 304, None, b'', {'ETag': etag}
+            return 200, 'application/rss+xml; charset=utf-8', self.rss_body(feed), {'ETag': etag}
+        if len(segments) == 3 and segments[1] == 'news' and segments[2].isdigit():
+            return 200, 'text/html; charset=utf-8', self.article_body(feed, int(segments[2])), {}
+        return 404, 'text/plain', b'not found', {}
+
+    # ------------------------------------------------------------------ 서버 수명
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, content_type, body, headers = server.respond(self)
+                self.send_response(status)
+                if content_type:
+                    self.send_header('Content-Type', content_type)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        handler = self._handler_class()
+        self._rss_bodies.clear()  # 포트가 정해진 뒤의 주소로 생성
+        for host in self.hosts:
+            httpd = ThreadingHTTPServer((host, self.port), handler)
+            httpd.daemon_threads = True
+            self.port = httpd.server_address[1]
+            self._servers.append(httpd)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        for httpd in self._servers:
+            httpd.shutdown()
+            httpd.server_close()
+        self._servers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집기 벤치마크용 합성 데이터 서버")
+    parser.add_argument('--feeds', type=int, default=300)
+    parser.add_argument('--entries', type=int, default=40, help="피드당 기사 수")
+    parser.add_argument('--mention-rate', type=float, default=0.3)
+    parser.add_argument('--hosts', type=int, default=32)
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--latency', type=float, nargs=2, default=(0.02, 0.08),
+                        metavar=('MIN', 'MAX'), help="응답 지연 범위 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--dead-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    data = FixtureData(args.feeds, args.entries, args.mention_rate, seed=args.seed)
+    server = FixtureServer(data, hosts=args.hosts, port=args.port,
+                           latency=tuple(args.latency), error_rate=args.error_rate,
+                           dead_rate=args.dead_rate).start()
+    print(f"합성 피드 {args.feeds}개 x {args.entries}건, 호스트 {args.hosts}개, 포트 {server.port}")
+    print(f"  RSS 예: {server.base_url(0)}/rss/allArticle.xml")
+    print(f"  네이버 검색: {server.search_url}  (NAVER_SEARCH_URL 로 지정)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+오프라인 부하 시험용 LLM stub 서버 - Anthropic Messages / Gemini generateContent 요청 형식으로 응답
+
+프롬프트 종류를 알아보고 그럴듯한 JSON 을 합성해서 돌려줌:
+    기사 묶음 추출   {"results": [{"article_id": "A1", "relationships": [...]}, ...]}
+    기사 1건 추출    {"relationships": [...]}  (기사에 함께 나온 후보자 쌍으로 관계 생성)
+    에코 프레임      {"candidate", "top_frames", "polarization_index", ...}
+    이벤트 시뮬레이션 {"analysis", "impact_matrix": {후보자: {official, private, sentiment, regional}}}
+    그 밖의 프롬프트  마크다운 전략 리포트 텍스트
+
+--replay-cache 로 llm_cache.sqlite 를 주면 같은 (제공자, 모델, 프롬프트) 의 기록된 실제 응답을 먼저 사용
+
+경로 (POST):
+    /v1/messages                                Anthropic (ANTHROPIC_BASE_URL / LLM_BASE_URL)
+    /v1beta/models/{model}:generateContent      Gemini (GEMINI_BASE_URL / LLM_BASE_URL, REST 전송)
+
+사용법:
+    python benchmarks/stub_llm_server.py --port 8900 --latency-median 1.2 --rate-429 0.05 --malformed-rate 0.02
+    set LLM_BASE_URL=http://127.0.0.1:8900
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from llm_cache import cache_key
+from tokens import estimate_tokens
+
+RELATION_TYPES = ['정치적동맹', '경쟁', '학연', '지연', '협력', '비판', '지지']
+SENTIMENTS = {'정치적동맹': '긍정', '협력': '긍정', '지지': '긍정', '학연': '중립', '지연': '중립',
+              '경쟁': '중립', '비판': '부정'}
+FRAMES = [('행정전문가', '긍정'), ('힘 있는 여당 후보', '긍정'), ('지역 토박이', '긍정'),
+          ('구태 정치인', '부정'), ('철새 정치인', '부정'), ('중앙 낙하산', '부정'),
+          ('정책통', '중립'), ('세대교체', '중립')]
+
+_ARTICLE_BLOCK_RE = re.compile(
+    r'### 기사 ID: (A\d+)\s*\n\*\*기사 제목\*\*: (.*?)\n\*\*기사 내용\*\*: (.*?)(?=\n### 기사 ID:|\n\*\*출력 형식)',
+    re.DOTALL)
+_SINGLE_ARTICLE_RE = re.compile(r'\*\*기사 제목\*\*: (.*?)\n\s*\*\*기사 내용\*\*: (.*?)\n\s*\*\*출력 형식',
+                                re.DOTALL)
+_ECHO_CANDIDATE_RE = re.compile(r"후보 '([^']+)'")
+_GEMINI_PATH_RE = re.compile(r'^/v1(?:beta)?/models/([^/:]+):generateContent')
+
+
+def _load_candidate_names():
+    with open(os.path.join(ROOT, 'candidates_data.json'), encoding='utf-8') as f:
+        return [c['name'] for c in json.load(f)['candidates']]
+
+
+class ResponseSynthesizer:
+    """프롬프트 종류별 합성 응답"""
+
+    def __init__(self, candidates=None):
+        self.candidates = candidates or _load_candidate_names()
+
+    def kind(self, prompt):
+        if '"results"' in prompt and '### 기사 ID:' in prompt:
+            return 'extract_batch'
+        if '"relationships"' in prompt:
+            return 'extract'
+        if 'top_frames' in prompt:
+            return 'echo_frames'
+        if 'official, private, sentiment, regional' in prompt:
+            return 'event_simulation'
+        return 'report'
+
+    def _relationships(self, rng, title, content):
+        text = f"{title} {content}"
+        names = [n for n in self.candidates if n in text]
+        sentences = re.split(r'(?<=[.!?])\s+', content) or [title]
+        relationships = []
+        pairs = [(a, b) for i, a in enumerate(names) for b in names[i + 1:]]
+        if not pairs and names and rng.random() < 0.3:
+            pairs = [(names[0], '관련 인물')]
+        for person1, person2 in pairs[:3]:
+            relation = rng.choice(RELATION_TYPES)
+            evidence = next((s for s in sentences if person1 in s), title)
+            relationships.append({
+                'person1': person1,
+                'person2': person2,
+                'relation_type': relation,
+                'strength': round(rng.uniform(0.3, 0.95), 2),
+                'direction': rng.choice(['양방향', 'person1→person2', 'person2→person1']),
+                'evidence': evidence[:120],
+                'sentiment': SENTIMENTS[relation],
+            })
+        return relationships
+
+    def synthesize(self, prompt, rng):
+        """(종류, 응답 텍스트)"""
+        kind = self.kind(prompt)
+        if kind == 'extract_batch':
+            results = [{'article_id': article_id,
+                        'relationships': self._relationships(rng, title, content)}
+                       for article_id, title, content in _ARTICLE_BLOCK_RE.findall(prompt)]
+            body = {'results': results}
+        elif kind == 'extract':
+            match = _SINGLE_ARTICLE_RE.search(prompt)
+            title, content = match.groups() if match else ('', prompt)
+            body = {'relationships': self._relationships(rng, title, content)}
+        elif kind == 'echo_frames':
+            match = _ECHO_CANDIDATE_RE.search(prompt)
+            frames = rng.sample(FRAMES, k=3)
+            body = {
+                'candidate': match.group(1) if match else '',
+                'top_frames': [{
+                    'frame_name': name,
+                    'sentiment': sentiment,
+                    'echo_strength': round(rng.uniform(0.2, 0.9), 2),
+                    'key_arguments': [f"{name} 관련 논거 {i}" for i in (1, 2)],
+                } for name, sentiment in frames],
+                'polarization_index': round(rng.uniform(0.1, 0.9), 2),
+                'viral_potential': rng.choice(['높음', '중간', '낮음']),
+                'summary': f"{frames[0][0]} 프레임이 가장 자주 반복됨",
+            }
+        elif kind == 'event_simulation':
+            body = {
+                'analysis': "가상 사건에 대한 합성 분석 (stub)",
+                'impact_matrix': {
+                    name: {metric: round(rng.uniform(-0.5, 0.5), 2)
+                           for metric in ('official', 'private', 'sentiment', 'regional')}
+                    for name in self.candidates
+                },
+            }
+        else:
+            lines = [f"- {name}: 핵심 전략 {rng.randint(1, 9)}번 강화" for name in self.candidates]
+            return kind, "## 전략 요약 (stub)\n\n" + "\n".join(lines)
+
+        text = json.dumps(body, ensure_ascii=False, indent=2)
+        if rng.random() < 0.5:
+            text = f"```json\n{text}\n```"  # 실제 모델처럼 코드블록으로 감싼 응답도 섞음
+        return kind, text
+
+    @staticmethod
+    def malform(text, rng):
+        """파싱 실패를 유발하는 응답 (잘린 JSON 또는 JSON 없는 설명문)"""
+        if rng.random() < 0.5:
+            return text[:max(1, len(text) // 2)]
+        return "요청하신 기사를 검토했지만 명확한 관계를 판단하기 어렵습니다."
+
+
+class StubLLMServer:
+    """
+    백그라운드 스레드에서 뜨는 stub 서버
+
+    with StubLLMServer(latency_median=0.5, rate_429=0.05) as server:
+        os.environ['LLM_BASE_URL'] = server.url
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency_median=0.8, latency_sigma=0.5,
+                 rate_429=0.0, malformed_rate=0.0, replay_cache=None, seed=0):
+        """
+        Args:
+            latency_median: 응답 지연 중앙값 (초, 로그정규분포)
+            latency_sigma: 로그정규분포 sigma (클수록 꼬리 지연이 김, 0 이면 고정 지연)
+            rate_429: 429 (속도 제한) 응답 비율
+            malformed_rate: 파싱할 수 없는 응답 비율
+            replay_cache: 기록된 응답을 돌려줄 llm_cache.sqlite 경로
+        """
+        self.host = host
+        self.port = port
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.rate_429 = rate_429
+        self.malformed_rate = malformed_rate
+        self.synthesizer = ResponseSynthesizer()
+        self.stats = {'requests': 0, 'rate_limited': 0, 'malformed': 0, 'replayed': 0}
+        self.by_kind = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._replay = (sqlite3.connect(f"file:{replay_cache}?mode=ro", uri=True,
+                                        check_same_thread=False) if replay_cache else None)
+        self._httpd = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def _draw(self):
+        """요청 1건의 (지연, 429 여부, 깨진 응답 여부, 응답 합성용 난수 생성기)"""
+        with self._lock:
+            self.stats['requests'] += 1
+            delay = self.latency_median * math.exp(self._rng.gauss(0, self.latency_sigma))
+            limited = self._rng.random() < self.rate_429
+            malformed = self._rng.random() < self.malformed_rate
+            rng = random.Random(self._rng.getrandbits(64))
+        return delay, limited, malformed, rng
+
+    def _replayed(self, provider, model, prompt, max_tokens):
+        if self._replay is None:
+            return None
+        for tokens in (max_tokens, None):
+            key = cache_key(provider, model, prompt, {'max_tokens': tokens})
+            with self._lock:
+                row = self._replay.execute(
+                    "SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                return row[0]
+        return None
+
+    def complete(self, provider, model, prompt, max_tokens):
+        """(상태 코드, 응답 텍스트 또는 None, 입력 토큰, 출력 토큰)"""
+        delay, limited, malformed, rng = self._draw()
+        time.sleep(delay)
+        if limited:
+            with self._lock:
+                self.stats['rate_limited'] += 1
+            return 429, None, 0, 0
+
+        text = self._replayed(provider, model, prompt, max_tokens)
+        if text is not None:
+            kind = 'replayed'
+            with self._lock:
+                self.stats['replayed'] += 1
+        else:
+            kind, text = self.synthesizer.synthesize(prompt, rng)
+        if malformed:
+            text = self.synthesizer.malform(text, rng)
+            with self._lock:
+                self.stats['malformed'] += 1
+        with self._lock:
+            self.by_kind[kind] = self.by_kind.get(kind, 0) + 1
+        return 200, text, estimate_tokens(prompt), estimate_tokens(text)
+
+    # ------------------------------------------------------------------ 제공자 형식
+
+    def anthropic(self, request):
+        content = request['messages'][-1]['content']
+        if isinstance(content, list):
+            content = ''.join(block.get('text', '') for block in content)
+        model = request.get('model', '')
+        status, text, input_tokens, output_tokens = self.complete(
+            'anthropic', model, content, request.get('max_tokens'))
+        if status == 429:
+            return 429, {'type': 'error', 'error': {
+                'type': 'rate_limit_error',
+                'message': 'stub: Number of request tokens has exceeded your per-minute rate limit'}}, \
+                {'retry-after': '1'}
+        return 200, {
+            'id': f"msg_stub_{uuid.uuid4().hex[:24]}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': model,
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': input_tokens, 'output_tokens': output_tokens},
+        }, {}
+
+    def gemini(self, model, request):
+        prompt = ''.join(part.get('text', '')
+                         for content in request.get('contents', [])
+                         for part in content.get('parts', []))
+        max_tokens = (request.get('generationConfig') or {}).get('maxOutputTokens')
+        status, text, input_tokens, output_tokens = self.complete(
+            'gemini', model, prompt, max_tokens)
+        if status == 429:
+            return 429, {'error': {'code': 429, 'status': 'RESOURCE_EXHAUSTED',
+                                   'message': 'stub: Resource has been exhausted (e.g. check quota).'}}, {}
+        return 200, {
+            'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'},
+                            'finishReason': 'STOP', 'index': 0}],
+            'usageMetadata': {'promptTokenCount': input_tokens,
+                              'candidatesTokenCount': output_tokens,
+                              'totalTokenCount': input_tokens + output_tokens},
+            'modelVersion': model,
+        }, {}
+
+    def respond(self, path, body):
+        path = path.split('?', 1)[0]
+        try:
+            request = json.loads(body or b'{}')
+        except json.JSONDecodeError:
+            return 400, {'error': {'message': 'invalid JSON body'}}, {}
+        if path == '/v1/messages':
+            return self.anthropic(request)
+        match = _GEMINI_PATH_RE.match(path)
+        if match:
+            return self.gemini(match.group(1), request)
+        return 404, {'error': {'message': f'stub: unknown path {path}'}}, {}
+
+    # ------------------------------------------------------------------ 서버 수명
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                status, payload, headers = server.respond(self.path, self.rfile.read(length))
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._httpd.request_queue_size = 1024  # 동시 요청 수천 건에서 연결 거부 방지
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def summary(self):
+        kinds = ', '.join(f"{k} {v}" for k, v in sorted(self.by_kind.items()))
+        return (f"stub LLM 서버: 요청 {self.stats['requests']}건 (429 {self.stats['rate_limited']}, "
+                f"깨진 응답 {self.stats['malformed']}, 기록 재생 {self.stats['replayed']}) [{kinds}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 부하 시험용 LLM stub 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-median', type=float, default=0.8, help="응답 지연 중앙값 (초)")
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help="로그정규 지연 분포 sigma")
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--replay-cache', help="기록된 응답을 돌려줄 llm_cache.sqlite")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.host, args.port, args.latency_median, args.latency_sigma,
+                           args.rate_429, args.malformed_rate, args.replay_cache,
+                           args.seed).start()
+    print(f"stub LLM 서버: {server.url}  (LLM_BASE_URL 로 지정)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(server.summary())
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+후보자 이름 다중 패턴 매칭기 (Aho-Corasick)
+후보자 이름 + 영문명 + 별칭을 한 번에 컴파일해 텍스트를 한 번만 훑어 모든 언급을 찾음
+"""
+
+import json
+
+# 영문명 대소문자 무시용 (ASCII만 소문자로 바꿔 문자 위치가 그대로 유지됨)
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+                             'abcdefghijklmnopqrstuvwxyz')
+
+
+class CandidateMatcher:
+    """
+    컴파일된 후보자 매칭기
+
+    candidates_data.json 의 각 후보에 대해 name, name_en, aliases(선택) 를 패턴으로 사용
+    예) "aliases": ["신 전 부위원장", "신용한 교수"]
+    """
+
+    def __init__(self, aliases_by_name):
+        """
+        Args:
+            aliases_by_name: {후보자명: [별칭, ...]} (후보자명 자체도 패턴으로 포함됨)
+        """
+        self.names = list(aliases_by_name)
+        self._patterns = []  # (후보자명, 원래 별칭)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for name, aliases in aliases_by_name.items():
+            for alias in dict.fromkeys([name] + list(aliases)):
+                if alias:
+                    self._add_pattern(name, alias)
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path='candidates_data.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        aliases_by_name = {}
+        for c in data['candidates']:
+            aliases = [c.get('name_en', '')] + c.get('aliases', [])
+            aliases_by_name[c['name']] = [a for a in aliases if a]
+        return cls(aliases_by_name)
+
+    def _add_pattern(self, name, alias):
+        node = 0
+        for ch in alias.translate(_ASCII_LOWER):
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(len(self._patterns))
+        self._patterns.append((name, alias))
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f][ch] if node and ch in self._goto[f] else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _scan(self, text):
+        """(패턴 인덱스, 끝 위치) 를 텍스트 한 번 순회로 생성"""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text.translate(_ASCII_LOWER)):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern_idx in out[node]:
+                yield pattern_idx, i + 1
+
+    def find_all(self, text):
+        """
+        모든 언급 위치 반환
+
+        Returns:
+            list: [(후보자명, 매칭된 별칭, 시작, 끝), ...] (시작 위치 순)
+        """
+        matches = []
+        for pattern_idx, end in self._scan(text or ''):
+            name, alias = self._patterns[pattern_idx]
+            matches.append((name, alias, end - len(alias), end))
+        matches.sort(key=lambda m: (m[2], m[3]))
+        return matches
+
+    def mentioned(self, text):
+        """언급된 후보자명 리스트 (후보자 명단 순서)"""
+        found = {self._patterns[idx][0] for idx, _ in self._scan(text or '')}
+        return [name for name in self.names if name in found]
+
+    def mentions_any(self, text):
+        """후보자가 한 명이라도 언급되었는지 (첫 매칭에서 바로 종료)"""
+        for _ in self._scan(text or ''):
+            return True
+        return False
@@ -0,0 +1,92 @@
+"""
+에코 체임버 프레임 분석 결과 합치기 (map-reduce 의 reduce 단계, LLM 호출 없음)
+반응이 많아 여러 묶음으로 나눠 분석한 부분 결과를 후보자 1명의 결과로 합침
+"""
+
+import re
+
+MAX_MERGED_FRAMES = 5
+_FRAME_KEY_RE = re.compile(r"[\s'\"‘’“”]+")
+
+
+def _weighted_mode(values_weights):
+    totals = {}
+    for value, weight in values_weights:
+        if value:
+            totals[value] = totals.get(value, 0) + weight
+    return max(totals, key=totals.get) if totals else None
+
+
+def merge_echo_frames(candidate_name, partials):
+    """
+    묶음별 부분 분석 결과를 후보자 1명의 분석 결과로 합침 (LLM 호출 없음)
+
+    묶음의 가중치는 묶음에 든 반응 수(반복 포함).
+    - 프레임: 이름(공백/따옴표 무시)이 같으면 같은 프레임 (한 묶음에 여러 번 나오면 가장 강한 것만 반영).
+      echo_strength 는 전체 묶음 기준 가중 평균
+      (프레임이 나오지 않은 묶음은 0 으로 계산하므로 여러 묶음에서 반복된 프레임일수록 강함),
+      sentiment 는 가중 다수결, key_arguments 는 중복 없이 합침
+    - polarization_index: 가중 평균, viral_potential: 가중 다수결
+    - summary: 반응이 많은 묶음 순으로 최대 3개 요약을 이어 붙임
+
+    Args:
+        partials: (부분 분석 dict, 가중치) 리스트
+
+    Returns:
+        dict: analyze_echo_frames 와 같은 형식 (+ map_reduce: 묶음/반응 수)
+    """
+    total_weight = sum(weight for _, weight in partials) or 1
+    frames = {}
+    for report, weight in partials:
+        strongest = {}  # 이 묶음 안에서 같은 프레임이 여러 번 나오면 가장 강한 것 하나만 반영
+        for frame in report.get('top_frames') or []:
+            name = str(frame.get('frame_name') or '').strip()
+            if not name:
+                continue
+            key = _FRAME_KEY_RE.sub('', name)
+            merged = frames.setdefault(key, {
+                'frame_name': name, 'strength': 0.0, 'sentiments': [], 'arguments': []})
+            try:
+                strength = float(frame.get('echo_strength') or 0)
+            except (TypeError, ValueError):
+                strength = 0.0
+            if key not in strongest or strength > strongest[key][0]:
+                strongest[key] = (strength, frame.get('sentiment'))
+            for argument in frame.get('key_arguments') or []:
+                if argument not in merged['arguments']:
+                    merged['arguments'].append(argument)
+        for key, (strength, sentiment) in strongest.items():
+            frames[key]['strength'] += strength * weight
+            frames[key]['sentiments'].append((sentiment, weight))
+
+    top_frames = sorted(({
+        'frame_name': f['frame_name'],
+        'sentiment': _weighted_mode(f['sentiments']) or '중립',
+        'echo_strength': round(f['strength'] / total_weight, 2),
+        'key_arguments': f['arguments'][:4],
+    } for f in frames.values()), key=lambda f: -f['echo_strength'])[:MAX_MERGED_FRAMES]
+
+    polarization = []
+    for report, weight in partials:
+        try:
+            polarization.append((float(report.get('polarization_index')), weight))
+        except (TypeError, ValueError):
+            continue
+    polarization_weight = sum(weight for _, weight in polarization)
+    by_size = sorted(partials, key=lambda p: -p[1])
+    summaries = []
+    for report, _ in by_size:
+        summary = report.get('summary')
+        if summary and summary not in summaries:
+            summaries.append(summary)
+
+    return {
+        'candidate': candidate_name,
+        'top_frames': top_frames,
+        'polarization_index': round(sum(v * w for v, w in polarization) / polarization_weight, 2)
+                              if polarization_weight else 0.0,
+        'viral_potential': _weighted_mode(
+            (report.get('viral_potential'), weight) for report, weight in partials) or '중간',
+        'summary': ' / '.join(summaries[:3]),
+        'map_reduce': {'chunks': len(partials), 'reactions': sum(w for _, w in partials)},
+    }
@@ -0,0 +1,90 @@
+"""
+RSS 피드 조건부 요청 캐시 (ETag / Last-Modified) + 피드별 워터마크
+변경되지 않은 피드는 304 응답만 받고 파싱을 건너뛰고, 변경된 피드도 지난번 최신 항목까지만 파싱
+"""
+
+import time
+
+from storage_utils import load_json, save_json_atomic
+
+FEED_CACHE_FILE = 'feed_cache.json'
+
+# 워터마크 사용 시 피드별로 보관할 최근 관련 기사 수 (새 항목만 파싱해도 전체 목록을 돌려주기 위함)
+MAX_CACHED_ARTICLES = 200
+
+
+class FeedCache:
+    """피드 URL별 검증자(ETag, Last-Modified)와 마지막 수집 결과를 저장"""
+
+    def __init__(self, path=FEED_CACHE_FILE):
+        self.path = path
+        self.entries = load_json(path, {})
+        self.hits = 0
+        self.misses = 0
+        self.early_stops = 0
+
+    def conditional_headers(self, url):
+        """저장된 검증자로 조건부 요청 헤더 생성"""
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def cached_articles(self, url):
+        """304 응답 시 재사용할 마지막 수집 기사"""
+        self.hits += 1
+        entry = self.entries.get(url, {})
+        entry['checked_at'] = time.time()
+        return [dict(a) for a in entry.get('articles', [])]
+
+    def watermark(self, url):
+        """
+        지난 실행에서 본 가장 최신 항목 {'id', 'published_ts', 'descending'}
+        (최신순이 아닌 피드는 본 항목 id 목록 'seen' 포함, 없으면 None)
+        """
+        return self.entries.get(url, {}).get('watermark')
+
+    def update(self, url, headers, articles, watermark=None, stopped_early=False):
+        """
+        200 응답의 검증자와 추출된 기사를 저장
+
+        워터마크가 주어지면 articles 는 새 항목에서 나온 기사만이므로 이전 기사와 합쳐 보관.
+        보관본과 반환값은 서로 다른 dict 사본이므로, 추출 단계가 기사를 고쳐도(본문 교체,
+        사전 분류 기록 등) 캐시에는 피드 내용만 남음
+
+        Returns:
+            list: 이 피드의 현재 관련 기사 (새 기사 + 이전에 보관된 기사)
+        """
+        self.misses += 1
+        if stopped_early:
+            self.early_stops += 1
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        now = time.time()
+        previous = self.entries.get(url, {})
+        if watermark is not None:
+            urls = {a['url'] for a in articles}
+            articles = articles + [a for a in previous.get('articles', [])
+                                   if a['url'] not in urls]
+            articles = articles[:MAX_CACHED_ARTICLES]
+        self.entries[url] = {
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
+            'fetched_at': now,
+            'checked_at': now,
+            'articles': [dict(a) for a in articles],
+        }
+        if watermark is not None:
+            self.entries[url]['watermark'] = watermark
+        return [dict(a) for a in articles]
+
+    def save(self):
+        save_json_atomic(self.path, self.entries)
+
+    def summary(self):
+        return (f"피드 캐시: 변경 없음(304) {self.hits}개, 새로 파싱 {self.misses}개 "
+                f"(워터마크에서 조기 종료 {self.early_stops}개)")
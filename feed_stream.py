@@ -0,0 +1,235 @@
+"""
+스트리밍 RSS/Atom 리더 - 항목을 하나씩 파싱하다 지난 실행의 워터마크에 닿으면 중단
+allArticle.xml 처럼 큰 피드에서 새 항목만큼만 파싱하고 메모리에 올림
+"""
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _local(tag):
+    """'{namespace}name' -> 'name'"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_timestamp(value):
+    """RSS(RFC 822) / Atom(ISO 8601) 날짜를 epoch 초로 (해석할 수 없으면 None)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _item_from_element(elem):
+    """<item> / <entry> 요소를 feedparser 항목과 같은 키의 dict 로"""
+    item = {}
+    for child in elem:
+        name = _local(child.tag)
+        text = (child.text or '').strip()
+        if name == 'link':
+            # Atom 은 <link href="..."/>, 대체 링크가 여러 개면 rel="alternate" 우선
+            href = child.get('href')
+            if href is not None:
+                if child.get('rel', 'alternate') == 'alternate' or 'link' not in item:
+                    item['link'] = href
+            elif text:
+                item['link'] = text
+        elif name in ('description', 'summary'):
+            item.setdefault('summary', text)
+        elif name == 'encoded' and 'summary' not in item:
+            item['summary'] = text
+        elif name == 'content' and 'summary' not in item:
+            item['summary'] = text
+        elif name in ('pubDate', 'published', 'date'):
+            item.setdefault('published', text)
+        elif name == 'updated':
+            item['updated'] = text
+        elif name in ('guid', 'id'):
+            item['id'] = text
+        elif name == 'title':
+            item['title'] = text
+        elif name == 'category':
+            item.setdefault('category', text or child.get('term', ''))
+    item.setdefault('id', item.get('link', ''))
+    return item
+
+
+# 최신순이 확인되지 않은 피드는 id 로 이미 본 항목을 거름 (피드에 남아 있는 항목만 보관하므로 피드 길이 정도)
+MAX_SEEN_IDS = 1000
+
+
+class FeedReadResult:
+    """
+    read_feed 결과
+
+    Attributes:
+        entries: 새 항목 리스트 (feedparser 항목과 같은 키)
+        watermark: 다음 실행에 저장할 워터마크 {'id', 'published_ts', 'descending', 'seen'}
+        stopped_early: 워터마크에 닿아 중간에 파싱을 멈췄는지 (최신순 피드만)
+        valid: 피드로 해석되었는지 (새 항목이 없어도 True 일 수 있음)
+        streamed: 스트리밍 파서를 썼는지 (False 면 feedparser 로 전체 파싱)
+        skipped: 이미 본 항목이라 거른 수 (최신순이 확인되지 않은 피드)
+    """
+
+    def __init__(self, entries, watermark, stopped_early, valid, streamed, skipped=0):
+        self.entries = entries
+        self.watermark = watermark
+        self.stopped_early = stopped_early
+        self.valid = valid
+        self.streamed = streamed
+        self.skipped = skipped
+
+
+def _timestamp(item):
+    return parse_timestamp(item.get('published') or item.get('updated'))
+
+
+def _reached(item, watermark):
+    """
+    이미 처리한 항목에 닿아 파싱을 멈춰도 되는지
+
+    지난 실행에서 피드가 최신순으로 확인된 경우에만 멈춤: 지난 최신 항목 id 와 같거나
+    발행 시각이 워터마크보다 확실히 이른 항목 (최신 항목이 삭제된 경우 대비).
+    순서를 모르는 피드는 끝까지 읽고 _seen_ids 로 거름
+    """
+    if not watermark or not watermark.get('descending'):
+        return False
+    if watermark.get('id') and item.get('id') == watermark['id']:
+        return True
+    if watermark.get('published_ts') is None:
+        return False
+    ts = _timestamp(item)
+    return ts is not None and ts < watermark['published_ts']
+
+
+def _seen_ids(watermark):
+    """최신순이 아닌(또는 모르는) 피드에서 지난 실행에 이미 본 항목 id 집합 (피드마다 한 번 만듦)"""
+    if not watermark or watermark.get('descending'):
+        return frozenset()
+    return frozenset(watermark.get('seen') or ())
+
+
+def _seen(item, seen_ids):
+    return bool(item.get('id')) and item['id'] in seen_ids
+
+
+def _next_watermark(entries, watermark, observed_ids):
+    """
+    다음 실행용 워터마크
+
+    id 는 발행 시각이 가장 늦은 항목 (시각이 없으면 최신순 피드의 첫 항목),
+    최신순이 아닌 피드는 이번에 본 모든 항목 id 를 seen 으로 보관
+
+    Args:
+        entries: 이번 실행의 새 항목
+        watermark: 지난 워터마크
+        observed_ids: 이번에 파싱한 모든 항목 id (거른 항목 포함, 피드 순서)
+    """
+    if not entries:
+        return watermark
+    watermark = watermark or {}
+    stamped = [(ts, e) for e in entries for ts in [_timestamp(e)] if ts is not None]
+    timestamps = [ts for ts, _ in stamped]
+    if len(timestamps) >= 2:
+        descending = all(a >= b for a, b in zip(timestamps, timestamps[1:]))
+    else:
+        descending = watermark.get('descending', False)
+    if stamped:
+        newest_ts, newest = max(stamped, key=lambda pair: pair[0])
+        published_ts = max(newest_ts, watermark.get('published_ts') or newest_ts)
+    else:
+        newest = entries[0] if descending else entries[-1]
+        published_ts = watermark.get('published_ts')
+    result = {
+        'id': newest.get('id', ''),
+        'published_ts': published_ts,
+        'descending': descending,
+    }
+    if not descending:
+        result['seen'] = [i for i in observed_ids if i][-MAX_SEEN_IDS:]
+    return result
+
+
+def _stream_entries(content, watermark, max_items):
+    seen_ids = _seen_ids(watermark)
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    entries = []
+    observed = []
+    root_name = None
+    for offset in range(0, len(content), CHUNK_SIZE):
+        parser.feed(content[offset:offset + CHUNK_SIZE])
+        for event, elem in parser.read_events():
+            name = _local(elem.tag)
+            if event == 'start':
+                root_name = root_name or name
+                continue
+            if name not in ('item', 'entry'):
+                continue
+            item = _item_from_element(elem)
+            elem.clear()  # 처리한 항목은 바로 해제
+            if _reached(item, watermark) or (max_items and len(entries) >= max_items):
+                return entries, observed, True, root_name
+            observed.append(item.get('id', ''))
+            if not _seen(item, seen_ids):
+                entries.append(item)
+    parser.close()
+    return entries, observed, False, root_name
+
+
+def read_feed(content, watermark=None, max_items=None):
+    """
+    피드 바이트를 스트리밍으로 파싱해 새 항목만 반환
+
+    최신순으로 확인된 피드는 워터마크에 닿으면 파싱을 멈추고, 순서를 모르거나 오래된 순인
+    피드는 끝까지 읽으며 지난 실행에 본 id 를 거름
+
+    expat 이 처리하지 못하는 피드(EUC-KR 선언, 깨진 XML 등)는 feedparser 로 전체 파싱한 뒤
+    같은 워터마크 규칙으로 자름
+
+    Args:
+        content: 피드 원본 바이트
+        watermark: 지난 실행에서 저장한 워터마크 (없으면 전체 항목)
+        max_items: 최대 항목 수
+
+    Returns:
+        FeedReadResult
+    """
+    try:
+        entries, observed, stopped, root_name = _stream_entries(content, watermark, max_items)
+        valid = root_name in ('rss', 'feed', 'RDF') and (bool(observed) or stopped)
+        return FeedReadResult(entries, _next_watermark(entries, watermark, observed),
+                              stopped, valid, streamed=True,
+                              skipped=len(observed) - len(entries))
+    except (ET.ParseError, ValueError, LookupError):
+        pass
+
+    import feedparser
+    feed = feedparser.parse(content)
+    seen_ids = _seen_ids(watermark)
+    entries = []
+    observed = []
+    stopped = False
+    for entry in feed.entries:
+        item = dict(entry)
+        item.setdefault('id', item.get('link', ''))
+        if _reached(item, watermark) or (max_items and len(entries) >= max_items):
+            stopped = True
+            break
+        observed.append(item['id'])
+        if not _seen(item, seen_ids):
+            entries.append(item)
+    return FeedReadResult(entries, _next_watermark(entries, watermark, observed), stopped,
+                          valid=bool(feed.entries), streamed=False,
+                          skipped=len(observed) - len(entries))
@@ -0,0 +1,248 @@
+"""
+기사 본문 수집 - 기사 페이지를 동시에 받아 본문만 추출하고 압축 디스크 캐시에 저장
+RSS 요약/네이버 검색 발췌 대신 후보자가 언급된 본문 문단을 LLM에 전달
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import zlib
+
+from bs4 import BeautifulSoup
+
+from article_store import canonicalize_url
+from polite_fetcher import PoliteFetcher
+
+try:
+    import zstandard
+except ImportError:  # zstandard 가 없으면 zlib 으로 저장
+    zstandard = None
+
+FULL_TEXT_CACHE_DIR = 'fulltext_cache'
+
+# 언론사 CMS 별 본문 영역 (ndsoft 계열 지역 언론사, 네이버 뉴스 등), 앞에서부터 시도
+BODY_SELECTORS = [
+    '#article-view-content-div',
+    '#dic_area',
+    '#newsct_article',
+    '#articleBody',
+    '#article_body',
+    '#news_body_area',
+    '.article_body',
+    '.article-body',
+    '[itemprop="articleBody"]',
+    'article',
+]
+
+# 본문에서 제외할 요소
+NOISE_TAGS = ['script', 'style', 'noscript', 'iframe', 'form', 'button',
+              'nav', 'header', 'footer', 'aside', 'figure', 'figcaption']
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_CHARSET_RE = re.compile(rb'charset=["\']?([\w-]+)', re.IGNORECASE)
+
+MIN_PARAGRAPH_CHARS = 20
+MIN_BODY_CHARS = 200
+
+
+def decode_html(content, headers=None):
+    """응답 헤더 또는 <meta charset> 의 인코딩으로 디코딩 (EUC-KR 을 쓰는 언론사 대응)"""
+    content_type = {k.lower(): v for k, v in (headers or {}).items()}.get('content-type', '')
+    match = _CHARSET_RE.search(content_type.encode('latin-1', errors='ignore'))
+    match = match or _CHARSET_RE.search(content[:4096])
+    encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return content.decode(encoding, errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
+
+
+def _paragraphs_of(element):
+    """요소 안의 문단 텍스트 (p 가 없으면 줄바꿈 기준으로 나눔)"""
+    paragraphs = [_WHITESPACE_RE.sub(' ', p.get_text(' ', strip=True))
+                  for p in element.find_all('p')]
+    if not paragraphs:
+        text = element.get_text('\n', strip=True)
+        paragraphs = [_WHITESPACE_RE.sub(' ', line) for line in text.split('\n')]
+    return [p for p in paragraphs if len(p) >= MIN_PARAGRAPH_CHARS]
+
+
+def extract_paragraphs(html):
+    """
+    기사 페이지에서 본문 문단 추출
+
+    알려진 본문 선택자를 먼저 시도하고, 없으면 p 태그 텍스트가 가장 많이 모인 요소를 본문으로 봄
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+
+    for selector in BODY_SELECTORS:
+        element = soup.select_one(selector)
+        if element is not None:
+            paragraphs = _paragraphs_of(element)
+            if sum(len(p) for p in paragraphs) >= MIN_BODY_CHARS:
+                return paragraphs
+
+    # 문단 밀도 기준: 각 p 의 텍스트 길이를 부모 요소에 더해 가장 큰 요소 선택
+    parents = {}
+    scores = {}
+    for p in soup.find_all('p'):
+        text = p.get_text(' ', strip=True)
+        if len(text) < MIN_PARAGRAPH_CHARS or p.parent is None:
+            continue
+        parents[id(p.parent)] = p.parent
+        scores[id(p.parent)] = scores.get(id(p.parent), 0) + len(text)
+    if not scores:
+        return []
+    return _paragraphs_of(parents[max(scores, key=scores.get)])
+
+
+class FullTextCache:
+    """
+    URL 별 본문 문단 디스크 캐시
+
+    정규화 URL 의 sha256 을 파일 이름으로 사용해 같은 기사는 한 번만 받음
+    zstandard 가 설치되어 있으면 .zst, 아니면 .z (zlib) 로 저장하고 둘 다 읽음
+    """
+
+    def __init__(self, directory=FULL_TEXT_CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.stored_bytes = 0
+        self.raw_bytes = 0
+
+    def _path(self, url, suffix):
+        digest = hashlib.sha256(canonicalize_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + suffix)
+
+    def get(self, url):
+        """캐시된 본문 문단 리스트 (없으면 None)"""
+        for suffix in ('.zst', '.z'):
+            path = self._path(url, suffix)
+            if suffix == '.zst' and zstandard is None or not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            if suffix == '.zst':
+                data = zstandard.ZstdDecompressor().decompress(data)
+            else:
+                data = zlib.decompress(data)
+            self.hits += 1
+            return json.loads(data.decode('utf-8'))
+        self.misses += 1
+        return None
+
+    def put(self, url, paragraphs):
+        data = json.dumps(paragraphs, ensure_ascii=False).encode('utf-8')
+        if zstandard is not None:
+            suffix, compressed = '.zst', zstandard.ZstdCompressor(level=10).compress(data)
+        else:
+            suffix, compressed = '.z', zlib.compress(data, 9)
+        path = self._path(url, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        self.raw_bytes += len(data)
+        self.stored_bytes += len(compressed)
+
+    def summary(self):
+        ratio = self.stored_bytes / self.raw_bytes if self.raw_bytes else 0
+        return (f"본문 캐시: 적중 {self.hits}회, 새로 받음 {self.misses}회, "
+                f"압축률 {ratio:.0%} ({self.directory})")
+
+
+def relevant_paragraphs(paragraphs, matcher, max_chars=3000):
+    """
+    첫 문단(리드) + 후보자가 언급된 문단만 max_chars 까지 남김
+
+    Returns:
+        str: 문단을 줄바꿈으로 이은 텍스트 (후보자 언급 문단이 없으면 빈 문자열)
+    """
+    mentioned = [i for i, p in enumerate(paragraphs) if matcher.mentions_any(p)]
+    if not mentioned:
+        return ''
+    selected = []
+    used = 0
+    for i in sorted({0, *mentioned}):
+        if used + len(paragraphs[i]) > max_chars and selected:
+            break
+        selected.append(paragraphs[i])
+        used += len(paragraphs[i])
+    return '\n'.join(selected)
+
+
+class FullTextFetcher:
+    """기사 목록의 본문을 도메인별 제한 하에 동시에 받아 content 를 관련 문단으로 교체"""
+
+    def __init__(self, matcher, cache=None, fetcher=None, max_chars=3000):
+        """
+        Args:
+            matcher: CandidateMatcher (관련 문단 판별용)
+            cache: FullTextCache (기본: fulltext_cache/)
+            fetcher: PoliteFetcher (기본: 도메인당 동시 2개)
+            max_chars: 기사당 LLM 에 넘길 최대 본문 길이
+        """
+        self.matcher = matcher
+        self.cache = cache or FullTextCache()
+        self.fetcher = fetcher or PoliteFetcher()
+        self.max_chars = max_chars
+        self.stats = {'enriched': 0, 'failed': 0, 'no_mention': 0}
+
+    async def paragraphs_for(self, urls):
+        """URL -> 본문 문단 리스트 (캐시에 없는 URL 만 동시에 받음, 실패한 URL 은 빠짐)"""
+        results = {}
+        missing = []
+        for url in dict.fromkeys(urls):
+            cached = self.cache.get(url)
+            if cached is None:
+                missing.append(url)
+            else:
+                results[url] = cached
+
+        async for result in self.fetcher.iter_fetch(missing):
+            if result['error'] or result['status'] != 200:
+                self.stats['failed'] += 1
+                continue
+            html = decode_html(result['content'], result['headers'])
+            paragraphs = await asyncio.to_thread(extract_paragraphs, html)
+            if not paragraphs:
+                self.stats['failed'] += 1
+                continue
+            self.cache.put(result['url'], paragraphs)
+            results[result['url']] = paragraphs
+        return results
+
+    async def enrich(self, articles):
+        """
+        기사의 content 를 후보자 관련 본문 문단으로 교체 (원래 요약은 summary 에 보관)
+
+        본문을 받지 못했거나 관련 문단이 없는 기사는 원래 요약을 그대로 사용
+        """
+        paragraphs_by_url = await self.paragraphs_for([a['url'] for a in articles])
+        for article in articles:
+            paragraphs = paragraphs_by_url.get(article['url'])
+            if not paragraphs:
+                continue
+            text = relevant_paragraphs(paragraphs, self.matcher, self.max_chars)
+            if not text:
+                self.stats['no_mention'] += 1
+                continue
+            article.setdefault('summary', article['content'])
+            article['content'] = text
+            self.stats['enriched'] += 1
+        return articles
+
+    def enrich_sync(self, articles):
+        """enrich 의 동기 버전"""
+        return asyncio.run(self.enrich(articles))
+
+    def summary(self):
+        s = self.stats
+        return (f"본문 수집: 교체 {s['enriched']}개, 관련 문단 없음 {s['no_mention']}개, "
+                f"실패 {s['failed']}개 / {self.cache.summary()}")
@@ -0,0 +1,29 @@
+"""
+피드 요약문용 경량 HTML -> 텍스트 변환
+기사마다 BeautifulSoup 트리를 만들지 않고 한 번의 정규식 치환 + 엔티티 디코딩으로 처리
+"""
+
+import html
+import re
+
+# 주석, script/style 블록, 일반 태그 (따옴표 속 `>` 허용, `a < b` 같은 본문 속 부등호는 태그로 보지 않음)
+_TAG_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style)\b[^>]*>.*?</\1\s*>'
+    r'|</?[A-Za-z!?](?:[^>"\']|"[^"]*"|\'[^\']*\')*>',
+    re.DOTALL | re.IGNORECASE
+)
+
+
+def html_to_text(markup):
+    """
+    HTML 조각에서 텍스트만 추출 (BeautifulSoup(markup, 'html.parser').get_text() 와 동일 결과 목표)
+
+    태그를 제거한 뒤 엔티티(&amp;, &#39; 등)를 디코딩하므로
+    본문에 이스케이프된 `&lt;b&gt;` 는 태그로 지워지지 않고 `<b>` 텍스트로 남음
+    """
+    if not markup:
+        return ''
+    if '<' not in markup and '&' not in markup:
+        return markup
+    return html.unescape(_TAG_RE.sub('', markup))
@@ -0,0 +1,231 @@
+"""
+HTTP 기록/재생 아카이브 - 네트워크 없이 같은 입력으로 크롤러를 다시 실행하기 위한 httpx 전송 계층
+
+HTTP_ARCHIVE_MODE=record 이면 모든 응답(본문, 헤더, 상태, 소요 시간)을 아카이브에 기록하고,
+HTTP_ARCHIVE_MODE=replay 이면 같은 요청에 기록된 응답을 돌려줌 (http_client 가 자동으로 사용)
+
+아카이브 구조 (HTTP_ARCHIVE_PATH, 기본 http_archive/):
+    index.jsonl        요청 1건당 한 줄 (method, url, status, headers, body, elapsed, recorded_at)
+    bodies/<sha>.gz    본문 (sha256 이름, gzip 압축, 같은 본문은 한 번만 저장)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+import httpx
+
+HTTP_ARCHIVE_DIR = 'http_archive'
+
+# 본문은 디코딩된 상태로 저장하므로 재생 시 길이/압축 관련 헤더는 빼고 돌려줌
+_DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class HttpArchive:
+    """index.jsonl + bodies/ 디렉터리로 된 응답 아카이브 (스레드 안전)"""
+
+    def __init__(self, path=HTTP_ARCHIVE_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+        self._replay_pos = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.missing = 0
+
+    @property
+    def index_path(self):
+        return os.path.join(self.path, 'index.jsonl')
+
+    def _body_path(self, digest):
+        return os.path.join(self.path, 'bodies', digest + '.gz')
+
+    @staticmethod
+    def request_key(method, url):
+        return f"{method.upper()} {url}"
+
+    def record(self, request, response, content, elapsed):
+        """응답 1건 기록 (본문은 내용 주소로 한 번만 저장)"""
+        digest = hashlib.sha256(content).hexdigest()
+        entry = {
+            'method': request.method,
+            'url': str(request.url),
+            'status': response.status_code,
+            'headers': [[k, v] for k, v in response.headers.multi_items()
+                        if k.lower() not in _DROP_HEADERS],
+            'body': digest,
+            'elapsed': round(elapsed, 4),
+            'recorded_at': time.time(),
+        }
+        with self._lock:
+            body_path = self._body_path(digest)
+            if not os.path.exists(body_path):
+                os.makedirs(os.path.dirname(body_path), exist_ok=True)
+                tmp_path = body_path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(gzip.compress(content))
+                os.replace(tmp_path, body_path)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.recorded += 1
+
+    def _load(self):
+        entries = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        key = self.request_key(entry['method'], entry['url'])
+                        entries.setdefault(key, []).append(entry)
+        return entries
+
+    def lookup(self, method, url):
+        """
+        기록된 응답 (entry, 본문) 반환, 없으면 None
+
+        같은 URL 이 여러 번 기록되어 있으면 기록 순서대로 돌려주고 마지막 응답을 반복
+        """
+        key = self.request_key(method, url)
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            entries = self._entries.get(key)
+            if not entries:
+                self.missing += 1
+                return None
+            pos = self._replay_pos.get(key, 0)
+            self._replay_pos[key] = pos + 1
+            entry = entries[min(pos, len(entries) - 1)]
+            self.replayed += 1
+        with open(self._body_path(entry['body']), 'rb') as f:
+            return entry, gzip.decompress(f.read())
+
+    def summary(self):
+        return (f"HTTP 아카이브: 기록 {self.recorded}건, 재생 {self.replayed}건, "
+                f"아카이브에 없음 {self.missing}건 ({self.path})")
+
+
+def _replayed_response(archive, request):
+    found = archive.lookup(request.method, str(request.url))
+    if found is None:
+        raise httpx.ConnectError(f"아카이브에 없는 요청: {request.method} {request.url}",
+                                 request=request)
+    entry, content = found
+    return entry, httpx.Response(entry['status'], headers=entry['headers'],
+                                 content=content, request=request)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """실제 전송 계층을 감싸 모든 응답을 아카이브에 기록"""
+
+    def __init__(self, inner, archive):
+        self.inner = inner
+        self.archive = archive
+
+    def handle_request(self, request):
+        started = time.monotonic()
+        response = self.inner.handle_request(request)
+        try:
+            content = b''.join(httpx.Response(
+                response.status_code, headers=response.headers,
+                stream=response.stream, request=request).iter_bytes())
+        finally:
+            response.close()
+        elapsed = time.monotonic() - started
+        self.archive.record(request, response, content, elapsed)
+        headers = [(k, v) for k, v in response.headers.multi_items()
+                   if k.lower() not in _DROP_HEADERS]
+        return httpx.Response(response.status_code, headers=headers,
+                              content=content, request=request,
+                              extensions=response.extensions)
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """RecordingTransport 의 비동기 버전"""
+
+    def __init__(self, inner, archive):
+        self.inner = inner
+        self.archive = archive
+
+    async def handle_async_request(self, request):
+        started = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        try:
+            chunks = [chunk async for chunk in httpx.Response(
+                response.status_code, headers=response.headers,
+                stream=response.stream, request=request).aiter_bytes()]
+        finally:
+            await response.aclose()
+        content = b''.join(chunks)
+        elapsed = time.monotonic() - started
+        await asyncio.to_thread(self.archive.record, request, response, content, elapsed)
+        headers = [(k, v) for k, v in response.headers.multi_items()
+                   if k.lower() not in _DROP_HEADERS]
+        return httpx.Response(response.status_code, headers=headers,
+                              content=content, request=request,
+                              extensions=response.extensions)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """
+    아카이브에서 응답을 돌려주는 전송 계층 (네트워크 사용 안 함)
+
+    아카이브에 없는 요청은 연결 오류로 처리하므로 수집기의 기존 오류 처리 경로를 그대로 탐
+    realtime=True 면 기록된 소요 시간만큼 기다렸다가 응답
+    """
+
+    def __init__(self, archive, realtime=False):
+        self.archive = archive
+        self.realtime = realtime
+
+    def handle_request(self, request):
+        entry, response = _replayed_response(self.archive, request)
+        if self.realtime:
+            time.sleep(entry['elapsed'])
+        return response
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    """ReplayTransport 의 비동기 버전"""
+
+    def __init__(self, archive, realtime=False):
+        self.archive = archive
+        self.realtime = realtime
+
+    async def handle_async_request(self, request):
+        entry, response = _replayed_response(self.archive, request)
+        if self.realtime:
+            await asyncio.sleep(entry['elapsed'])
+        return response
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def archive_mode():
+    """HTTP_ARCHIVE_MODE 환경변수 ('record', 'replay' 또는 '' = 사용 안 함)"""
+    mode = os.environ.get('HTTP_ARCHIVE_MODE', '').strip().lower()
+    if mode not in ('', 'record', 'replay'):
+        raise ValueError(f"HTTP_ARCHIVE_MODE 는 record 또는 replay: {mode}")
+    return mode
+
+
+def get_archive():
+    """프로세스 공용 아카이브 (HTTP_ARCHIVE_PATH, 기본 http_archive/)"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = HttpArchive(os.environ.get('HTTP_ARCHIVE_PATH', HTTP_ARCHIVE_DIR))
+        return _archive
@@ -0,0 +1,207 @@
+"""
+크롤러 공용 HTTP 클라이언트
+연결 재사용(keep-alive), 가능하면 HTTP/2, 연결/읽기 타임아웃, 제한된 재시도, 요청별 지연 시간 기록
+HTTP_ARCHIVE_MODE=record/replay 이면 응답을 아카이브에 기록하거나 아카이브에서 재생 (http_archive.py)
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import httpx
+
+import http_archive
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+}
+
+# 연결 5초, 읽기 15초
+DEFAULT_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+# 이 상태 코드는 잠시 후 다시 시도
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# 속도 제한기(rate_limiter)로 감싼 요청용 - 429/503 은 제한기가 속도를 낮춰 재시도하므로 여기서는 재시도 안 함
+LIMITED_RETRY_STATUSES = {500, 502, 504}
+
+
+def _http2_available():
+    try:
+        import h2  # noqa: F401  (httpx[http2] 설치 시에만 HTTP/2 사용)
+        return True
+    except ImportError:
+        return False
+
+
+def _accept_encoding():
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        pass
+    return ', '.join(encodings)
+
+
+def _archive_transport(is_async):
+    """기록/재생 모드의 전송 계층 (모드가 꺼져 있으면 None = httpx 기본 전송)"""
+    mode = http_archive.archive_mode()
+    if not mode:
+        return None
+    archive = http_archive.get_archive()
+    if mode == 'replay':
+        realtime = os.environ.get('HTTP_ARCHIVE_REALTIME', '0') == '1'
+        if is_async:
+            return http_archive.AsyncReplayTransport(archive, realtime)
+        return http_archive.ReplayTransport(archive, realtime)
+    if is_async:
+        inner = httpx.AsyncHTTPTransport(http2=_http2_available(), limits=DEFAULT_LIMITS)
+        return http_archive.AsyncRecordingTransport(inner, archive)
+    inner = httpx.HTTPTransport(http2=_http2_available(), limits=DEFAULT_LIMITS)
+    return http_archive.RecordingTransport(inner, archive)
+
+
+def client_options(is_async=False):
+    """동기/비동기 클라이언트 공통 설정"""
+    options = {
+        'headers': {**DEFAULT_HEADERS, 'Accept-Encoding': _accept_encoding()},
+        'timeout': DEFAULT_TIMEOUT,
+        'limits': DEFAULT_LIMITS,
+        'http2': _http2_available(),
+        'follow_redirects': True,
+    }
+    transport = _archive_transport(is_async)
+    if transport is not None:
+        options['transport'] = transport
+    return options
+
+
+class HttpMetrics:
+    """요청별 지연 시간/상태 기록 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = []
+
+    def record(self, url, status, elapsed, attempts, error=None):
+        with self._lock:
+            self.records.append({
+                'host': urlparse(url).netloc.lower(),
+                'status': status,
+                'elapsed': elapsed,
+                'attempts': attempts,
+                'error': error,
+            })
+
+    @staticmethod
+    def _percentile(values, q):
+        if not values:
+            return 0.0
+        values = sorted(values)
+        return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+    def summary(self):
+        """호스트별 요청 수, 오류 수, p50/p95/최대 지연 시간"""
+        with self._lock:
+            records = list(self.records)
+        by_host = {}
+        for r in records:
+            by_host.setdefault(r['host'], []).append(r)
+        lines = []
+        for host, rs in sorted(by_host.items(), key=lambda x: -len(x[1])):
+            elapsed = [r['elapsed'] for r in rs]
+            errors = sum(1 for r in rs if r['error'] or (r['status'] or 0) >= 400)
+            retries = sum(r['attempts'] - 1 for r in rs)
+            lines.append(
+                f"  {host}: {len(rs)}건, 오류 {errors}건, 재시도 {retries}회, "
+                f"p50 {self._percentile(elapsed, 0.5):.2f}초 / "
+                f"p95 {self._percentile(elapsed, 0.95):.2f}초 / 최대 {max(elapsed):.2f}초")
+        return lines
+
+
+metrics = HttpMetrics()
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 공용 동기 클라이언트 (연결 풀 공유, 스레드 안전)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(**client_options())
+        return _client
+
+
+def make_async_client(**overrides):
+    """같은 설정의 비동기 클라이언트 (이벤트 루프마다 새로 만들어 async with 로 사용)"""
+    return httpx.AsyncClient(**{**client_options(is_async=True), **overrides})
+
+
+def _backoff(attempt):
+    return min(10.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def get(url, params=None, headers=None, retries=2, client=None, retry_statuses=RETRY_STATUSES):
+    """
+    GET 요청 (연결 오류/타임아웃/retry_statuses(기본 429·5xx) 는 최대 retries 회 재시도)
+
+    Returns:
+        httpx.Response (재시도 후에도 실패한 상태 코드 응답은 그대로 반환)
+
+    Raises:
+        httpx.HTTPError: 재시도 후에도 연결/타임아웃 오류가 나면 발생
+    """
+    client = client or get_client()
+    started = time.monotonic()
+    for attempt in range(retries + 1):
+        try:
+            response = client.get(url, params=params, headers=headers)
+        except httpx.TransportError as e:
+            if attempt < retries:
+                time.sleep(_backoff(attempt))
+                continue
+            metrics.record(url, None, time.monotonic() - started, attempt + 1, str(e))
+            raise
+        if response.status_code in retry_statuses and attempt < retries:
+            time.sleep(_backoff(attempt))
+            continue
+        metrics.record(url, response.status_code, time.monotonic() - started, attempt + 1)
+        return response
+
+
+async def async_get(client, url, params=None, headers=None, retries=2,
+                    retry_statuses=RETRY_STATUSES):
+    """get 의 비동기 버전 (make_async_client 로 만든 클라이언트 사용)"""
+    started = time.monotonic()
+    for attempt in range(retries + 1):
+        try:
+            response = await client.get(url, params=params, headers=headers)
+        except httpx.TransportError as e:
+            if attempt < retries:
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            metrics.record(url, None, time.monotonic() - started, attempt + 1, str(e))
+            raise
+        if response.status_code in retry_statuses and attempt < retries:
+            await asyncio.sleep(_backoff(attempt))
+            continue
+        metrics.record(url, response.status_code, time.monotonic() - started, attempt + 1)
+        return response
+
+
+def print_http_summary():
+    """호스트별 요청 지연 시간 요약 출력"""
+    lines = metrics.summary()
+    if lines:
+        print("\n🌐 HTTP 요청 통계")
+        for line in lines:
+            print(line)
+    if http_archive.archive_mode():
+        print(f"  {http_archive.get_archive().summary()}")
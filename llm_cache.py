@@ -0,0 +1,131 @@
+"""
+LLM 응답 디스크 캐시 (내용 주소 기반)
+모델 + 프롬프트 + 파라미터의 해시를 키로 응답을 저장해 재실행 시 유료 API 호출을 건너뜀
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+LLM_CACHE_FILE = 'llm_cache.sqlite'
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# 호출 지점별 캐시 유효기간 (같은 프롬프트라도 시의성이 다름)
+DEFAULT_SITE_TTLS = {
+    'local_extract': 30 * DAY,        # 기사 관계 추출은 기사 내용이 같으면 결과도 같음
+    'local_extract_batch': 30 * DAY,
+    'news_extract': 30 * DAY,
+    'news_extract_batch': 30 * DAY,
+    'echo_frames': DAY,               # 커뮤니티 여론은 하루 단위로 갱신
+    'event_simulation': 7 * DAY,
+    'strategic_report': 12 * HOUR,
+}
+DEFAULT_TTL = 7 * DAY
+
+
+def cache_key(provider, model, prompt, params):
+    """모델/프롬프트/파라미터로 캐시 키 생성"""
+    payload = json.dumps({'provider': provider, 'model': model,
+                          'prompt': prompt, 'params': params or {}},
+                         ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """크기 제한 LRU + 호출 지점별 TTL 을 갖는 SQLite 응답 캐시 (스레드 안전)"""
+
+    def __init__(self, path=LLM_CACHE_FILE, max_bytes=200 * 1024 * 1024,
+                 site_ttls=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.site_ttls = {**DEFAULT_SITE_TTLS, **(site_ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                site TEXT,
+                created REAL,
+                accessed REAL,
+                size INTEGER,
+                value TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed)")
+        self._conn.commit()
+        # 저장된 전체 크기는 열 때 한 번만 합산하고 이후에는 쓰기/삭제마다 갱신
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl_for(self, site):
+        return self.site_ttls.get(site, DEFAULT_TTL)
+
+    def get(self, key, site):
+        """캐시된 응답 (없거나 TTL 만료 시 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created, size, value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            created, size, value = row
+            if now - created > self.ttl_for(site):
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return value
+
+    def put(self, key, site, value):
+        now = time.time()
+        size = len(value.encode('utf-8'))
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, site, now, now, size, value))
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """전체 크기가 max_bytes 를 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= size
+
+    def summary(self):
+        return f"LLM 캐시: 적중 {self.hits}회, 미적중 {self.misses}회 ({self.path})"
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """프로세스 공용 캐시 (LLM_CACHE=0 이면 비활성화되어 None, 여러 스레드에서 처음 호출해도 하나만 생성)"""
+    global _shared_cache
+    if os.environ.get('LLM_CACHE', '1') == '0':
+        return None
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = LLMCache(os.environ.get('LLM_CACHE_PATH', LLM_CACHE_FILE))
+    return _shared_cache
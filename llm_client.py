@@ -0,0 +1,360 @@
+"""
+LLM 호출 공통 모듈 (Gemini / Anthropic)
+모든 호출 지점이 같은 응답 캐시를 거치도록 한 곳에서 호출
+호출마다 토큰/지연/재시도/파싱 실패를 llm_telemetry 에 기록
+
+generate(site, prompt) 는 llm_policy 의 호출 지점별 모델 순서를 따라 오류 시 다른 제공자로 넘어가고,
+hedge_after 가 설정되면 느린 요청에 다음 모델로 헤지 요청을 보냄
+complete(site, provider, model, prompt) 는 지정한 모델 하나만 호출
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from llm_cache import cache_key, get_shared_cache
+from llm_policy import FULL, api_key_env, base_url, get_policy, provider_available
+from llm_telemetry import telemetry
+from rate_limiter import get_limiter
+from tokens import estimate_tokens
+
+
+class LLMResponseParseError(Exception):
+    """API 호출은 성공했지만 응답을 파싱하지 못한 경우 (이 응답은 캐시하지 않음)"""
+
+    def __init__(self, message, response_text):
+        super().__init__(message)
+        self.response_text = response_text
+
+
+_anthropic_client = None
+_async_anthropic_clients = {}  # 이벤트 루프별 비동기 클라이언트
+_gemini_configured = False
+_client_lock = threading.Lock()
+
+
+def _anthropic_key():
+    """stub 서버 주소만 설정된 경우에는 임의 키로 접속"""
+    return os.environ.get("ANTHROPIC_API_KEY") or ("stub" if base_url('anthropic') else None)
+
+
+def _anthropic():
+    global _anthropic_client
+    with _client_lock:
+        if _anthropic_client is None:
+            from anthropic import Anthropic
+            _anthropic_client = Anthropic(api_key=_anthropic_key(),
+                                          base_url=base_url('anthropic'))
+        return _anthropic_client
+
+
+def _async_anthropic():
+    """현재 이벤트 루프용 AsyncAnthropic 클라이언트 (asyncio.run 마다 새 루프가 생기므로 루프별로 보관)"""
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _async_anthropic_clients.get(id(loop))
+        if client is None:
+            from anthropic import AsyncAnthropic
+            _async_anthropic_clients.clear()
+            client = AsyncAnthropic(api_key=_anthropic_key(),
+                                    base_url=base_url('anthropic'))
+            _async_anthropic_clients[id(loop)] = client
+        return client
+
+
+def _gemini_model(model):
+    global _gemini_configured
+    import google.generativeai as genai
+    with _client_lock:
+        if not _gemini_configured and base_url('gemini'):
+            # stub 서버 등 다른 주소는 REST 전송으로 접속
+            genai.configure(api_key=os.environ.get("GEMINI_API_KEY", "stub"), transport='rest',
+                            client_options={'api_endpoint': base_url('gemini')})
+            _gemini_configured = True
+        elif not _gemini_configured and os.environ.get("GEMINI_API_KEY"):
+            genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+            _gemini_configured = True
+    return genai.GenerativeModel(model)
+
+
+def _anthropic_usage(message):
+    usage = getattr(message, 'usage', None)
+    if usage is None:
+        return None
+    return {'input_tokens': usage.input_tokens, 'output_tokens': usage.output_tokens}
+
+
+def _gemini_usage(response):
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is None:
+        return None
+    return {'input_tokens': usage.prompt_token_count,
+            'output_tokens': usage.candidates_token_count}
+
+
+def _call_provider(provider, model, prompt, max_tokens):
+    """제공자 호출 1회 - (응답 텍스트, 토큰 사용량 또는 None)"""
+    if provider == 'anthropic':
+        message = _anthropic().messages.create(
+            model=model,
+            max_tokens=max_tokens or 2000,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return message.content[0].text, _anthropic_usage(message)
+    if provider == 'gemini':
+        kwargs = {}
+        if max_tokens:
+            kwargs['generation_config'] = {'max_output_tokens': max_tokens}
+        response = _gemini_model(model).generate_content(prompt, **kwargs)
+        return response.text, _gemini_usage(response)
+    raise ValueError(f"지원하지 않는 LLM 제공자: {provider}")
+
+
+async def _acall_provider(provider, model, prompt, max_tokens):
+    if provider == 'anthropic':
+        message = await _async_anthropic().messages.create(
+            model=model,
+            max_tokens=max_tokens or 2000,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return message.content[0].text, _anthropic_usage(message)
+    if provider == 'gemini':
+        kwargs = {}
+        if max_tokens:
+            kwargs['generation_config'] = {'max_output_tokens': max_tokens}
+        response = await _gemini_model(model).generate_content_async(prompt, **kwargs)
+        return response.text, _gemini_usage(response)
+    raise ValueError(f"지원하지 않는 LLM 제공자: {provider}")
+
+
+def _finish(site, key, text, call, parse):
+    """파싱 후 (성공한 새 응답만) 캐시에 저장"""
+    call.output_text = text
+    result = text
+    if parse is not None:
+        try:
+            result = parse(text)
+        except Exception as e:
+            call.parse_failed = True
+            raise LLMResponseParseError(f"응답 파싱 실패 ({site}): {e}", text) from e
+
+    cache = get_shared_cache()
+    if cache and not call.from_cache:
+        cache.put(key, site, text)
+    return result
+
+
+def complete(site, provider, model, prompt, max_tokens=None, parse=None):
+    """
+    LLM 호출 (캐시 적중 시 API 호출 없이 저장된 응답 사용, 미적중 시 공용 속도 제한기 경유)
+
+    Args:
+        site: 호출 지점 이름 (캐시 TTL 구분용, 예: 'local_extract')
+        provider: 'gemini' 또는 'anthropic'
+        model: 모델 이름
+        prompt: 프롬프트
+        max_tokens: 최대 출력 토큰 (Anthropic 기본 2000, Gemini 기본 제한 없음)
+        parse: 응답 텍스트 파싱 함수. 파싱에 실패한 응답은 캐시하지 않고
+            LLMResponseParseError 발생
+
+    Returns:
+        parse 가 있으면 파싱 결과, 없으면 응답 텍스트
+    """
+    cache = get_shared_cache()
+    key = cache_key(provider, model, prompt, {'max_tokens': max_tokens})
+
+    with telemetry.track(site, provider, model, prompt) as call:
+        text = cache.get(key, site) if cache else None
+        call.from_cache = text is not None
+        if not call.from_cache:
+            # 제공자별 RPM/TPM 예산을 지키며 호출, 429/과부하는 백오프 후 재시도
+            text = get_limiter(provider).call(
+                lambda: call.attempt(_call_provider, provider, model, prompt, max_tokens),
+                est_tokens=estimate_tokens(prompt) + (max_tokens or 1000))
+
+        return _finish(site, key, text, call, parse)
+
+
+async def acomplete(site, provider, model, prompt, max_tokens=None, parse=None):
+    """complete 의 비동기 버전 (AsyncAnthropic / Gemini generate_content_async 사용)"""
+    cache = get_shared_cache()
+    key = cache_key(provider, model, prompt, {'max_tokens': max_tokens})
+
+    with telemetry.track(site, provider, model, prompt) as call:
+        text = cache.get(key, site) if cache else None
+        call.from_cache = text is not None
+        if not call.from_cache:
+            text = await get_limiter(provider).call_async(
+                lambda: call.attempt_async(_acall_provider, provider, model, prompt, max_tokens),
+                est_tokens=estimate_tokens(prompt) + (max_tokens or 1000))
+
+        return _finish(site, key, text, call, parse)
+
+
+_hedge_executor = None
+
+
+def _executor():
+    global _hedge_executor
+    with _client_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='llm-hedge')
+        return _hedge_executor
+
+
+def _log_failover(site, provider, model, error, remaining):
+    if remaining:
+        telemetry.count('failover')
+        print(f"    🔁 [{site}] {provider}/{model} 실패 ({type(error).__name__}) - "
+              f"{remaining[0][0]}/{remaining[0][1]} 로 전환")
+
+
+def generate(site, prompt, max_tokens=None, parse=None, tier=FULL):
+    """
+    호출 지점의 모델 정책에 따라 LLM 호출
+
+    정책의 첫 모델을 호출하고 오류(속도 제한 재시도까지 실패, 연결 오류 등)가 나면 다음 제공자
+    모델로 넘어감. 응답 파싱 실패(LLMResponseParseError)는 모델을 바꾸지 않고 그대로 발생.
+    hedge_after 가 있으면 그 시간 안에 응답이 없을 때 다음 모델로 같은 요청을 동시에 보내고
+    먼저 성공한 응답을 사용 (늦은 쪽 응답도 캐시에는 저장됨)
+
+    Args:
+        site: 호출 지점 이름 (llm_policy 의 키, 캐시 TTL 구분에도 사용)
+        prompt: 프롬프트
+        max_tokens: 최대 출력 토큰
+        parse: 응답 텍스트 파싱 함수
+        tier: 'full' 또는 'light' (사전 분류로 저렴한 모델을 쓸 기사)
+
+    Returns:
+        parse 가 있으면 파싱 결과, 없으면 응답 텍스트
+    """
+    policy = get_policy()
+    remaining = policy.chain(site, tier)
+    primary = remaining[0]
+    hedge_after = policy.hedge_after(site)
+
+    if not hedge_after:
+        while True:
+            provider, model = remaining.pop(0)
+            try:
+                return complete(site, provider, model, prompt, max_tokens, parse)
+            except LLMResponseParseError:
+                raise
+            except Exception as e:
+                if not remaining:
+                    raise
+                _log_failover(site, provider, model, e, remaining)
+
+    pool = _executor()
+    running = {}
+    error = None
+    hedged = False
+
+    def launch():
+        provider, model = remaining.pop(0)
+        running[pool.submit(complete, site, provider, model, prompt, max_tokens, parse)] = \
+            (provider, model)
+
+    launch()
+    while running:
+        done, _ = wait(running, timeout=hedge_after if remaining else None,
+                       return_when=FIRST_COMPLETED)
+        if not done:
+            telemetry.count('hedge')
+            print(f"    ⏱️  [{site}] {hedge_after}초 동안 응답 없음 - "
+                  f"{remaining[0][0]}/{remaining[0][1]} 로 헤지 요청")
+            hedged = True
+            launch()
+            continue
+        for future in done:
+            provider, model = running.pop(future)
+            try:
+                result = future.result()
+            except LLMResponseParseError:
+                raise
+            except Exception as e:
+                error = e
+                if not running and remaining:
+                    _log_failover(site, provider, model, e, remaining)
+                    launch()
+                continue
+            if hedged and (provider, model) != primary:
+                telemetry.count('hedge_won')
+            return result
+    raise error
+
+
+async def agenerate(site, prompt, max_tokens=None, parse=None, tier=FULL):
+    """generate 의 비동기 버전 (헤지로 이긴 요청이 나오면 나머지 요청은 취소)"""
+    policy = get_policy()
+    remaining = policy.chain(site, tier)
+    primary = remaining[0]
+    hedge_after = policy.hedge_after(site)
+    running = {}
+    error = None
+    hedged = False
+
+    def launch():
+        provider, model = remaining.pop(0)
+        task = asyncio.ensure_future(
+            acomplete(site, provider, model, prompt, max_tokens, parse))
+        running[task] = (provider, model)
+
+    launch()
+    try:
+        while running:
+            timeout = hedge_after if (hedge_after and remaining) else None
+            done, _ = await asyncio.wait(running, timeout=timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                telemetry.count('hedge')
+                print(f"    ⏱️  [{site}] {hedge_after}초 동안 응답 없음 - "
+                      f"{remaining[0][0]}/{remaining[0][1]} 로 헤지 요청")
+                hedged = True
+                launch()
+                continue
+            for task in done:
+                provider, model = running.pop(task)
+                try:
+                    result = task.result()
+                except LLMResponseParseError:
+                    raise
+                except Exception as e:
+                    error = e
+                    if not running and remaining:
+                        _log_failover(site, provider, model, e, remaining)
+                        launch()
+                    continue
+                if hedged and (provider, model) != primary:
+                    telemetry.count('hedge_won')
+                return result
+        raise error
+    finally:
+        for task in running:
+            task.cancel()
+
+
+def site_available(site):
+    """호출 지점에 쓸 수 있는 제공자(API 키 또는 stub 주소)가 있는지"""
+    return get_policy().available(site)
+
+
+def site_status(site):
+    """
+    호출 지점의 정책 확인 결과 (실행 전 안내용)
+
+    정책에 있는 모델별로 사용 가능 여부를 표시하고, 쓸 수 있는 제공자가 없으면
+    설정해야 할 환경변수를 안내
+    """
+    models = get_policy().models(site)
+    lines = [f"LLM 정책 '{site}': " + ", ".join(
+        f"{provider}/{model} {'✅' if provider_available(provider) else '❌'}"
+        for provider, model in models)]
+    if not site_available(site):
+        keys = list(dict.fromkeys(api_key_env(p) for p, _ in models))
+        lines.append(f"쓸 수 있는 제공자가 없습니다. 다음 중 하나를 설정하세요: {', '.join(keys)}"
+                     " (또는 stub 서버 주소 LLM_BASE_URL)")
+        if keys:
+            lines.append(f"  예) set {keys[0]}=your-api-key")
+    return "\n".join(lines)
@@ -0,0 +1,113 @@
+"""
+호출 지점(단계)별 LLM 모델 정책 - 우선 모델과 장애 시 넘어갈 다른 제공자 모델 순서, 헤지 요청 기준
+
+llm_client.generate(site, prompt, tier=...) 가 이 정책을 따름
+LLM_POLICY_FILE (기본 llm_policy.json) 이 있으면 같은 구조로 호출 지점별 설정을 덮어씀:
+
+    {
+        "news_extract": {"full": [["anthropic", "claude-sonnet-4-20250514"],
+                                  ["gemini", "gemini-2.5-flash"]],
+                         "hedge_after": 20}
+    }
+
+hedge_after: 첫 모델이 이 시간(초) 안에 응답하지 않으면 다음 모델로 같은 요청을 동시에 보내고
+먼저 온 응답을 사용 (없으면 헤지 안 함, LLM_HEDGE_AFTER 환경변수로 전체 기본값 지정)
+
+제공자 주소는 LLM_BASE_URL (두 제공자 공통, 로컬 stub 서버용) 또는
+ANTHROPIC_BASE_URL / GEMINI_BASE_URL 로 바꿀 수 있음
+"""
+
+import os
+
+from storage_utils import load_json
+
+LLM_POLICY_FILE = 'llm_policy.json'
+
+FULL, LIGHT = 'full', 'light'
+
+GEMINI_FLASH = ('gemini', 'gemini-2.5-flash')
+GEMINI_FLASH_LITE = ('gemini', 'gemini-2.5-flash-lite')
+CLAUDE_SONNET_4 = ('anthropic', 'claude-sonnet-4-20250514')
+CLAUDE_SONNET_35 = ('anthropic', 'claude-3-5-sonnet-20241022')
+CLAUDE_HAIKU = ('anthropic', 'claude-3-5-haiku-20241022')
+
+# 호출 지점 -> 등급별 (제공자, 모델) 순서. 첫 항목이 기본, 나머지는 장애 시 순서대로 사용
+DEFAULT_POLICY = {
+    'local_extract': {FULL: [GEMINI_FLASH, CLAUDE_HAIKU],
+                      LIGHT: [GEMINI_FLASH_LITE, CLAUDE_HAIKU]},
+    'local_extract_batch': {FULL: [GEMINI_FLASH, CLAUDE_HAIKU],
+                            LIGHT: [GEMINI_FLASH_LITE, CLAUDE_HAIKU]},
+    'news_extract': {FULL: [CLAUDE_SONNET_4, GEMINI_FLASH],
+                     LIGHT: [CLAUDE_HAIKU, GEMINI_FLASH_LITE]},
+    'news_extract_batch': {FULL: [CLAUDE_SONNET_4, GEMINI_FLASH],
+                           LIGHT: [CLAUDE_HAIKU, GEMINI_FLASH_LITE]},
+    'echo_frames': {FULL: [CLAUDE_SONNET_35, GEMINI_FLASH]},
+    'event_simulation': {FULL: [GEMINI_FLASH, CLAUDE_HAIKU]},
+    'strategic_report': {FULL: [GEMINI_FLASH, CLAUDE_SONNET_4]},
+}
+
+_API_KEY_ENV = {'anthropic': 'ANTHROPIC_API_KEY', 'gemini': 'GEMINI_API_KEY'}
+
+
+def base_url(provider):
+    """제공자 API 주소 (설정이 없으면 None = 실제 API)"""
+    return (os.environ.get(f'{provider.upper()}_BASE_URL')
+            or os.environ.get('LLM_BASE_URL') or None)
+
+
+def api_key_env(provider):
+    """제공자 API 키 환경변수 이름"""
+    return _API_KEY_ENV[provider]
+
+
+def provider_available(provider):
+    """API 키가 있거나 대체 주소(stub 서버)가 설정된 제공자인지"""
+    return bool(os.environ.get(_API_KEY_ENV[provider]) or base_url(provider))
+
+
+class ModelPolicy:
+    """기본 정책 + 정책 파일"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('LLM_POLICY_FILE', LLM_POLICY_FILE)
+        self.sites = {site: dict(tiers) for site, tiers in DEFAULT_POLICY.items()}
+        for site, overrides in load_json(self.path, {}).items():
+            entry = self.sites.setdefault(site, {})
+            for key, value in overrides.items():
+                entry[key] = [tuple(m) for m in value] if isinstance(value, list) else value
+
+    def chain(self, site, tier=FULL):
+        """
+        시도할 (제공자, 모델) 순서 (키/주소가 없는 제공자는 뺌, 전부 없으면 원래 순서 그대로)
+        """
+        entry = self.sites.get(site)
+        if entry is None:
+            raise ValueError(f"모델 정책이 없는 호출 지점: {site}")
+        models = entry.get(tier) or entry[FULL]
+        available = [m for m in models if provider_available(m[0])]
+        return available or list(models)
+
+    def hedge_after(self, site):
+        value = self.sites.get(site, {}).get('hedge_after')
+        if value is None and os.environ.get('LLM_HEDGE_AFTER'):
+            value = float(os.environ['LLM_HEDGE_AFTER'])
+        return value or None
+
+    def models(self, site):
+        """이 호출 지점 정책에 나오는 (제공자, 모델) 전체 (등급 순서, 중복 제거)"""
+        entry = self.sites.get(site, {})
+        return list(dict.fromkeys(m for tier in (FULL, LIGHT) for m in entry.get(tier, [])))
+
+    def available(self, site):
+        """이 호출 지점에 쓸 수 있는 제공자가 하나라도 있는지"""
+        return any(provider_available(p) for p, _ in self.models(site))
+
+
+_policy = None
+
+
+def get_policy():
+    global _policy
+    if _policy is None:
+        _policy = ModelPolicy()
+    return _policy
@@ -0,0 +1,289 @@
+"""
+LLM 호출 계측 - 호출 1건마다 단계/호출 지점/모델, 입력·출력 토큰, 지연, 재시도, 파싱 실패, 추정 비용 기록
+
+llm_client 의 complete/acomplete 가 자동으로 사용하며 기록은 LLM_TELEMETRY_FILE
+(기본 llm_calls.jsonl) 에 한 줄씩 추가됨. LLM_TELEMETRY=0 이면 파일에 쓰지 않음 (실행 중 요약은 유지)
+
+단계(stage)는 PIPELINE_STAGE 환경변수 (main_orchestrator 가 단계마다 설정, 없으면 실행한 스크립트 이름),
+실행 ID 는 LLM_RUN_ID 환경변수 (없으면 프로세스마다 새로 생성)
+
+사용법:
+    python llm_telemetry.py                 # 가장 최근 실행의 단계별 요약
+    python llm_telemetry.py --run all       # 파일 전체
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from tokens import estimate_tokens
+
+LLM_TELEMETRY_FILE = 'llm_calls.jsonl'
+
+# 모델별 100만 토큰당 가격 (USD, 입력/출력) - 추정 비용 계산용
+MODEL_PRICES = {
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-2.5-flash-lite': (0.10, 0.40),
+    'gemini-2.5-pro': (1.25, 10.00),
+    'claude-sonnet-4-20250514': (3.00, 15.00),
+    'claude-3-5-sonnet-20241022': (3.00, 15.00),
+    'claude-3-5-haiku-20241022': (0.80, 4.00),
+}
+
+
+def current_stage():
+    stage = os.environ.get('PIPELINE_STAGE')
+    if stage:
+        return stage
+    script = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else ''
+    return os.path.splitext(script)[0] or 'interactive'
+
+
+def current_run_id():
+    run_id = os.environ.get('LLM_RUN_ID')
+    if not run_id:
+        # 하위 프로세스가 같은 실행 ID 를 물려받도록 환경변수에 남김
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        os.environ['LLM_RUN_ID'] = run_id
+    return run_id
+
+
+def estimate_cost(model, input_tokens, output_tokens):
+    price = MODEL_PRICES.get(model)
+    if price is None:
+        return None
+    return round((input_tokens * price[0] + output_tokens * price[1]) / 1_000_000, 6)
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+class CallRecord:
+    """
+    LLM 호출 1건의 계측 (with 블록으로 사용, 블록을 벗어날 때 기록)
+
+    캐시 적중이면 from_cache=True, 제공자 호출은 attempt()/attempt_async() 로 감싸 시도마다 시간을 잼
+    """
+
+    def __init__(self, telemetry, site, provider, model, prompt):
+        self.telemetry = telemetry
+        self.site = site
+        self.provider = provider
+        self.model = model
+        self.prompt = prompt
+        self.from_cache = False
+        self.attempts = 0
+        self.latency = 0.0
+        self.usage = None
+        self.output_text = None
+        self.parse_failed = False
+        self._started = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._started
+        self.telemetry.record(self, wall, exc)
+        return False
+
+    def _begin(self):
+        self.attempts += 1
+        return time.perf_counter()
+
+    def attempt(self, fn, *args):
+        """제공자 호출 1회 (fn 은 (응답 텍스트, 사용량) 반환), 속도 제한기의 재시도마다 다시 불림"""
+        started = self._begin()
+        try:
+            text, self.usage = fn(*args)
+            return text
+        finally:
+            self.latency = time.perf_counter() - started
+
+    async def attempt_async(self, fn, *args):
+        """attempt 의 비동기 버전 (fn 은 코루틴 함수)"""
+        started = self._begin()
+        try:
+            text, self.usage = await fn(*args)
+            return text
+        finally:
+            self.latency = time.perf_counter() - started
+
+
+class LLMTelemetry:
+    """호출 기록을 메모리와 JSONL 파일에 모음 (스레드 안전)"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('LLM_TELEMETRY_FILE', LLM_TELEMETRY_FILE)
+        self.enabled = os.environ.get('LLM_TELEMETRY', '1') != '0'
+        self.records = []
+        self.events = {}  # 'failover', 'hedge', 'hedge_won' 등 정책 동작 횟수
+        self._lock = threading.Lock()
+
+    def count(self, event):
+        with self._lock:
+            self.events[event] = self.events.get(event, 0) + 1
+
+    def track(self, site, provider, model, prompt):
+        return CallRecord(self, site, provider, model, prompt)
+
+    def record(self, call, wall, error=None):
+        if call.from_cache:
+            input_tokens = output_tokens = 0
+            estimated = False
+        elif call.usage:
+            input_tokens = call.usage['input_tokens'] or 0
+            output_tokens = call.usage['output_tokens'] or 0
+            estimated = False
+        else:
+            # 사용량을 돌려주지 않는 응답(오류 포함)은 글자 수로 추정
+            input_tokens = estimate_tokens(call.prompt) if call.attempts else 0
+            output_tokens = estimate_tokens(call.output_text or '')
+            estimated = True
+        entry = {
+            'ts': round(time.time(), 3),
+            'run_id': current_run_id(),
+            'stage': current_stage(),
+            'site': call.site,
+            'provider': call.provider,
+            'model': call.model,
+            'cache_hit': call.from_cache,
+            'attempts': call.attempts,
+            'retries': max(0, call.attempts - 1),
+            'latency': round(call.latency, 4),
+            'wall': round(wall, 4),
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'tokens_estimated': estimated,
+            'cost_usd': 0.0 if call.from_cache else estimate_cost(
+                call.model, input_tokens, output_tokens),
+            'parse_failed': call.parse_failed,
+            'error': None if error is None or call.parse_failed else
+                     f"{type(error).__name__}: {error}"[:300],
+        }
+        with self._lock:
+            self.records.append(entry)
+            if self.enabled:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def summarize(records):
+    """
+    단계/호출 지점별 요약 (지연 백분위는 캐시 적중을 제외한 실제 호출 기준)
+
+    Returns:
+        list: dict (stage, site, calls, cache_hits, errors, parse_failures, retries,
+              input_tokens, output_tokens, cost_usd, p50/p95/p99 초)
+    """
+    groups = {}
+    for r in records:
+        groups.setdefault((r['stage'], r['site']), []).append(r)
+    rows = []
+    for (stage, site), group in sorted(groups.items()):
+        latencies = [r['latency'] for r in group if not r['cache_hit'] and r['attempts']]
+        costs = [r['cost_usd'] for r in group if r['cost_usd'] is not None]
+        rows.append({
+            'stage': stage,
+            'site': site,
+            'models': sorted({r['model'] for r in group}),
+            'calls': len(group),
+            'cache_hits': sum(1 for r in group if r['cache_hit']),
+            'errors': sum(1 for r in group if r['error']),
+            'parse_failures': sum(1 for r in group if r['parse_failed']),
+            'retries': sum(r['retries'] for r in group),
+            'input_tokens': sum(r['input_tokens'] for r in group),
+            'output_tokens': sum(r['output_tokens'] for r in group),
+            'cost_usd': round(sum(costs), 4),
+            'p50': _percentile(latencies, 0.5),
+            'p95': _percentile(latencies, 0.95),
+            'p99': _percentile(latencies, 0.99),
+        })
+    return rows
+
+
+def format_summary(records):
+    lines = []
+    for row in summarize(records):
+        lines.append(
+            f"  [{row['stage']}] {row['site']} ({', '.join(row['models'])}): {row['calls']}회 "
+            f"(캐시 {row['cache_hits']}, 오류 {row['errors']}, 파싱 실패 {row['parse_failures']}, "
+            f"재시도 {row['retries']}), 토큰 입력 {row['input_tokens']:,} / 출력 {row['output_tokens']:,}, "
+            f"약 ${row['cost_usd']:.4f}, 지연 p50 {row['p50']:.2f}초 / p95 {row['p95']:.2f}초 / "
+            f"p99 {row['p99']:.2f}초")
+    return lines
+
+
+EVENT_NAMES = {'failover': '다른 모델로 전환', 'hedge': '헤지 요청', 'hedge_won': '헤지 요청이 먼저 응답'}
+
+telemetry = LLMTelemetry()
+
+
+def print_llm_summary():
+    """이 프로세스의 LLM 호출 요약 출력"""
+    with telemetry._lock:
+        records = list(telemetry.records)
+        events = dict(telemetry.events)
+    lines = format_summary(records)
+    if lines:
+        print("\n🤖 LLM 호출 통계")
+        for line in lines:
+            print(line)
+    if events:
+        print("  정책: " + ", ".join(f"{EVENT_NAMES.get(k, k)} {v}회" for k, v in sorted(events.items())))
+
+
+def load_records(path=LLM_TELEMETRY_FILE, run_id='latest'):
+    """
+    JSONL 기록 로드
+
+    Args:
+        run_id: 실행 ID, 'latest' (파일의 마지막 실행) 또는 'all'
+    """
+    records = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    records.append(json.loads(line))
+    except FileNotFoundError:
+        return []
+    if run_id == 'all' or not records:
+        return records
+    if run_id == 'latest':
+        run_id = records[-1]['run_id']
+    return [r for r in records if r['run_id'] == run_id]
+
+
+def print_run_summary(run_id='latest', path=None):
+    """JSONL 파일에서 한 실행(여러 하위 프로세스 포함)의 단계별 요약 출력"""
+    path = path or os.environ.get('LLM_TELEMETRY_FILE', LLM_TELEMETRY_FILE)
+    records = load_records(path, run_id)
+    if not records:
+        print(f"LLM 호출 기록 없음 ({path})")
+        return
+    print(f"\n🤖 LLM 호출 통계 (실행 {records[-1]['run_id'] if run_id != 'all' else '전체'}, "
+          f"{len(records)}회)")
+    for line in format_summary(records):
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 호출 기록 요약")
+    parser.add_argument('--file', default=None, help="기록 파일 (기본: LLM_TELEMETRY_FILE 또는 llm_calls.jsonl)")
+    parser.add_argument('--run', default='latest', help="실행 ID, latest 또는 all")
+    args = parser.parse_args()
+    print_run_summary(args.run, args.file)
+
+
+if __name__ == "__main__":
+    main()
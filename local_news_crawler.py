@@ -3,16 +3,34 @@
 네이버 차단 우회 - 지역 언론사 + 구글 알림 활용
 """
 
-import feedparser
-import requests
-from bs4 import BeautifulSoup
 import json
 import pandas as pd
 from datetime import datetime
 import time
-import google.generativeai as genai
 import os
-import re
+import argparse
+import asyncio
+import csv
+
+from polite_fetcher import PoliteFetcher
+import http_client
+from feed_cache import FeedCache
+from rss_registry import RssRegistry
+from article_store import ArticleStore, canonicalize_url
+from full_text import FullTextFetcher
+from near_dup import NearDuplicateIndex, article_text, cluster_articles, cluster_summary, fan_out
+from candidate_matcher import CandidateMatcher
+from prompt_compactor import PromptCompactor, print_compaction_summary
+from llm_telemetry import print_llm_summary
+from article_triage import ArticleTriage, SKIP, was_skipped
+from html_text import html_to_text
+from feed_stream import read_feed
+from relationship_batching import (
+    BATCH_PROMPT_OVERHEAD_TOKENS, article_tokens, build_batch_prompt,
+    pack_batches, parse_batch_response, parse_json_response,
+)
+import llm_client
+from rate_limiter import print_limiter_summaries
 
 # .env 로드 함수
 def load_env():
@@ -28,11 +46,6 @@ def load_env():
 
 load_env()
 
-# Gemini API 설정
-api_key = os.environ.get("GEMINI_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
-
 # ============================================================================
 # 1. 충북 지역 신문사 RSS 주소 목록
 # ============================================================================
@@ -130,6 +143,28 @@ GOOGLE_ALERTS_RSS = [
     # "https://www.google.com/alerts/feeds/12345678901234567890/2026충북도지사",
 ]
 
+# 파이프라인 모드에서 이번 실행의 관계를 기사 단위로 바로 기록하는 파일
+RELATIONSHIPS_STREAM_FILE = 'relationships_stream.csv'
+RELATIONSHIP_COLUMNS = [
+    'person1', 'person2', 'relation_type', 'strength', 'direction',
+    'evidence', 'sentiment', 'source_article', 'url', 'date', 'keyword',
+]
+
+# 근접 중복 묶음의 추출 결과를 구성원 기사로 복사할 때 바꿔 쓸 출처 컬럼 (관계 컬럼 -> 기사 필드)
+RELATIONSHIP_SOURCE_FIELDS = {'source_article': 'title', 'url': 'url',
+                              'date': 'date', 'keyword': 'source'}
+
+# RSS 자동 탐지 시 시도할 주소 패턴
+RSS_DISCOVERY_PATTERNS = [
+    "/rss/allArticle.xml",
+    "/rss/S1N1.xml",
+    "/news/rss.xml",
+    "/rss.xml",
+    "/feed",
+    "/rss",
+    "/rss/news.xml",
+]
+
 # ============================================================================
 # 2. RSS 피드 파서
 # ============================================================================
@@ -137,43 +172,60 @@ GOOGLE_ALERTS_RSS = [
 class LocalNewsCollector:
     """지역 신문사 RSS 수집기"""
     
-    def __init__(self):
+    def __init__(self, sources=None, alert_feeds=None, feed_cache=None, rss_registry=None,
+                 context_token_budget=None, triage=None):
+        """
+        Args:
+            sources: 언론사 설정 (기본: REGIONAL_NEWS_SOURCES, 벤치마크는 로컬 서버 주소로 교체)
+            alert_feeds: 구글 알림 RSS 주소 (기본: GOOGLE_ALERTS_RSS)
+            feed_cache: FeedCache (기본: feed_cache.json)
+            rss_registry: RssRegistry (기본: rss_registry.json)
+            context_token_budget: 기사 1건당 프롬프트에 넣을 본문 토큰 예산
+                (기본: prompt_compactor.DEFAULT_BUDGETS['article'])
+            triage: 사전 분류 모드 'off' / 'shadow' / 'on' (기본: ARTICLE_TRIAGE 환경변수 또는 off)
+        """
+        self.sources = REGIONAL_NEWS_SOURCES if sources is None else sources
+        self.alert_feeds = GOOGLE_ALERTS_RSS if alert_feeds is None else alert_feeds
         self.articles = []
         # 후보자 데이터 로드
         with open('candidates_data.json', 'r', encoding='utf-8') as f:
             data = json.load(f)
         self.candidates = [c['name'] for c in data['candidates']]
+        self.matcher = CandidateMatcher.from_file()  # 이름/영문명/별칭 한 번에 매칭
+        self.compactor = PromptCompactor(  # 후보자 언급 문장 중심으로 프롬프트 압축
+            self.matcher, {'article': context_token_budget} if context_token_budget else None)
+        self.triage = ArticleTriage(self.matcher, triage)  # 관계 없는 기사 건너뛰기/저렴한 모델
         self.working_rss_urls = []  # 작동하는 RSS 주소 저장
+        self.feed_cache = feed_cache or FeedCache()  # ETag/Last-Modified 조건부 요청 캐시
+        self.rss_registry = rss_registry or RssRegistry()  # 작동/죽은 RSS 주소 기억
     
     def test_rss_url(self, url):
         """RSS URL이 작동하는지 테스트"""
         try:
-            feed = feedparser.parse(url)
-            if feed.entries and len(feed.entries) > 0:
-                return True
-            return False
+            response = http_client.get(url)
+            if response.status_code != 200:
+                return False
+            # 첫 항목만 확인하면 되므로 스트리밍 파서로 1개까지만 읽음
+            return bool(read_feed(response.content, max_items=1).entries)
         except:
             return False
     
-    def find_working_rss(self, base_url, source_name):
-        """여러 RSS 패턴을 시도해서 작동하는 것 찾기"""
-        patterns = [
-            "/rss/allArticle.xml",
-            "/rss/S1N1.xml",
-            "/news/rss.xml",
-            "/rss.xml",
-            "/feed",
-            "/rss",
-            "/rss/news.xml",
-        ]
-        
+    def find_working_rss(self, base_url, source_name, exclude=()):
+        """여러 RSS 패턴을 시도해서 작동하는 것 찾기 (레지스트리의 죽은 주소는 건너뜀)"""
         working_urls = []
         
-        for pattern in patterns:
-            test_url = base_url.rstrip('/') + pattern
-            if self.test_rss_url(test_url):
+        test_urls = self.rss_registry.discovery_urls(
+            source_name, base_url, RSS_DISCOVERY_PATTERNS, exclude)
+        if test_urls:
+            print(f"  💡 자동 탐지 모드...")
+        for test_url in test_urls:
+            ok = self.test_rss_url(test_url)
+            self.rss_registry.record(test_url, source_name, ok)
+            if ok:
                 working_urls.append(test_url)
                 print(f"    ✅ 발견: {test_url}")
+        if test_urls:
+            self.rss_registry.mark_discovered(source_name)
         
         return working_urls
     
@@ -182,47 +234,64 @@ class LocalNewsCollector:
         try:
             print(f"  시도 중: {rss_url}")
             
-            # RSS 파싱
-            feed = feedparser.parse(rss_url)
-            
-            if not feed.entries:
-                print(f"    ⚠️  피드가 비어있음 또는 주소 오류")
-                return []
-            
-            # 작동하는 URL 저장
-            if rss_url not in self.working_rss_urls:
-                self.working_rss_urls.append(rss_url)
-            
-            articles_found = []
-            
-            for entry in feed.entries:
-                # 기본 정보 추출
-                title = entry.get('title', '')
-                link = entry.get('link', '')
-                summary = entry.get('summary', entry.get('description', ''))
-                published = entry.get('published', entry.get('updated', ''))
-                
-                # 후보자 이름이 포함된 기사만 수집
-                full_text = title + " " + summary
-                if any(name in full_text for name in self.candidates):
-                    articles_found.append({
-                        'title': title,
-                        'content': BeautifulSoup(summary, 'html.parser').get_text(),
-                        'url': link,
-                        'date': published,
-                        'source': source_name,
-                        'keyword': '후보자명'
-                    })
-            
-            print(f"    ✅ {len(articles_found)}개 관련 기사 발견 (전체 {len(feed.entries)}개)")
-            return articles_found
+            # 조건부 요청 (변경 없으면 304)
+            started = time.time()
+            response = http_client.get(
+                rss_url,
+                headers=self.feed_cache.conditional_headers(rss_url)
+            )
+            return self._parse_fetched({
+                'url': rss_url,
+                'status': response.status_code,
+                'content': response.content,
+                'headers': dict(response.headers),
+                'elapsed': time.time() - started,
+                'error': None,
+            }, source_name)
             
         except Exception as e:
+            self.rss_registry.record(rss_url, source_name, False)
             print(f"    ❌ 오류: {e}")
             return []
     
-    def collect_all(self):
-        """모든 소스에서 수집"""
+    def articles_from_entries(self, entries, rss_url, source_name, stopped_early=False):
+        """피드 항목(새 항목만일 수 있음)에서 후보자 관련 기사 추출"""
+        # 작동하는 URL 저장
+        if rss_url not in self.working_rss_urls:
+            self.working_rss_urls.append(rss_url)
+        
+        articles_found = []
+        
+        for entry in entries:
+            # 기본 정보 추출
+            title = entry.get('title', '')
+            link = entry.get('link', '')
+            summary = entry.get('summary', entry.get('description', ''))
+            published = entry.get('published', entry.get('updated', ''))
+            
+            # 후보자 이름이 포함된 기사만 수집
+            full_text = title + " " + summary
+            if self.matcher.mentions_any(full_text):
+                articles_found.append({
+                    'title': title,
+                    'content': html_to_text(summary),
+                    'url': link,
+                    'date': published,
+                    'source': source_name,
+                    'section': entry.get('category') or (entry.get('tags') or [{}])[0].get('term', ''),
+                    'keyword': '후보자명'
+                })
+        
+        scope = "새 항목" if stopped_early else "전체"
+        print(f"    ✅ [{source_name}] {len(articles_found)}개 관련 기사 발견 "
+              f"({scope} {len(entries)}개)")
+        return articles_found
+    
+    def collect_all(self, concurrent=False):
+        """모든 소스에서 수집 (concurrent=True 이면 비동기 동시 수집)"""
+        if concurrent:
+            return asyncio.run(self.collect_all_async())
+        
         print("\n" + "="*60)
         print("충북 지역 언론사 RSS 수집 시작")
         print("="*60 + "\n")
@@ -230,59 +299,318 @@ class LocalNewsCollector:
         all_articles = []
         
         # 1. 지역 신문사 RSS
-        for source_name, source_info in REGIONAL_NEWS_SOURCES.items():
+        for source_name, source_info in self.sources.items():
             print(f"\n【{source_name}】 ({source_info.get('type', '언론사')})")
             
-            # 먼저 제공된 RSS 주소 시도
-            found_articles = False
-            for rss_url in source_info['rss']:
+            # 레지스트리의 작동 주소 또는 제공된 RSS 주소 시도
+            tried_urls = self.rss_registry.candidate_urls(source_name, source_info['rss'])
+            for rss_url in tried_urls:
                 articles = self.collect_from_rss(rss_url, source_name)
-                if articles:
-                    all_articles.extend(articles)
-                    found_articles = True
+                all_articles.extend(articles)
                 time.sleep(0.5)
             
-            # RSS가 안 되면 자동 탐지 시도
-            if not found_articles:
-                print(f"  💡 자동 탐지 모드...")
-                working_urls = self.find_working_rss(
-                    source_info['search_url'], 
-                    source_name
-                )
-                
-                for url in working_urls:
-                    articles = self.collect_from_rss(url, source_name)
-                    all_articles.extend(articles)
-                    time.sleep(0.5)
+            # 작동 주소가 없거나 재탐지 주기가 되면 자동 탐지 시도
+            working_urls = self.find_working_rss(
+                source_info['search_url'], 
+                source_name,
+                exclude=tried_urls
+            )
+            
+            for url in working_urls:
+                articles = self.collect_from_rss(url, source_name)
+                all_articles.extend(articles)
+                time.sleep(0.5)
         
         # 2. 구글 알림 RSS (있는 경우)
-        if GOOGLE_ALERTS_RSS:
+        if self.alert_feeds:
             print(f"\n【구글 알림】")
-            for rss_url in GOOGLE_ALERTS_RSS:
+            for rss_url in self.alert_feeds:
                 if rss_url.startswith("http"):  # 주석이 아닌 실제 URL만
                     articles = self.collect_from_rss(rss_url, "구글알림")
                     all_articles.extend(articles)
                     time.sleep(0.5)
         
-        # 3. 작동하는 RSS 주소 출력
+        self.feed_cache.save()
+        self.rss_registry.save()
+        print(f"\n💾 {self.feed_cache.summary()}")
+        print(f"💾 {self.rss_registry.summary()}")
+        http_client.print_http_summary()
+        self.print_working_rss_urls()
+        
+        return all_articles
+    
+    def print_working_rss_urls(self):
+        """작동하는 RSS 주소 출력"""
         if self.working_rss_urls:
             print(f"\n" + "="*60)
             print("✅ 작동 확인된 RSS 주소")
             print("="*60)
             for url in self.working_rss_urls:
                 print(f"  {url}")
-            print("\n💡 다음번엔 이 주소들만 사용하면 더 빠릅니다!")
+            print(f"\n💡 레지스트리({self.rss_registry.path})에 저장되어 다음 실행부터 바로 사용됩니다!")
+    
+    def _parse_fetched(self, result, source_name):
+        """HTTP 응답을 파싱해 기사 리스트 반환 (304면 파싱 없이 캐시 사용)"""
+        url = result['url']
+        if result['error']:
+            self.rss_registry.record(url, source_name, False)
+            print(f"    ❌ [{source_name}] 오류: {url} ({result['error']})")
+            return []
+        if result['status'] == 304:
+            self.rss_registry.record(url, source_name, True)
+            articles = self.feed_cache.cached_articles(url)
+            if url not in self.working_rss_urls:
+                self.working_rss_urls.append(url)
+            print(f"    ♻️  [{source_name}] 변경 없음 - 캐시된 {len(articles)}개 기사 사용")
+            return articles
+        if result['status'] != 200:
+            self.rss_registry.record(url, source_name, False)
+            print(f"    ⚠️  [{source_name}] HTTP {result['status']}: {url}")
+            return []
+        try:
+            # 최신순 피드는 지난 실행의 최신 항목에 닿으면 파싱 중단, 그 밖의 피드는 본 항목을 거름
+            read = read_feed(result['content'], self.feed_cache.watermark(url))
+            self.rss_registry.record(url, source_name, read.valid)
+            if not read.valid:
+                print(f"    ⚠️  피드가 비어있음 또는 주소 오류 ({url})")
+                return []
+            articles = self.articles_from_entries(read.entries, url, source_name,
+                                                  read.stopped_early or read.skipped > 0)
+            return self.feed_cache.update(url, result['headers'], articles,
+                                          watermark=read.watermark,
+                                          stopped_early=read.stopped_early)
+        except Exception as e:
+            self.rss_registry.record(url, source_name, False)
+            print(f"    ❌ [{source_name}] 파싱 오류: {result['url']} ({e})")
+            return []
+    
+    async def iter_collect_async(self, fetcher=None):
+        """
+        모든 소스를 동시에 수집하며 피드 하나가 파싱될 때마다 기사 리스트를 내보냄
+        (도메인별 동시성 제한 + 요청 간격)
+        
+        1단계에서 레지스트리의 작동 주소(없으면 설정된 RSS 주소)를 모두 동시에 요청하고,
+        작동 주소가 없는 언론사만 2단계에서 죽은 주소를 제외한 탐지 패턴을 동시에 시도
+        """
+        print("\n" + "="*60)
+        print("충북 지역 언론사 RSS 동시 수집 시작")
+        print("="*60 + "\n")
+        
+        fetcher = fetcher or PoliteFetcher()
+        started = time.time()
+        
+        # 1. 지역 신문사 RSS (레지스트리 작동 주소 우선) + 구글 알림 RSS
+        url_sources = {}
+        for source_name, source_info in self.sources.items():
+            for rss_url in self.rss_registry.candidate_urls(source_name, source_info['rss']):
+                url_sources.setdefault(rss_url, source_name)
+        for rss_url in self.alert_feeds:
+            if rss_url.startswith("http"):  # 주석이 아닌 실제 URL만
+                url_sources.setdefault(rss_url, "구글알림")
+        
+        async for result in fetcher.iter_fetch(list(url_sources),
+                                               self.feed_cache.conditional_headers):
+            yield self._parse_fetched(result, url_sources[result['url']])
         
+        # 2. 작동 주소가 없거나 재탐지 주기가 된 언론사만 탐지 패턴을 동시에 시도
+        discovery_sources = {}
+        for source_name, source_info in self.sources.items():
+            for url in self.rss_registry.discovery_urls(
+                    source_name, source_info['search_url'],
+                    RSS_DISCOVERY_PATTERNS, url_sources):
+                discovery_sources.setdefault(url, source_name)
+        
+        if discovery_sources:
+            print(f"\n  💡 자동 탐지 모드... ({len(discovery_sources)}개 주소)")
+            async for result in fetcher.iter_fetch(list(discovery_sources),
+                                                   self.feed_cache.conditional_headers):
+                yield self._parse_fetched(result, discovery_sources[result['url']])
+            for source_name in set(discovery_sources.values()):
+                self.rss_registry.mark_discovered(source_name)
+        
+        print(f"\n⏱️  동시 수집 소요 시간: {time.time() - started:.1f}초")
+        self.feed_cache.save()
+        self.rss_registry.save()
+        print(f"💾 {self.feed_cache.summary()}")
+        print(f"💾 {self.rss_registry.summary()}")
+        http_client.print_http_summary()
+        self.print_working_rss_urls()
+    
+    async def collect_all_async(self, fetcher=None):
+        """모든 소스를 동시에 수집해 기사 리스트로 반환"""
+        all_articles = []
+        async for articles in self.iter_collect_async(fetcher):
+            all_articles.extend(articles)
         return all_articles
     
-    def extract_relationships_with_claude(self, article):
-        """Claude API로 관계 추출"""
-        mentioned_candidates = [c for c in self.candidates 
-                               if c in article['title'] + article['content']]
+    async def run_pipeline_async(self, store, workers=4, queue_size=100,
+                                 stream_path=RELATIONSHIPS_STREAM_FILE,
+                                 batch_token_budget=None, full_text=None):
+        """
+        수집과 관계 추출을 동시에 진행하는 파이프라인
+        
+        피드가 파싱될 때마다 새 기사를 크기 제한 큐에 넣고, 추출 워커들이 바로 꺼내
+        Gemini를 호출. 추출 결과는 저장소와 stream_path CSV에 기사 단위로 즉시 기록
+        batch_token_budget 이 주어지면 큐에 쌓인 기사를 예산만큼 묶어 한 번에 요청
+        이미 큐에 넣은 기사와 근접 중복인 기사는 큐에 넣지 않고, 대표 기사 추출이 끝나면
+        그 결과를 복사해 기록. full_text(FullTextFetcher) 가 주어지면 추출 전에 본문 문단으로 교체
+        
+        Returns:
+            list: 이번 실행에서 수집된 전체 기사 (통계용)
+        """
+        queue = asyncio.Queue(maxsize=queue_size)
+        collected = []
+        queued_keys = set()
+        near_dups = NearDuplicateIndex()
+        members = {}     # 대표 기사 키 -> 추출을 기다리는 근접 중복 기사
+        extracted = {}   # 대표 기사 키 -> (추출된 관계, 사전 분류로 건너뜀 여부)
+        failed_keys = set()  # 추출에 실패한 대표 기사 키 (늦게 온 근접 중복도 실패로 셈)
+        stats = {'queued': 0, 'done': 0, 'failed': 0, 'relationships': 0, 'fanned_out': 0}
+        
+        stream_file = open(stream_path, 'w', newline='', encoding='utf-8-sig')
+        writer = csv.DictWriter(stream_file, fieldnames=RELATIONSHIP_COLUMNS,
+                                extrasaction='ignore')
+        writer.writeheader()
+        
+        def record(article, relationships, skipped=False):
+            store.record_extraction(article, relationships, skipped=skipped)
+            writer.writerows(relationships)
+            stats['relationships'] += len(relationships)
+        
+        def record_members(key, relationships, skipped=False):
+            for member in members.pop(key, []):
+                record(member, fan_out(relationships, member, RELATIONSHIP_SOURCE_FIELDS),
+                       skipped)
+        
+        async def producer():
+            try:
+                async for articles in self.iter_collect_async():
+                    collected.extend(articles)
+                    for article in store.observe(articles):
+                        key = canonicalize_url(article['url']) or article['title']
+                        if key in queued_keys:
+                            continue
+                        queued_keys.add(key)
+                        representative = near_dups.add(key, article_text(article))
+                        if representative != key:
+                            stats['fanned_out'] += 1
+                            members.setdefault(representative, []).append(article)
+                            if representative in extracted:
+                                record_members(representative, *extracted[representative])
+                            elif representative in failed_keys:
+                                # 기록하지 않아 다음 실행에서 대표 기사와 함께 다시 시도
+                                members.pop(representative, None)
+                                stats['failed'] += 1
+                            continue
+                        stats['queued'] += 1
+                        await queue.put(article)
+            finally:
+                for _ in range(workers):
+                    await queue.put(None)
+        
+        async def next_batch():
+            """큐에서 기사 하나를 기다린 뒤, 묶음 모드면 이미 쌓인 기사를 예산만큼 더 꺼냄"""
+            article = await queue.get()
+            if article is None:
+                return [], True
+            batch = [article]
+            if not batch_token_budget:
+                return batch, False
+            used = BATCH_PROMPT_OVERHEAD_TOKENS + article_tokens(article)
+            while not queue.empty():
+                nxt = queue.get_nowait()
+                if nxt is None:
+                    return batch, True
+                batch.append(nxt)
+                used += article_tokens(nxt)
+                if used >= batch_token_budget:
+                    break
+            return batch, False
+        
+        async def worker():
+            while True:
+                batch, finished = await next_batch()
+                if batch:
+                    if full_text is not None:
+                        await full_text.enrich(batch)
+                    if batch_token_budget:
+                        results = await asyncio.to_thread(
+                            self.extract_relationships_batch, batch)
+                    else:
+                        results = [await asyncio.to_thread(
+                            self.extract_relationships_with_claude, batch[0])]
+                    
+                    for article, relationships in zip(batch, results):
+                        key = canonicalize_url(article['url']) or article['title']
+                        if relationships is None:
+                            # 묶음 구성원도 기록하지 않아 다음 실행에서 다시 시도
+                            stats['failed'] += 1 + len(members.pop(key, []))
+                            failed_keys.add(key)
+                            continue
+                        skipped = was_skipped(article)
+                        record(article, relationships, skipped)
+                        extracted[key] = (relationships, skipped)
+                        record_members(key, relationships, skipped)
+                        stats['done'] += 1
+                        if stats['done'] % 10 == 0:
+                            store.save()
+                            print(f"진행: 추출 {stats['done']}/{stats['queued']} "
+                                  f"(관계 {stats['relationships']}개)")
+                    stream_file.flush()
+                if finished:
+                    return
+        
+        print(f"\n🔀 파이프라인 모드: 추출 워커 {workers}개, 큐 크기 {queue_size}")
+        started = time.time()
+        try:
+            await asyncio.gather(producer(), *(worker() for _ in range(workers)))
+        finally:
+            stream_file.close()
+            store.save()
+        
+        print(f"\n⏱️  파이프라인 소요 시간: {time.time() - started:.1f}초 "
+              f"(새 기사 {stats['queued']}개, 추출 {stats['done']}개, "
+              f"근접 중복으로 복사 {stats['fanned_out']}개, "
+              f"실패 {stats['failed']}개, 관계 {stats['relationships']}개)")
+        print(f"💾 이번 실행의 관계 스트림: {stream_path}")
+        if stats['failed']:
+            print(f"⚠️  {stats['failed']}개 기사 추출 실패 (다음 실행에서 다시 시도)")
+        if full_text is not None:
+            print(f"📄 {full_text.summary()}")
+        print_limiter_summaries()
+        print_compaction_summary()
+        print_llm_summary()
+        if self.triage.enabled:
+            print(f"🔎 {self.triage.summary()}")
+        return collected
+    
+    def run_pipeline(self, store, workers=4, queue_size=100, batch_token_budget=None,
+                     full_text=None):
+        """run_pipeline_async 동기 실행 래퍼"""
+        return asyncio.run(self.run_pipeline_async(
+            store, workers, queue_size, batch_token_budget=batch_token_budget,
+            full_text=full_text))
+    
+    def extract_relationships_with_claude(self, article, route=None):
+        """
+        Claude API로 관계 추출
+        
+        Args:
+            article: 기사 딕셔너리
+            route: 사전 분류 경로 (묶음 추출에서 이미 판정한 경우, 없으면 여기서 판정)
+        """
+        mentioned_candidates = self.matcher.mentioned(
+            article['title'] + " " + article['content'])
         
         if len(mentioned_candidates) < 1:
             return []
         
+        if route is None:
+            route = self.triage.route(article)
+        if route == SKIP:
+            return []
+        
+        content = self.compactor.compact(article['content'], site='local_extract')
         prompt = f"""
 다음 뉴스 기사를 분석하여 충청북도 도지사 후보자들 간의 관계를 추출하세요.
 
@@ -290,7 +618,7 @@ class LocalNewsCollector:
 
 **기사 제목**: {article['title']}
 
-**기사 내용**: {article['content']}
+**기사 내용**: {content}
 
 **출력 형식 (JSON)**:
 {{
@@ -315,18 +643,10 @@ class LocalNewsCollector:
 """
         
         try:
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            response = model.generate_content(prompt)
-            
-            response_text = response.text
-            
-            # JSON 추출
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', 
-                                  response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(1)
-            
-            result = json.loads(response_text)
+            # 응답 캐시를 거쳐 호출, JSON 추출 실패 응답은 캐시하지 않음
+            # 모델은 llm_policy 의 local_extract 정책 (route='light' 면 저렴한 모델)
+            result = llm_client.generate('local_extract', prompt, parse=parse_json_response,
+                                         tier=route)
             
             # 메타데이터 추가
             for rel in result.get('relationships', []):
@@ -338,25 +658,133 @@ class LocalNewsCollector:
             return result.get('relationships', [])
             
         except Exception as e:
+            # 실패한 기사는 저장소에 추출 완료로 기록되지 않도록 None 반환
             print(f"    Gemini API 오류: {e}")
-            return []
+            return None
+    
+    def extract_relationships_batch(self, articles):
+        """
+        여러 기사를 한 번의 Gemini 요청으로 관계 추출 (사전 분류 경로별로 따로 묶음)
+        
+        Returns:
+            list: 기사 순서대로 관계 리스트 (API 오류로 실패한 기사는 None).
+                  응답에서 빠지거나 파싱되지 않은 기사는 개별 요청으로 다시 추출
+        """
+        results = [None] * len(articles)
+        groups = {}  # 경로 -> 기사 번호
+        for i, article in enumerate(articles):
+            if not self.matcher.mentions_any(article['title'] + " " + article['content']):
+                results[i] = []
+                continue
+            route = self.triage.route(article)
+            if route == SKIP:
+                results[i] = []
+            else:
+                groups.setdefault(route, []).append(i)
+        
+        for route, targets in groups.items():
+            self._extract_group(articles, targets, route, results)
+        return results
     
-    def process_articles(self, articles):
-        """기사 목록 처리 및 관계 추출"""
+    def _extract_group(self, articles, targets, route, results):
+        """같은 모델로 보낼 기사들을 한 번에 추출해 results 에 채움"""
+        if len(targets) <= 1:
+            for i in targets:
+                results[i] = self.extract_relationships_with_claude(articles[i], route)
+            return
+        
+        batch = [articles[i] for i in targets]
+        prompt = build_batch_prompt(
+            self.candidates,
+            [self.compactor.compact_article(a, site='local_extract_batch') for a in batch])
+        
+        try:
+            mapped = llm_client.generate(
+                'local_extract_batch', prompt, tier=route,
+                parse=lambda text: parse_batch_response(text, batch, keyword_field='source'))
+        except llm_client.LLMResponseParseError as e:
+            print(f"    {e} - 개별 요청으로 재시도")
+            mapped = [None] * len(batch)
+        except Exception as e:
+            print(f"    Gemini API 오류 (묶음 {len(batch)}건): {e}")
+            return
+        
+        for i, relationships in zip(targets, mapped):
+            if relationships is None:
+                relationships = self.extract_relationships_with_claude(articles[i], route)
+            results[i] = relationships
+    
+    def process_articles(self, articles, store=None, batch_token_budget=None,
+                         full_text=None):
+        """
+        기사 목록 처리 및 관계 추출
+        
+        Args:
+            articles: 기사 리스트
+            store: ArticleStore (주어지면 기사별 추출 결과를 바로 기록)
+            batch_token_budget: 주어지면 이 토큰 예산 안에서 기사를 묶어 한 번에 요청
+            full_text: FullTextFetcher (주어지면 묶음 대표 기사의 content 를 본문 관련 문단으로 교체)
+        """
         print(f"\n{'='*60}")
         print(f"Claude API로 관계 추출 시작 ({len(articles)}개 기사)")
         print("="*60 + "\n")
         
         all_relationships = []
+        failed = 0
         
-        for i, article in enumerate(articles, 1):
-            if i % 5 == 0:
-                print(f"진행: {i}/{len(articles)}")
-            
-            relationships = self.extract_relationships_with_claude(article)
-            all_relationships.extend(relationships)
+        # 여러 언론사에 실린 같은 통신사 기사는 묶음당 한 번만 추출하고 결과를 복사
+        clusters = cluster_articles(articles)
+        print(f"🧩 {cluster_summary(clusters)}")
+        members = {id(cluster[0]): cluster for cluster in clusters}
+        representatives = [cluster[0] for cluster in clusters]
+        if full_text is not None:
+            full_text.enrich_sync(representatives)
+            print(f"📄 {full_text.summary()}")
+        
+        if batch_token_budget:
+            batches = pack_batches(representatives, token_budget=batch_token_budget)
+            print(f"📦 묶음 모드: {len(representatives)}개 기사 → {len(batches)}개 요청")
+        else:
+            batches = [[article] for article in representatives]
+        
+        done = 0
+        for batch in batches:
+            if batch_token_budget:
+                results = self.extract_relationships_batch(batch)
+            else:
+                results = [self.extract_relationships_with_claude(batch[0])]
             
-            time.sleep(0.5)  # API 과부하 방지
+            for article, relationships in zip(batch, results):
+                done += 1
+                if done % 5 == 0:
+                    print(f"진행: {done}/{len(representatives)}")
+                
+                cluster = members[id(article)]
+                if relationships is None:
+                    failed += len(cluster)
+                    continue
+                skipped = was_skipped(article)
+                for member in cluster:
+                    if member is not article:
+                        member_relationships = fan_out(
+                            relationships, member, RELATIONSHIP_SOURCE_FIELDS)
+                    else:
+                        member_relationships = relationships
+                    all_relationships.extend(member_relationships)
+                    if store is not None:
+                        store.record_extraction(member, member_relationships, skipped=skipped)
+                if store is not None and done % 10 == 0:
+                    store.save()  # 중간에 중단돼도 완료분은 다시 호출하지 않음
+        
+        if store is not None:
+            store.save()
+        if failed:
+            print(f"⚠️  {failed}개 기사 추출 실패 (다음 실행에서 다시 시도)")
+        print_limiter_summaries()
+        print_compaction_summary()
+        print_llm_summary()
+        if self.triage.enabled:
+            print(f"🔎 {self.triage.summary()}")
         
         return pd.DataFrame(all_relationships)
 
@@ -365,25 +793,54 @@ class LocalNewsCollector:
 # 3. 실행
 # ============================================================================
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="충북 지역 신문사 RSS 기반 관계망 수집")
+    parser.add_argument('--concurrent', action='store_true',
+                        help="RSS 피드를 도메인별 제한 하에 동시에 수집")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="동시 수집과 관계 추출을 큐로 연결해 함께 진행")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="파이프라인 모드의 관계 추출 워커 수")
+    parser.add_argument('--batch-tokens', type=int, default=None,
+                        help="여러 기사를 이 토큰 예산 안에서 묶어 한 번에 추출 (예: 4000)")
+    parser.add_argument('--full-text', action='store_true',
+                        help="RSS 요약 대신 기사 본문을 받아 후보자 관련 문단으로 추출")
+    parser.add_argument('--context-tokens', type=int, default=None,
+                        help="기사 1건당 프롬프트에 넣을 본문 토큰 예산 (PROMPT_COMPACT=0 이면 압축 안 함)")
+    parser.add_argument('--triage', choices=['off', 'shadow', 'on'], default=None,
+                        help="LLM 전 사전 분류 (shadow: 판정만 기록, on: 관계 없어 보이는 기사 건너뜀, "
+                             "기본: ARTICLE_TRIAGE 환경변수 또는 off)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     print("\n" + "="*60)
     print("충북 도지사 후보 관계망 분석")
     print("지역 신문사 RSS 기반 데이터 수집")
     print(f"대상 언론사: {len(REGIONAL_NEWS_SOURCES)}개")
     print("="*60)
     
-    # API 키 확인
-    if not os.environ.get("GEMINI_API_KEY"):
-        print("\n⚠️  GEMINI_API_KEY 환경변수가 설정되지 않았습니다.")
-        print("명령 프롬프트에서:")
-        print("  set GEMINI_API_KEY=your-api-key")
+    # 정책의 제공자 키 확인 (LLM_BASE_URL 로 stub 서버를 지정했으면 키 없이 실행)
+    print(f"\n{llm_client.site_status('local_extract')}")
+    if not llm_client.site_available('local_extract'):
         return
     
     # 수집기 생성
-    collector = LocalNewsCollector()
+    collector = LocalNewsCollector(context_token_budget=args.context_tokens,
+                                   triage=args.triage)
+    
+    store = ArticleStore()
+    full_text = FullTextFetcher(collector.matcher) if args.full_text else None
     
-    # 1. RSS에서 기사 수집
-    articles = collector.collect_all()
+    # 1. RSS에서 기사 수집 (파이프라인 모드면 수집과 동시에 관계 추출)
+    if args.pipeline:
+        articles = collector.run_pipeline(store, workers=args.workers,
+                                          batch_token_budget=args.batch_tokens,
+                                          full_text=full_text)
+    else:
+        articles = collector.collect_all(concurrent=args.concurrent)
     
     if not articles:
         print("\n" + "="*60)
@@ -418,8 +875,22 @@ def main():
                                 key=lambda x: x[1], reverse=True):
         print(f"  {source}: {count}개")
     
-    # 2. Claude API로 관계 추출
-    df_relationships = collector.process_articles(articles)
+    # 2. 이전 실행에서 추출을 마친 기사는 제외하고 새 기사만 관계 추출
+    if not args.pipeline:
+        new_articles = store.observe(articles)
+        print(f"\n🆕 새 기사 {len(new_articles)}개 (이미 추출된 기사 "
+              f"{len(articles) - len(new_articles)}개 건너뜀)")
+        
+        if new_articles:
+            collector.process_articles(new_articles, store=store,
+                                       batch_token_budget=args.batch_tokens,
+                                       full_text=full_text)
+        else:
+            store.save()
+    print(f"💾 {store.summary()}")
+    
+    # 누적 관계 데이터는 저장소 전체에서 다시 구성
+    df_relationships = pd.DataFrame(store.all_relationships())
     
     if len(df_relationships) == 0:
         print("\n⚠️  추출된 관계가 없습니다.")
@@ -5,7 +5,9 @@ import time
 import sys
 import pandas as pd
 from datetime import datetime
-import google.generativeai as genai
+
+import llm_client
+import llm_telemetry
 
 # .env 로드 함수
 def load_env():
@@ -23,12 +25,8 @@ load_env()
 
 class StrategyCommandCenter:
     def __init__(self):
-        self.api_key = os.environ.get("GEMINI_API_KEY")
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel("gemini-2.5-flash")
-        else:
-            self.model = None
+        # 리포트 모델은 llm_policy 의 strategic_report 정책
+        self.report_enabled = llm_client.site_available('strategic_report')
 
         self.r_path = r"C:\Program Files\R\R-4.5.2\bin\Rscript.exe"
         self.repo_url = "https://github.com/2theDays/Election.git"
@@ -37,7 +35,7 @@ class StrategyCommandCenter:
         # 단계별 예상 소요 시간 (초)
         python_exe = sys.executable
         self.stages = [
-            {"id": "NEWS", "name": "실시간 뉴스 & 여론조사 크롤링", "cmd": f'"{python_exe}" local_news_crawler.py', "eta": 30},
+            {"id": "NEWS", "name": "실시간 뉴스 & 여론조사 크롤링", "cmd": f'"{python_exe}" local_news_crawler.py --pipeline', "eta": 30},
             {"id": "EVENT", "name": "가상 시나리오 에이전트 분석", "cmd": f'"{python_exe}" political_event_agent.py', "eta": 15},
             {"id": "NETWORK", "name": "다층 네트워크 지표 산출", "cmd": f'"{self.r_path}" network_analysis_premium.R', "eta": 12},
             {"id": "GIS", "name": "지역 지배력 및 공간 분석", "cmd": f'"{self.r_path}" regional_gis_analysis.R', "eta": 10},
@@ -78,8 +76,9 @@ class StrategyCommandCenter:
 
     def generate_strategic_report(self):
         """AI 전략 리포트 생성 로직 (Gemini)"""
-        if not self.model:
-            return "⚠️ GEMINI_API_KEY가 누락되어 전략 리포트가 생성되지 않았습니다."
+        if not self.report_enabled:
+            return ("⚠️ 전략 리포트가 생성되지 않았습니다.\n"
+                    + llm_client.site_status('strategic_report'))
         
         try:
             # 주요 분석 파일 로드
@@ -95,8 +94,7 @@ class StrategyCommandCenter:
             
             prompt = f"당신은 선거 전략 수석 컨설턴트입니다. 다음 데이터를 바탕으로 승리 전략을 요약하세요.\n\n[네트워크]\n{network}\n\n[리스크]\n{stress}"
             
-            response = self.model.generate_content(prompt)
-            return response.text
+            return llm_client.generate('strategic_report', prompt)
         except Exception as e:
             return f"오류: {e}"
 
@@ -104,6 +102,8 @@ class StrategyCommandCenter:
         self.print_header()
         total_steps = len(self.stages)
         start_time = time.time()
+        # 하위 프로세스의 LLM 호출도 같은 실행 ID 와 단계 이름으로 llm_calls.jsonl 에 기록됨
+        run_id = llm_telemetry.current_run_id()
 
         for i, stage in enumerate(self.stages):
             progress = (i / total_steps) * 100
@@ -114,6 +114,7 @@ class StrategyCommandCenter:
             
             s_time = time.time()
             success = False
+            os.environ['PIPELINE_STAGE'] = stage['id']
             
             if stage['cmd'] == "INTERNAL_GEN_REPORT":
                 report = self.generate_strategic_report()
@@ -131,6 +132,9 @@ class StrategyCommandCenter:
             else:
                 print(f"   ❌ 단계 오류 발생 (건너뜀)")
 
+        os.environ.pop('PIPELINE_STAGE', None)
+        llm_telemetry.print_run_summary(run_id)
+
         total_elapsed = time.time() - start_time
         print("\n" + "="*60)
         print("   🏁 모든 분석 및 클라우드 배포가 완료되었습니다!")
@@ -0,0 +1,147 @@
+"""
+근접 중복 기사 묶음 - SimHash + LSH 밴드
+여러 키워드 검색에 같은 기사가 걸리거나, 지역 언론사들이 거의 같은 통신사 기사를 싣는 경우
+묶음당 한 번만 관계 추출하고 결과를 묶음 안의 모든 기사로 복사
+"""
+
+import hashlib
+import re
+
+from article_store import canonicalize_url
+
+SIMHASH_BITS = 64
+
+# 공백/문장부호를 지운 뒤 글자 단위 n-gram (한국어는 띄어쓰기가 매체마다 달라 글자 단위가 안정적)
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def _normalize(text):
+    return _NON_WORD_RE.sub('', text or '').lower()
+
+
+def _feature_hash(feature):
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text, shingle=3):
+    """글자 shingle 빈도 가중 64비트 SimHash"""
+    text = _normalize(text)
+    if len(text) < shingle:
+        return _feature_hash(text)
+    counts = {}
+    for i in range(len(text) - shingle + 1):
+        feature = text[i:i + shingle]
+        counts[feature] = counts.get(feature, 0) + 1
+
+    vector = [0] * SIMHASH_BITS
+    for feature, weight in counts.items():
+        h = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += weight if h >> bit & 1 else -weight
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if vector[bit] > 0)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class NearDuplicateIndex:
+    """
+    증분 근접 중복 색인
+
+    64비트를 (max_distance + 1)개 밴드로 나누면, 해밍 거리가 max_distance 이하인 두 해시는
+    적어도 한 밴드가 정확히 같으므로 (비둘기집 원리) 밴드 버킷 안의 후보만 비교하면 됨
+    """
+
+    def __init__(self, max_distance=6, min_chars=40):
+        """
+        Args:
+            max_distance: 같은 기사로 볼 최대 해밍 거리 (64비트 기준)
+            min_chars: 정규화 후 이보다 짧은 글은 URL 이 같을 때만 묶음 (제목만 있는 항목 오탐 방지)
+        """
+        self.max_distance = max_distance
+        self.min_chars = min_chars
+        self.bands = max_distance + 1
+        self.band_bits = -(-SIMHASH_BITS // self.bands)
+        self._buckets = {}
+        self._hashes = {}
+        self._by_url = {}
+
+    def _band_keys(self, value):
+        mask = (1 << self.band_bits) - 1
+        return [(i, value >> (i * self.band_bits) & mask) for i in range(self.bands)]
+
+    def add(self, key, text, url=None):
+        """
+        기사를 색인에 추가하고 묶음 대표 키 반환 (새 묶음이면 key 자신)
+
+        Args:
+            key: 기사 식별 키
+            text: 비교할 본문 (제목 + 내용)
+            url: 주어지면 정규화 URL 이 같은 기사는 본문과 무관하게 같은 묶음
+        """
+        url_key = canonicalize_url(url) if url else ''
+        if url_key and url_key in self._by_url:
+            return self._by_url[url_key]
+
+        representative = key
+        if len(_normalize(text)) >= self.min_chars:
+            value = simhash(text)
+            band_keys = self._band_keys(value)
+            match = None
+            for band_key in band_keys:
+                for other in self._buckets.get(band_key, ()):
+                    if hamming(value, self._hashes[other]) <= self.max_distance:
+                        match = other
+                        break
+                if match is not None:
+                    break
+            if match is not None:
+                representative = match
+            else:
+                self._hashes[key] = value
+                for band_key in band_keys:
+                    self._buckets.setdefault(band_key, []).append(key)
+
+        if url_key:
+            self._by_url[url_key] = representative
+        return representative
+
+
+def article_text(article):
+    return article.get('title', '') + " " + article.get('content', '')
+
+
+def cluster_articles(articles, max_distance=6):
+    """
+    기사 목록을 근접 중복 묶음으로 나눔 (입력 순서 유지, 각 묶음의 첫 기사가 대표)
+
+    Returns:
+        list: 기사 리스트의 리스트
+    """
+    index = NearDuplicateIndex(max_distance=max_distance)
+    clusters = {}
+    for i, article in enumerate(articles):
+        representative = index.add(i, article_text(article), article.get('url'))
+        clusters.setdefault(representative, []).append(article)
+    return list(clusters.values())
+
+
+def fan_out(relationships, member, fields):
+    """
+    대표 기사에서 추출한 관계를 구성원 기사의 출처 정보로 복사
+
+    Args:
+        relationships: 대표 기사의 관계 리스트
+        member: 구성원 기사
+        fields: 관계 컬럼 -> 기사 필드 (예: {'url': 'url', 'keyword': 'source'})
+    """
+    overrides = {column: member.get(field, '') for column, field in fields.items()}
+    return [{**rel, **overrides} for rel in relationships]
+
+
+def cluster_summary(clusters):
+    total = sum(len(c) for c in clusters)
+    return (f"근접 중복 묶음: 기사 {total}개 → {len(clusters)}개 묶음 "
+            f"(추출 요청 {total - len(clusters)}건 절약)")
@@ -3,32 +3,111 @@
 Phase 1: 데이터 수집 자동화 시스템
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import pandas as pd
 from datetime import datetime, timedelta
 import time
-import re
-from anthropic import Anthropic
 import os
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Claude API 설정
-client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+from candidate_matcher import CandidateMatcher
+from relationship_batching import (
+    build_batch_prompt, pack_batches, parse_batch_response, parse_json_response,
+)
+import llm_client
+import http_client
+from rate_limiter import get_limiter, print_limiter_summaries
+from article_store import canonicalize_url
+from near_dup import cluster_articles, cluster_summary, fan_out
+from full_text import FullTextFetcher
+from prompt_compactor import PromptCompactor, print_compaction_summary
+from llm_telemetry import print_llm_summary
+from article_triage import ArticleTriage, SKIP
 
 # 후보자 데이터 로드
 with open('candidates_data.json', 'r', encoding='utf-8') as f:
     candidates_data = json.load(f)
 
 CANDIDATES = [c['name'] for c in candidates_data['candidates']]
+CANDIDATE_MATCHER = CandidateMatcher.from_file()
+
+# 네이버 뉴스 검색 URL
+NAVER_SEARCH_URL = "https://search.naver.com/search.naver"
+
+# 근접 중복 묶음의 추출 결과를 구성원 기사로 복사할 때 바꿔 쓸 출처 컬럼 (관계 컬럼 -> 기사 필드)
+RELATIONSHIP_SOURCE_FIELDS = {'source_article': 'title', 'url': 'url',
+                              'date': 'date', 'keyword': 'keyword'}
 
 class NewsRelationshipExtractor:
     """뉴스 기사에서 후보자 간 관계를 자동 추출하는 클래스"""
     
-    def __init__(self):
+    def __init__(self, search_url=None, context_token_budget=None, triage=None):
+        """
+        Args:
+            search_url: 네이버 검색 주소 (기본: NAVER_SEARCH_URL 환경변수 또는 실제 네이버,
+                벤치마크는 로컬 서버 주소 사용)
+            context_token_budget: 기사 1건당 프롬프트에 넣을 본문 토큰 예산
+                (기본: prompt_compactor.DEFAULT_BUDGETS['article'])
+            triage: 사전 분류 모드 'off' / 'shadow' / 'on' (기본: ARTICLE_TRIAGE 환경변수 또는 off)
+        """
+        self.search_url = search_url or os.environ.get('NAVER_SEARCH_URL', NAVER_SEARCH_URL)
         self.candidates = CANDIDATES
+        self.matcher = CANDIDATE_MATCHER
+        self.compactor = PromptCompactor(
+            self.matcher, {'article': context_token_budget} if context_token_budget else None)
+        self.triage = ArticleTriage(self.matcher, triage)
+        self._full_text = None
         self.relationships = []
         
+    @staticmethod
+    def _naver_params(keyword, start_date, end_date, page):
+        return {
+            'where': 'news',
+            'query': keyword,
+            'start': (page - 1) * 10 + 1,
+            'sort': 0,
+            'pd': 3,
+            'ds': start_date.strftime('%Y.%m.%d'),
+            'de': end_date.strftime('%Y.%m.%d')
+        }
+    
+    @staticmethod
+    def parse_naver_results(html, keyword):
+        """네이버 뉴스 검색 결과 페이지에서 기사 목록 추출"""
+        articles = []
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # 뉴스 항목 파싱
+        news_items = soup.select('.news_area')
+        
+        for item in news_items:
+            title_elem = item.select_one('.news_tit')
+            if not title_elem:
+                continue
+                
+            title = title_elem.get_text(strip=True)
+            url = title_elem['href']
+            
+            # 요약문 추출
+            content_elem = item.select_one('.news_dsc')
+            content = content_elem.get_text(strip=True) if content_elem else ""
+            
+            # 날짜 추출
+            date_elem = item.select_one('.info_group .info')
+            date_str = date_elem.get_text(strip=True) if date_elem else ""
+            
+            articles.append({
+                'title': title,
+                'content': content,
+                'url': url,
+                'date': date_str,
+                'keyword': keyword
+            })
+        return articles
+    
     def crawl_naver_news(self, keyword, days=30, max_articles=50):
         """
         네이버 뉴스 검색 결과 크롤링
@@ -47,51 +126,12 @@ class NewsRelationshipExtractor:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        # 네이버 뉴스 검색 URL
-        base_url = "https://search.naver.com/search.naver"
-        
         for page in range(1, min(max_articles//10, 10) + 1):
-            params = {
-                'where': 'news',
-                'query': keyword,
-                'start': (page - 1) * 10 + 1,
-                'sort': 0,
-                'pd': 3,
-                'ds': start_date.strftime('%Y.%m.%d'),
-                'de': end_date.strftime('%Y.%m.%d')
-            }
+            params = self._naver_params(keyword, start_date, end_date, page)
             
             try:
-                response = requests.get(base_url, params=params, 
-                                      headers={'User-Agent': 'Mozilla/5.0'})
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 뉴스 항목 파싱
-                news_items = soup.select('.news_area')
-                
-                for item in news_items:
-                    title_elem = item.select_one('.news_tit')
-                    if not title_elem:
-                        continue
-                        
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem['href']
-                    
-                    # 요약문 추출
-                    content_elem = item.select_one('.news_dsc')
-                    content = content_elem.get_text(strip=True) if content_elem else ""
-                    
-                    # 날짜 추출
-                    date_elem = item.select_one('.info_group .info')
-                    date_str = date_elem.get_text(strip=True) if date_elem else ""
-                    
-                    articles.append({
-                        'title': title,
-                        'content': content,
-                        'url': url,
-                        'date': date_str,
-                        'keyword': keyword
-                    })
+                response = http_client.get(self.search_url, params=params)
+                articles.extend(self.parse_naver_results(response.text, keyword))
                 
                 time.sleep(1)
                 
@@ -101,30 +141,92 @@ class NewsRelationshipExtractor:
                 
         return articles[:max_articles]
     
-    def extract_relationships_with_claude(self, article):
+    def crawl_naver_news_sharded(self, keyword, days=30, window_days=1,
+                                 max_pages=10, max_workers=6, max_articles=None):
         """
-        Claude API를 사용해 기사에서 후보자 간 관계 추출
+        기간을 일/주 단위 구간으로 나눠 구간과 페이지를 동시에 크롤링
+        
+        구간마다 1페이지를 먼저 모두 요청하고, 결과가 가득 찬(10건) 구간만 다음 페이지를
+        이어서 요청. 요청 속도는 공용 'naver' 속도 제한기(NAVER_RPM)로 제한하고,
+        결과는 정규화 URL 기준으로 중복 제거 (최근 구간 → 페이지 순서)
         
         Args:
-            article: 뉴스 기사 딕셔너리
-            
+            keyword: 검색 키워드
+            days: 최근 며칠 간의 뉴스
+            window_days: 구간 크기 (1=일 단위, 7=주 단위)
+            max_pages: 구간별 최대 페이지 수
+            max_workers: 동시 요청 스레드 수
+            max_articles: 최대 수집 기사 수 (None 이면 제한 없음)
+        
         Returns:
-            list: 관계 데이터 리스트
+            list: 뉴스 기사 리스트
         """
-        # 후보자 이름이 포함된 기사만 처리
-        mentioned_candidates = [c for c in self.candidates if c in article['title'] + article['content']]
+        # 순차 크롤링과 같은 범위 (ds = 오늘 - days ~ de = 오늘, 양 끝 날짜 포함)
+        end_date = datetime.now()
+        first_day = (end_date - timedelta(days=days)).date()
+        windows = []
+        window_end = end_date.date()
+        while window_end >= first_day:
+            window_start = max(window_end - timedelta(days=window_days - 1), first_day)
+            windows.append((window_start, window_end))
+            window_end = window_start - timedelta(days=1)
         
-        if len(mentioned_candidates) < 1:
-            return []
+        limiter = get_limiter('naver')
         
-        prompt = f"""
+        def fetch(window_idx, page):
+            start, end = windows[window_idx]
+            params = self._naver_params(keyword, start, end, page)
+            try:
+                # 429 는 예외로 바꿔 제한기가 속도를 낮추고 재시도하도록 함 (http_client 는 429 재시도 안 함)
+                response = limiter.call(
+                    lambda: http_client.get(
+                        self.search_url, params=params,
+                        retry_statuses=http_client.LIMITED_RETRY_STATUSES).raise_for_status(),
+                    est_tokens=0)
+                return self.parse_naver_results(response.text, keyword)
+            except Exception as e:
+                print(f"크롤링 오류 (keyword: {keyword}, "
+                      f"{start:%m.%d}~{end:%m.%d}, page: {page}): {e}")
+                return []
+        
+        results = {}
+        pending = [(i, 1) for i in range(len(windows))]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending:
+                futures = {executor.submit(fetch, i, page): (i, page) for i, page in pending}
+                pending = []
+                for future in as_completed(futures):
+                    window_idx, page = futures[future]
+                    page_articles = future.result()
+                    results[(window_idx, page)] = page_articles
+                    if len(page_articles) >= 10 and page < max_pages:
+                        pending.append((window_idx, page + 1))
+        
+        articles = []
+        seen = set()
+        for key in sorted(results):
+            for article in results[key]:
+                url_key = canonicalize_url(article['url'])
+                if url_key in seen:
+                    continue
+                seen.add(url_key)
+                articles.append(article)
+        
+        print(f"  → [{keyword}] {len(windows)}개 구간, {len(results)}개 페이지에서 "
+              f"{len(articles)}개 기사 (중복 제거 후)")
+        return articles[:max_articles] if max_articles else articles
+    
+    def build_relationship_prompt(self, article):
+        """기사 1건용 관계 추출 프롬프트 (본문은 후보자 언급 문장 중심으로 압축)"""
+        content = self.compactor.compact(article['content'], site='news_extract')
+        return f"""
 다음 뉴스 기사를 분석하여 충청북도 도지사 후보자들 간의 관계를 추출하세요.
 
 **후보자 명단**: {', '.join(self.candidates)}
 
 **기사 제목**: {article['title']}
 
-**기사 내용**: {article['content']}
+**기사 내용**: {content}
 
 **출력 형식 (JSON)**:
 {{
@@ -148,72 +250,230 @@ class NewsRelationshipExtractor:
 4. 관계가 없으면 빈 리스트 반환
 5. strength는 관계의 명확성과 중요도 (0=희미함, 1=매우명확)
 """
+    
+    @staticmethod
+    def _attach_metadata(result, article):
+        for rel in result.get('relationships', []):
+            rel['source_article'] = article['title']
+            rel['url'] = article['url']
+            rel['date'] = article['date']
+            rel['keyword'] = article['keyword']
         
-        try:
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-            
-            response_text = message.content[0].text
-            
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', 
-                                  response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(1)
-            
-            result = json.loads(response_text)
+        return result.get('relationships', [])
+    
+    def extract_relationships_with_claude(self, article, route=None):
+        """
+        Claude API를 사용해 기사에서 후보자 간 관계 추출
+        
+        Args:
+            article: 뉴스 기사 딕셔너리
+            route: 사전 분류 경로 (묶음 추출에서 이미 판정한 경우, 없으면 여기서 판정)
             
-            for rel in result.get('relationships', []):
-                rel['source_article'] = article['title']
-                rel['url'] = article['url']
-                rel['date'] = article['date']
-                rel['keyword'] = article['keyword']
+        Returns:
+            list: 관계 데이터 리스트
+        """
+        # 후보자 이름이 포함된 기사만 처리
+        if not self.matcher.mentions_any(article['title'] + " " + article['content']):
+            return []
+        
+        if route is None:
+            route = self.triage.route(article)
+        if route == SKIP:
+            return []
+        
+        prompt = self.build_relationship_prompt(article)
+        
+        try:
+            result = llm_client.generate('news_extract', prompt, tier=route,
+                                         max_tokens=2000, parse=parse_json_response)
+            return self._attach_metadata(result, article)
             
-            return result.get('relationships', [])
+        except Exception as e:
+            print(f"Claude API 오류: {e}")
+            return []
+    
+    async def extract_relationships_async(self, article):
+        """extract_relationships_with_claude 의 비동기 버전 (AsyncAnthropic)"""
+        if not self.matcher.mentions_any(article['title'] + " " + article['content']):
+            return []
+        
+        route = self.triage.route(article)
+        if route == SKIP:
+            return []
+        
+        prompt = self.build_relationship_prompt(article)
+        
+        try:
+            result = await llm_client.agenerate('news_extract', prompt, tier=route,
+                                                max_tokens=2000, parse=parse_json_response)
+            return self._attach_metadata(result, article)
             
         except Exception as e:
             print(f"Claude API 오류: {e}")
             return []
     
-    def collect_all_relationships(self, search_keywords=None, days=30):
+    def extract_relationships_batch(self, articles):
+        """
+        여러 기사를 한 번의 Claude 요청으로 관계 추출 (사전 분류 경로별로 따로 묶음)
+        
+        Args:
+            articles: 뉴스 기사 딕셔너리 리스트
+            
+        Returns:
+            list: 기사 순서대로 관계 리스트 (응답에서 빠진 기사는 개별 요청으로 재추출)
+        """
+        results = [[] for _ in articles]
+        groups = {}  # 경로 -> 기사 번호
+        for i, article in enumerate(articles):
+            if not self.matcher.mentions_any(article['title'] + " " + article['content']):
+                continue
+            route = self.triage.route(article)
+            if route != SKIP:
+                groups.setdefault(route, []).append(i)
+        
+        for route, targets in groups.items():
+            self._extract_group(articles, targets, route, results)
+        return results
+    
+    def _extract_group(self, articles, targets, route, results):
+        """같은 모델로 보낼 기사들을 한 번에 추출해 results 에 채움"""
+        if len(targets) <= 1:
+            for i in targets:
+                results[i] = self.extract_relationships_with_claude(articles[i], route)
+            return
+        
+        batch = [articles[i] for i in targets]
+        prompt = build_batch_prompt(
+            self.candidates,
+            [self.compactor.compact_article(a, site='news_extract_batch') for a in batch])
+        
+        try:
+            mapped = llm_client.generate(
+                'news_extract_batch', prompt, tier=route,
+                max_tokens=4000, parse=lambda text: parse_batch_response(text, batch))
+        except llm_client.LLMResponseParseError as e:
+            print(f"{e} - 개별 요청으로 재시도")
+            mapped = [None] * len(batch)
+        except Exception as e:
+            print(f"Claude API 오류 (묶음 {len(batch)}건): {e}")
+            return
+        
+        for i, relationships in zip(targets, mapped):
+            if relationships is None:
+                relationships = self.extract_relationships_with_claude(articles[i], route)
+            results[i] = relationships
+    
+    def default_search_keywords(self):
+        """후보자별 + 선거 일반 검색 키워드"""
+        search_keywords = [f"{name} 충북도지사" for name in self.candidates]
+        search_keywords.extend([
+            "충북도지사 선거",
+            "충북도지사 후보",
+            "2026 충북지사"
+        ])
+        return search_keywords
+    
+    def full_text_fetcher(self):
+        """기사 본문 수집기 (처음 사용할 때 생성)"""
+        if self._full_text is None:
+            self._full_text = FullTextFetcher(self.matcher)
+        return self._full_text
+    
+    def enrich_full_text(self, articles):
+        """기사 content 를 본문의 후보자 관련 문단으로 교체 (본문 캐시에 없는 기사만 동시에 받음)"""
+        fetcher = self.full_text_fetcher()
+        fetcher.enrich_sync(articles)
+        print(f"  → {fetcher.summary()}")
+        return articles
+    
+    def crawl_keyword(self, keyword, days=30, shard_days=None):
+        """shard_days 가 주어지면 구간 분할 동시 크롤링, 아니면 기존 순차 크롤링"""
+        if shard_days:
+            return self.crawl_naver_news_sharded(keyword, days=days, window_days=shard_days)
+        return self.crawl_naver_news(keyword, days=days, max_articles=30)
+    
+    def collect_all_relationships(self, search_keywords=None, days=30,
+                                  batch_token_budget=None, concurrency=None,
+                                  shard_days=None, full_text=False):
         """
         모든 후보자 관련 뉴스를 수집하고 관계 추출
         
         Args:
             search_keywords: 검색 키워드 리스트
             days: 최근 며칠
+            batch_token_budget: 주어지면 이 토큰 예산 안에서 기사를 묶어 한 번에 요청
+            concurrency: 주어지면 비동기 모드로 이 개수만큼 Claude 요청(묶음 모드면 묶음 요청)을
+                동시에 진행
+            shard_days: 주어지면 기간을 이 일수 단위로 나눠 구간/페이지를 동시에 크롤링
+            full_text: True 면 검색 발췌 대신 기사 본문의 후보자 관련 문단으로 추출
             
         Returns:
             DataFrame: 관계 데이터프레임
         """
-        if search_keywords is None:
-            search_keywords = [f"{name} 충북도지사" for name in self.candidates]
-            search_keywords.extend([
-                "충북도지사 선거",
-                "충북도지사 후보",
-                "2026 충북지사"
-            ])
+        if concurrency:
+            return asyncio.run(self.collect_all_relationships_async(
+                search_keywords, days, concurrency=concurrency, shard_days=shard_days,
+                full_text=full_text, batch_token_budget=batch_token_budget))
         
-        all_relationships = []
+        if search_keywords is None:
+            search_keywords = self.default_search_keywords()
         
+        all_articles = []
         for keyword in search_keywords:
             print(f"\n검색 중: {keyword}")
-            articles = self.crawl_naver_news(keyword, days=days, max_articles=30)
+            articles = self.crawl_keyword(keyword, days=days, shard_days=shard_days)
             print(f"  → {len(articles)}개 기사 수집")
-            
-            for i, article in enumerate(articles, 1):
+            all_articles.extend(articles)
+        
+        # 여러 키워드/언론사에 실린 같은 기사는 묶음당 한 번만 추출
+        clusters = cluster_articles(all_articles)
+        print(f"\n{cluster_summary(clusters)}")
+        representatives = [cluster[0] for cluster in clusters]
+        if full_text:
+            self.enrich_full_text(representatives)
+        
+        if batch_token_budget:
+            batches = pack_batches(representatives, token_budget=batch_token_budget)
+            print(f"  → 묶음 모드: {len(batches)}개 요청")
+            results = [relationships
+                       for batch in batches
+                       for relationships in self.extract_relationships_batch(batch)]
+        else:
+            results = []
+            for i, article in enumerate(representatives, 1):
                 if i % 10 == 0:
-                    print(f"  → 분석 진행: {i}/{len(articles)}")
-                
-                relationships = self.extract_relationships_with_claude(article)
-                all_relationships.extend(relationships)
-                
-                time.sleep(0.5)
+                    print(f"  → 분석 진행: {i}/{len(representatives)}")
+                results.append(self.extract_relationships_with_claude(article))
+        
+        print_limiter_summaries()
+        print_compaction_summary()
+        print_llm_summary()
+        if self.triage.enabled:
+            print(f"🔎 {self.triage.summary()}")
+        http_client.print_http_summary()
+        return self._relationships_frame(clusters, results)
+    
+    @staticmethod
+    def _relationships_frame(clusters, results):
+        """
+        대표 기사 추출 결과를 묶음의 모든 기사로 복사한 뒤 관계 단위로 중복 제거
+        
+        같은 관계를 보여준 기사 URL 은 evidence_urls 컬럼에 모두 남김
+        """
+        all_relationships = []
+        for cluster, relationships in zip(clusters, results):
+            all_relationships.extend(relationships)
+            for member in cluster[1:]:
+                all_relationships.extend(
+                    fan_out(relationships, member, RELATIONSHIP_SOURCE_FIELDS))
+        
+        evidence = {}
+        for rel in all_relationships:
+            key = (rel.get('person1'), rel.get('person2'), rel.get('relation_type'))
+            evidence.setdefault(key, {})[rel.get('url', '')] = None
+        for rel in all_relationships:
+            key = (rel.get('person1'), rel.get('person2'), rel.get('relation_type'))
+            rel['evidence_urls'] = ' | '.join(evidence[key])
         
         df = pd.DataFrame(all_relationships)
         
@@ -223,6 +483,81 @@ class NewsRelationshipExtractor:
         
         return df
     
+    async def collect_all_relationships_async(self, search_keywords=None, days=30,
+                                              concurrency=8, crawl_concurrency=2,
+                                              shard_days=None, full_text=False,
+                                              batch_token_budget=None):
+        """
+        collect_all_relationships 의 비동기 버전
+        
+        키워드별 크롤링은 crawl_concurrency 개씩 스레드에서, 관계 추출은 최대
+        concurrency 개 요청을 동시에 진행. 결과는 (키워드, 기사) 순서대로 조립하므로
+        drop_duplicates(keep='first') 결과가 순차 실행과 같음
+        
+        Args:
+            search_keywords: 검색 키워드 리스트
+            days: 최근 며칠
+            concurrency: 동시에 진행할 Claude 요청 수
+            crawl_concurrency: 동시에 진행할 네이버 키워드 검색 수
+            shard_days: 주어지면 기간을 이 일수 단위로 나눠 구간/페이지를 동시에 크롤링
+            full_text: True 면 검색 발췌 대신 기사 본문의 후보자 관련 문단으로 추출
+            batch_token_budget: 주어지면 이 토큰 예산 안에서 기사를 묶어 묶음 요청을 동시에 진행
+            
+        Returns:
+            DataFrame: 관계 데이터프레임
+        """
+        if search_keywords is None:
+            search_keywords = self.default_search_keywords()
+        
+        crawl_sem = asyncio.Semaphore(crawl_concurrency)
+        extract_sem = asyncio.Semaphore(concurrency)
+        
+        async def extract(article):
+            async with extract_sem:
+                return await self.extract_relationships_async(article)
+        
+        async def extract_batch(batch):
+            # 묶음 추출(누락 기사 개별 재요청 포함)은 동기 경로를 스레드에서 그대로 사용
+            async with extract_sem:
+                return await asyncio.to_thread(self.extract_relationships_batch, batch)
+        
+        async def crawl(keyword):
+            async with crawl_sem:
+                articles = await asyncio.to_thread(
+                    self.crawl_keyword, keyword, days=days, shard_days=shard_days)
+            print(f"  → [{keyword}] {len(articles)}개 기사 수집")
+            return articles
+        
+        started = time.time()
+        print(f"\n검색 중: {len(search_keywords)}개 키워드 (동시 추출 {concurrency}개)")
+        articles_by_keyword = await asyncio.gather(*(crawl(k) for k in search_keywords))
+        
+        # 키워드 간 중복 기사를 묶으려면 검색이 모두 끝나야 하므로 검색 → 묶음 → 추출 순서로 진행
+        clusters = cluster_articles([a for articles in articles_by_keyword for a in articles])
+        print(f"  → {cluster_summary(clusters)}")
+        if full_text:
+            await self.full_text_fetcher().enrich([cluster[0] for cluster in clusters])
+            print(f"  → {self.full_text_fetcher().summary()}")
+        representatives = [cluster[0] for cluster in clusters]
+        if batch_token_budget:
+            batches = pack_batches(representatives, token_budget=batch_token_budget)
+            print(f"  → 묶음 모드: {len(batches)}개 요청")
+            # pack_batches 는 입력 순서를 유지하므로 묶음 결과를 이어 붙이면 대표 기사 순서
+            batch_results = await asyncio.gather(*(extract_batch(batch) for batch in batches))
+            results = [relationships for batch in batch_results for relationships in batch]
+        else:
+            results = await asyncio.gather(*(extract(article) for article in representatives))
+        
+        print(f"  → 분석 완료 ({time.time() - started:.1f}초)")
+        print_limiter_summaries()
+        print_compaction_summary()
+        print_llm_summary()
+        if self.triage.enabled:
+            print(f"🔎 {self.triage.summary()}")
+        http_client.print_http_summary()
+        
+        return self._relationships_frame(clusters, results)
+    
     def save_to_csv(self, df, filename='relationships.csv'):
         """관계 데이터 CSV 저장"""
         df.to_csv(filename, index=False, encoding='utf-8-sig')
@@ -230,22 +565,45 @@ class NewsRelationshipExtractor:
         print(f"총 {len(df)}개 관계 추출")
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 뉴스 기반 관계망 수집")
+    parser.add_argument('--days', type=int, default=30,
+                        help="최근 며칠 간의 뉴스를 수집")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="동시에 진행할 Claude 요청 수")
+    parser.add_argument('--batch-tokens', type=int, default=None,
+                        help="이 토큰 예산 안에서 기사를 묶어 한 번에 요청 (--concurrency 와 함께 쓰면 묶음 요청을 동시에 진행)")
+    parser.add_argument('--shard-days', type=int, default=None,
+                        help="기간을 이 일수 단위로 나눠 구간/페이지를 동시에 크롤링 (예: 1=일 단위, 7=주 단위)")
+    parser.add_argument('--full-text', action='store_true',
+                        help="검색 발췌 대신 기사 본문을 받아 후보자 관련 문단으로 추출")
+    parser.add_argument('--context-tokens', type=int, default=None,
+                        help="기사 1건당 프롬프트에 넣을 본문 토큰 예산 (PROMPT_COMPACT=0 이면 압축 안 함)")
+    parser.add_argument('--triage', choices=['off', 'shadow', 'on'], default=None,
+                        help="LLM 전 사전 분류 (shadow: 판정만 기록, on: 관계 없어 보이는 기사 건너뜀, "
+                             "기본: ARTICLE_TRIAGE 환경변수 또는 off)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """메인 실행 함수"""
+    args = parse_args(argv)
+    
     print("=" * 60)
     print("충청북도 도지사 후보 관계망 분석 - Phase 1")
     print("뉴스 기반 자동 데이터 수집 시스템")
     print("=" * 60)
     
-    if not os.environ.get("ANTHROPIC_API_KEY"):
-        print("\n⚠️  ANTHROPIC_API_KEY 환경변수가 설정되지 않았습니다.")
-        print("명령 프롬프트에서 다음 명령어를 실행하세요:")
-        print("set ANTHROPIC_API_KEY=your-api-key")
+    print(f"\n{llm_client.site_status('news_extract')}")
+    if not llm_client.site_available('news_extract'):
         return
     
-    extractor = NewsRelationshipExtractor()
+    extractor = NewsRelationshipExtractor(context_token_budget=args.context_tokens,
+                                          triage=args.triage)
     
-    df_relationships = extractor.collect_all_relationships(days=30)
+    df_relationships = extractor.collect_all_relationships(
+        days=args.days, concurrency=args.concurrency, shard_days=args.shard_days,
+        full_text=args.full_text, batch_token_budget=args.batch_tokens)
     
     extractor.save_to_csv(df_relationships, 'relationships_raw.csv')
     
@@ -6,9 +6,11 @@ Virtual Scenario Simulation Engine
 import json
 import os
 import re
-import google.generativeai as genai
 import sys
 
+import llm_client
+from llm_telemetry import print_llm_summary
+
 # .env 로드 함수
 def load_env():
     try:
@@ -23,8 +25,11 @@ def load_env():
 
 load_env()
 
-# API 키 확인
-api_key = os.environ.get("GEMINI_API_KEY")
+def _parse_impact_json(response_text):
+    """응답 텍스트에서 가장 바깥 JSON 객체 추출"""
+    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+    return json.loads(json_match.group(0))
+
 
 class PoliticalEventAgent:
     def __init__(self):
@@ -34,16 +39,13 @@ class PoliticalEventAgent:
         except FileNotFoundError:
             self.candidates = []
             
-        if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel("gemini-2.5-flash")
-        else:
-            self.model = None
+        # 모델은 llm_policy 의 event_simulation 정책 (API 키나 stub 주소가 없으면 가상 데이터)
+        self.enabled = llm_client.site_available('event_simulation')
 
     def simulate_event(self, event_description):
         """정치적 사건이 각 후보의 지계에 미치는 영향 분석 (가상 시뮬레이션)"""
         
-        if not self.model:
+        if not self.enabled:
             return self._get_mock_result(event_description)
             
         cand_names = [c['name'] for c in self.candidates]
@@ -52,10 +54,8 @@ class PoliticalEventAgent:
                  "각 후보의 official, private, sentiment, regional 지표 변화(-0.5~+0.5)를 JSON으로 분석하세요."
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            return json.loads(json_match.group(0))
+            return llm_client.generate('event_simulation', prompt,
+                                       parse=_parse_impact_json)
         except Exception as e:
             print(f"API 호출 실패로 가상 데이터를 생성합니다: {e}")
             return self._get_mock_result(event_description)
@@ -73,6 +73,7 @@ class PoliticalEventAgent:
         }
 
 if __name__ == "__main__":
+    print(llm_client.site_status('event_simulation'))  # 쓸 수 있는 제공자가 없으면 가상 데이터
     agent = PoliticalEventAgent()
     # 가상 시나리오: '지역 균형발전 특별법 국회 통과 및 후보자들의 공적 다툼'
     virtual_event = "2026 충북 지역 균형발전 특별법이 국회를 통과하였으며, 신용한 후보가 이를 자신의 정책 로드맵의 승리라고 선언함"
@@ -87,3 +88,4 @@ if __name__ == "__main__":
     print("!" * 50 + "\n")
     print(f"사건: {virtual_event}")
     print("분석 결과가 'event_impact_result.json'에 저장되었습니다.")
+    print_llm_summary()
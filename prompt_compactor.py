@@ -0,0 +1,277 @@
+"""
+프롬프트 압축 - 후보자 언급 문장과 그 주변 문장만 토큰 예산 안에서 남김
+기사 본문/커뮤니티 스니펫의 상투 문구(기자명, 저작권, 구독 안내 등)와 중복 문장은 제거
+
+PROMPT_COMPACT=0 이면 원문을 그대로 사용 (호출 지점별 절약량은 summary 로 확인)
+"""
+
+import os
+import re
+import threading
+
+from tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# 호출 지점별 기본 토큰 예산 (압축 대상 텍스트 기준, 지시문 제외)
+DEFAULT_BUDGETS = {
+    'article': 500,
+    'echo': 1500,
+}
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?。])\s+|\n+')
+_SPACE_RE = re.compile(r'\s+')
+_NORMALIZE_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+# 기사/블로그에 반복되는 상투 문구 (문장 단위로 제거)
+BOILERPLATE_PATTERNS = [
+    re.compile(p) for p in (
+        r'무단\s*전재', r'재배포\s*금지', r'저작권자', r'Copyright', r'ⓒ|©',
+        r'[\w.+-]+@[\w-]+\.[\w.]+',                 # 기자 이메일
+        r'^\[?[가-힣]{2,4}\s*기자\]?$',               # 기자명만 있는 줄
+        r'구독|좋아요|알림\s*설정|제보하기|카카오톡\s*채널',
+        r'^▶|^☞|^※',
+        r'사진\s*=|그래픽\s*=|출처\s*=',
+    )
+]
+
+# 첫 문장 앞의 '[청주=뉴시스] 홍길동 기자 =' 같은 머리말 (문장은 남기고 머리말만 제거)
+_DATELINE_RE = re.compile(r'^\[[^\]]{1,20}=[^\]]{0,20}\]\s*(?:[가-힣]{2,4}\s*기자\s*=?\s*)?')
+
+
+def split_sentences(text):
+    return [s.strip() for s in _SENTENCE_RE.split(text or '') if s and s.strip()]
+
+
+def is_boilerplate(sentence):
+    return any(p.search(sentence) for p in BOILERPLATE_PATTERNS)
+
+
+def _key(sentence):
+    return _NORMALIZE_RE.sub('', sentence).lower()
+
+
+class CompactionStats:
+    """호출 지점별 압축 전/후 토큰 수 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_site = {}
+
+    def record(self, site, before, after):
+        with self._lock:
+            s = self.by_site.setdefault(site, {'calls': 0, 'before': 0, 'after': 0})
+            s['calls'] += 1
+            s['before'] += before
+            s['after'] += after
+
+    def summary(self):
+        lines = []
+        with self._lock:
+            for site, s in sorted(self.by_site.items()):
+                saved = s['before'] - s['after']
+                ratio = saved / s['before'] if s['before'] else 0
+                lines.append(
+                    f"  {site}: {s['calls']}회, {s['before']:,} → {s['after']:,} 토큰 "
+                    f"(호출당 평균 {saved / s['calls']:,.0f} 토큰, {ratio:.0%} 절약)")
+        return lines
+
+
+stats = CompactionStats()
+
+
+def compaction_enabled():
+    return os.environ.get('PROMPT_COMPACT', '1') != '0'
+
+
+class PromptCompactor:
+    """후보자 언급 문장 중심의 문맥 창 추출기"""
+
+    def __init__(self, matcher, budgets=None, window=1):
+        """
+        Args:
+            matcher: CandidateMatcher
+            budgets: 종류별 토큰 예산 (DEFAULT_BUDGETS 덮어쓰기)
+            window: 언급 문장 앞뒤로 함께 남길 문장 수
+        """
+        self.matcher = matcher
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.window = window
+
+    def _select(self, sentences, names, budget):
+        """
+        남길 문장 번호 (원래 순서)
+
+        우선순위: 후보자 2명 이상 언급 문장 → 1명 언급 문장 → 주변 문장.
+        언급 문장이 없으면 앞 문장부터 예산만큼
+        """
+        mentions = []
+        for i, sentence in enumerate(sentences):
+            found = set(self.matcher.mentioned(sentence))
+            if names is not None:
+                found &= names
+            mentions.append(len(found))
+
+        ranked = [i for i, n in enumerate(mentions) if n >= 2]
+        ranked += [i for i, n in enumerate(mentions) if n == 1]
+        neighbours = []
+        for i in [i for i, n in enumerate(mentions) if n]:
+            for j in range(i - self.window, i + self.window + 1):
+                if 0 <= j < len(sentences) and not mentions[j]:
+                    neighbours.append(j)
+        ranked += list(dict.fromkeys(neighbours))
+        if not ranked:
+            ranked = list(range(len(sentences)))
+
+        selected = set()
+        used = 0
+        for i in ranked:
+            cost = estimate_tokens(sentences[i])
+            if used + cost > budget and selected:
+                continue
+            selected.add(i)
+            used += cost
+        return sorted(selected)
+
+    def compact(self, text, kind='article', site=None, names=None):
+        """
+        텍스트를 후보자 언급 문장 중심으로 줄임
+
+        Args:
+            text: 원문
+            kind: 예산 종류 ('article' 또는 'echo')
+            site: 절약량을 집계할 호출 지점 이름 (없으면 집계 안 함)
+            names: 주어지면 이 후보자들의 언급만 기준으로 삼음
+
+        Returns:
+            str: 압축된 텍스트 (PROMPT_COMPACT=0 이면 원문)
+        """
+        if not compaction_enabled() or not text:
+            return text
+        seen = set()
+        sentences = []
+        for sentence in split_sentences(text):
+            sentence = _DATELINE_RE.sub('', _SPACE_RE.sub(' ', sentence))
+            key = _key(sentence)
+            if not key or key in seen or is_boilerplate(sentence):
+                continue
+            seen.add(key)
+            sentences.append(sentence)
+
+        budget = self.budgets[kind]
+        keep = self._select(sentences, set(names) if names else None, budget)
+        compacted = ' '.join(sentences[i] for i in keep)
+        # 문장 부호 없이 통째로 긴 본문은 예산 길이에서 자름
+        compacted = compacted[:int(budget * CHARS_PER_TOKEN)]
+        if site:
+            stats.record(site, estimate_tokens(text), estimate_tokens(compacted))
+        return compacted
+
+    def compact_article(self, article, site=None):
+        """content 를 압축한 기사 사본 (원본 기사는 바꾸지 않음)"""
+        return {**article, 'content': self.compact(article.get('content', ''), 'article', site)}
+
+    def _snippet_lines(self, items, names):
+        """
+        반응 목록을 중복 합친 줄 목록으로 (원래 순서)
+
+        Returns:
+            list: dict (line: '- 제목: 내용' (반복 시 ' (×N)' 포함), count: 반복 횟수,
+                  mentioned: 대상 후보자 직접 언급 여부)
+        """
+        names = set(names) if names else None
+        kept = {}
+        for d in items:
+            key = _key(d['title'] + d['snippet'])
+            if not key:
+                continue
+            if key in kept:
+                kept[key]['count'] += 1
+                continue
+            snippet = ' '.join(s for s in split_sentences(d['snippet']) if not is_boilerplate(s))
+            found = set(self.matcher.mentioned(d['title'] + " " + snippet))
+            if names is not None:
+                found &= names
+            kept[key] = {'line': f"- {d['title']}: {snippet}", 'count': 1,
+                         'mentioned': bool(found)}
+        entries = list(kept.values())
+        for entry in entries:
+            if entry['count'] > 1:
+                entry['line'] += f" (×{entry['count']})"
+        return entries
+
+    def compact_snippets(self, items, names=None, site=None):
+        """
+        커뮤니티 반응 (title, snippet) 목록을 전체 예산 안의 '- 제목: 내용' 줄들로
+
+        같은 반응은 한 줄로 합치고 반복 횟수를 '(×N)' 으로 남겨 에코 강도 판단에 쓰이게 함
+
+        Returns:
+            str: 프롬프트에 넣을 텍스트
+        """
+        original = "\n".join(f"- {d['title']}: {d['snippet']}" for d in items)
+        if not compaction_enabled():
+            return original
+
+        kept = self._snippet_lines(items, names)
+
+        # 후보자를 직접 언급한 반응을 먼저 채우고 남는 예산에 나머지 (원래 순서 유지)
+        budget = self.budgets['echo']
+        selected = set()
+        used = 0
+        for priority in (True, False):
+            for i, entry in enumerate(kept):
+                if entry['mentioned'] != priority:
+                    continue
+                cost = estimate_tokens(entry['line'])
+                if used + cost > budget:
+                    continue
+                selected.add(i)
+                used += cost
+        compacted = "\n".join(entry['line'] for i, entry in enumerate(kept) if i in selected)
+        if site:
+            stats.record(site, estimate_tokens(original), estimate_tokens(compacted))
+        return compacted
+
+    def chunk_snippets(self, items, names=None, site=None):
+        """
+        커뮤니티 반응 전체를 버리지 않고 예산 크기의 묶음들로 (map-reduce 분석용)
+
+        compact_snippets 와 같은 방식으로 중복을 합친 뒤 원래 순서대로 묶음마다 echo 예산까지 채움
+        (예산보다 긴 반응 1줄은 잘라서 넣음)
+
+        Returns:
+            list: dict (text: 프롬프트에 넣을 텍스트, reactions: 묶음에 든 반응 수 (반복 포함))
+        """
+        if compaction_enabled():
+            entries = self._snippet_lines(items, names)
+        else:
+            entries = [{'line': f"- {d['title']}: {d['snippet']}", 'count': 1} for d in items]
+
+        budget = self.budgets['echo']
+        chunks = []
+        lines, reactions, used = [], 0, 0
+        for entry in entries:
+            line = entry['line'][:int(budget * CHARS_PER_TOKEN)]
+            cost = estimate_tokens(line)
+            if lines and used + cost > budget:
+                chunks.append({'text': "\n".join(lines), 'reactions': reactions})
+                lines, reactions, used = [], 0, 0
+            lines.append(line)
+            reactions += entry['count']
+            used += cost
+        if lines:
+            chunks.append({'text': "\n".join(lines), 'reactions': reactions})
+
+        if site:
+            original = "\n".join(f"- {d['title']}: {d['snippet']}" for d in items)
+            stats.record(site, estimate_tokens(original),
+                         sum(estimate_tokens(c['text']) for c in chunks))
+        return chunks
+
+
+def print_compaction_summary():
+    """호출 지점별 프롬프트 압축 절약량 출력"""
+    lines = stats.summary()
+    if lines:
+        print("\n🗜️  프롬프트 압축")
+        for line in lines:
+            print(line)
@@ -0,0 +1,243 @@
+"""
+LLM 호출용 적응형 토큰 버킷 속도 제한기
+분당 요청 수(RPM)와 분당 토큰 수(TPM)를 지키고, 429/과부하 응답에 맞춰 속도를 낮춘 뒤 재시도
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+
+# 제공자별 기본 예산 (요금제에 맞게 환경에 따라 조정)
+DEFAULT_LIMITS = {
+    'gemini': {'rpm': 60, 'tpm': 200_000},
+    'anthropic': {'rpm': 50, 'tpm': 40_000},
+    # 네이버 검색 크롤링 (요청 수만 제한, 토큰 예산 없음)
+    'naver': {'rpm': 120, 'tpm': None},
+}
+
+# 제한기가 속도를 낮추고 재시도하는 HTTP 상태 (429 요청 과다, 503/529 과부하)
+RATE_LIMIT_STATUSES = (429, 503, 529)
+
+
+def _status_code(error):
+    """SDK/httpx 예외의 HTTP 상태 코드 (없으면 None)"""
+    for status in (getattr(error, 'status_code', None), getattr(error, 'code', None),
+                   getattr(getattr(error, 'response', None), 'status_code', None)):
+        try:
+            return int(status)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_rate_limit_error(error):
+    """
+    429(요청 과다) 또는 과부하(529/503) 계열 오류인지 판별 (상태 코드/SDK 예외 종류 기반)
+
+    메시지 문자열은 상태 코드를 주지 않는 Gemini 의 RESOURCE_EXHAUSTED 만 확인
+    (URL, 기사 ID 등에 들어 있는 '429' 를 속도 제한으로 오인하지 않도록)
+    """
+    if _status_code(error) in RATE_LIMIT_STATUSES:
+        return True
+    if type(error).__name__ in ('RateLimitError', 'ResourceExhausted', 'TooManyRequests',
+                                'ServiceUnavailable', 'OverloadedError'):
+        return True
+    return 'resource_exhausted' in str(error).lower().replace(' ', '_')
+
+
+def _retry_after(error):
+    """응답 헤더의 retry-after (초) 가 있으면 반환"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """분당 용량만큼 연속적으로 채워지는 버킷 (scale 로 용량/충전 속도를 배율만큼 줄임)"""
+
+    def __init__(self, per_minute, now=None):
+        self.base_capacity = float(per_minute)
+        self.base_rate = per_minute / 60.0
+        self.capacity = self.base_capacity
+        self.rate = self.base_rate
+        self.tokens = self.base_capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount, now):
+        """amount 만큼 예약하고 기다려야 할 시간(초) 반환 (잔량이 음수가 될 수 있음)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def scale(self, factor, now, drain=False):
+        """
+        용량과 충전 속도를 설정 예산의 factor 배로 (용량은 요청 1건 이상 유지)
+
+        drain=True 면 남은 잔량도 비워 다음 요청부터 바로 낮춘 속도로 간격을 둠
+        """
+        self._refill(now)
+        self.capacity = max(self.base_capacity * factor, min(self.base_capacity, 1.0))
+        self.rate = self.base_rate * factor
+        self.tokens = min(self.tokens, 0.0 if drain else self.capacity)
+
+
+class AdaptiveRateLimiter:
+    """
+    RPM/TPM 토큰 버킷 + AIMD 적응 제어
+
+    - 429/과부하 응답: 속도 배율을 절반으로 낮춰 버킷의 충전 속도/용량에 반영하고 남은 잔량을
+      비운 뒤(바로 느려짐) 지터가 있는 지수 백오프 후 재시도
+    - 성공: 배율을 조금씩 회복 (최대 1.0 = 설정된 예산)
+    """
+
+    def __init__(self, name, rpm, tpm=None, max_retries=5, base_backoff=2.0,
+                 max_backoff=60.0, min_factor=0.1, clock=time.monotonic):
+        """
+        Args:
+            rpm: 분당 요청 수
+            tpm: 분당 토큰 수 (None 이면 요청 수만 제한)
+            clock: 단조 시계 (테스트에서 주입)
+        """
+        self.name = name
+        self.clock = clock
+        now = clock()
+        self.requests = TokenBucket(rpm, now)
+        self.tokens = TokenBucket(tpm, now) if tpm else None
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.min_factor = min_factor
+        self.factor = 1.0
+        self._lock = threading.Lock()
+        self._started = now
+        self.stats = {'calls': 0, 'succeeded': 0, 'failed': 0, 'retries': 0,
+                      'rate_limited': 0, 'tokens': 0, 'waited': 0.0}
+
+    def _reserve(self, est_tokens):
+        """요청 1건 + 예상 토큰을 예약하고 대기 시간 반환 (버킷이 배율만큼 느리게 채워짐)"""
+        with self._lock:
+            now = self.clock()
+            wait = self.requests.reserve(1, now)
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.reserve(est_tokens, now))
+            self.stats['calls'] += 1
+            self.stats['tokens'] += est_tokens
+            self.stats['waited'] += wait
+            return wait
+
+    def _set_factor(self, factor, drain=False):
+        """배율을 바꾸고 버킷에 반영 (잠금을 쥔 상태에서 호출)"""
+        self.factor = factor
+        now = self.clock()
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.scale(factor, now, drain)
+
+    def _on_success(self):
+        with self._lock:
+            self.stats['succeeded'] += 1
+            if self.factor < 1.0:
+                self._set_factor(min(1.0, self.factor + 0.05))
+
+    def _on_rate_limited(self, attempt, error):
+        """속도를 낮추고 이번 재시도 전 대기 시간 반환"""
+        with self._lock:
+            self.stats['rate_limited'] += 1
+            self.stats['retries'] += 1
+            self._set_factor(max(self.min_factor, self.factor / 2), drain=True)
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** attempt)
+        retry_after = _retry_after(error)
+        if retry_after:
+            backoff = max(backoff, retry_after)
+        return backoff * random.uniform(0.5, 1.0) + random.uniform(0, 0.5)
+
+    def _on_failure(self):
+        with self._lock:
+            self.stats['failed'] += 1
+
+    def call(self, fn, est_tokens=1000):
+        """
+        속도 제한을 지키며 fn() 호출, 429/과부하 오류는 백오프 후 재시도
+
+        그 외 오류와 재시도 한도 초과 시에는 원래 예외를 그대로 발생
+        """
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve(est_tokens)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                result = fn()
+            except Exception as e:
+                if is_rate_limit_error(e) and attempt < self.max_retries:
+                    backoff = self._on_rate_limited(attempt, e)
+                    print(f"    ⏳ [{self.name}] 속도 제한 응답 - {backoff:.1f}초 후 재시도 "
+                          f"({attempt + 1}/{self.max_retries})")
+                    time.sleep(backoff)
+                    continue
+                self._on_failure()
+                raise
+            self._on_success()
+            return result
+
+    async def call_async(self, fn, est_tokens=1000):
+        """call 의 비동기 버전 (fn 은 코루틴 함수)"""
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve(est_tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                result = await fn()
+            except Exception as e:
+                if is_rate_limit_error(e) and attempt < self.max_retries:
+                    backoff = self._on_rate_limited(attempt, e)
+                    print(f"    ⏳ [{self.name}] 속도 제한 응답 - {backoff:.1f}초 후 재시도 "
+                          f"({attempt + 1}/{self.max_retries})")
+                    await asyncio.sleep(backoff)
+                    continue
+                self._on_failure()
+                raise
+            self._on_success()
+            return result
+
+    def summary(self):
+        """달성 처리량 보고"""
+        elapsed = max(self.clock() - self._started, 1e-9)
+        s = self.stats
+        tokens = (f"예상 토큰 {s['tokens'] / elapsed * 60:,.0f}/분, "
+                  if self.tokens is not None else "")
+        return (f"[{self.name}] 성공 {s['succeeded']}건 / 실패 {s['failed']}건, "
+                f"재시도 {s['retries']}회 (속도 제한 {s['rate_limited']}회), "
+                f"처리량 {s['succeeded'] / elapsed * 60:.1f}건/분, {tokens}"
+                f"대기 {s['waited']:.1f}초, 현재 속도 배율 {self.factor:.2f}")
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider):
+    """제공자별 공용 제한기 (환경변수 {PROVIDER}_RPM / {PROVIDER}_TPM 로 예산 조정, TPM 은 선택)"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            limits = DEFAULT_LIMITS.get(provider, {'rpm': 60, 'tpm': 100_000})
+            rpm = int(os.environ.get(f"{provider.upper()}_RPM", limits['rpm']))
+            tpm = os.environ.get(f"{provider.upper()}_TPM", limits['tpm'])
+            tpm = int(tpm) if tpm else None
+            _limiters[provider] = AdaptiveRateLimiter(provider, rpm, tpm)
+        return _limiters[provider]
+
+
+def print_limiter_summaries():
+    """사용된 모든 제한기의 처리량 출력"""
+    for limiter in list(_limiters.values()):
+        print(f"📈 {limiter.summary()}")
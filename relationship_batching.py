@@ -0,0 +1,138 @@
+"""
+다중 기사 묶음 관계 추출 프롬프트
+짧은 RSS 요약/검색 스니펫 여러 개를 하나의 요청에 담아 지시문과 후보자 명단을 한 번만 보냄
+"""
+
+import json
+import re
+
+from tokens import estimate_tokens
+
+# 지시문 + 후보자 명단 + 출력 형식의 대략적인 고정 토큰
+BATCH_PROMPT_OVERHEAD_TOKENS = 600
+
+BATCH_PROMPT_TEMPLATE = """
+다음 뉴스 기사 {count}건을 각각 분석하여 충청북도 도지사 후보자들 간의 관계를 추출하세요.
+
+**후보자 명단**: {candidates}
+
+{articles}
+
+**출력 형식 (JSON)**:
+{{
+    "results": [
+        {{
+            "article_id": "기사 ID (예: A1)",
+            "relationships": [
+                {{
+                    "person1": "후보자명",
+                    "person2": "후보자명 또는 관련 인물",
+                    "relation_type": "정치적동맹|경쟁|학연|지연|사제|협력|비판|지지|중립",
+                    "strength": 0.0-1.0,
+                    "direction": "양방향|person1→person2|person2→person1",
+                    "evidence": "관계를 보여주는 기사 속 핵심 문장",
+                    "sentiment": "긍정|부정|중립"
+                }}
+            ]
+        }}
+    ]
+}}
+
+**규칙**:
+1. 모든 기사 ID에 대해 결과를 하나씩 반환 (관계가 없으면 빈 리스트)
+2. 후보자 명단에 있는 인물만 추출
+3. 각 기사에 명시적으로 나타난 관계만 추출 (다른 기사 내용과 섞지 말 것)
+4. 추측이나 추론 금지
+5. strength는 관계의 명확성과 중요도 (0=희미함, 1=매우명확)
+"""
+
+ARTICLE_BLOCK_TEMPLATE = """### 기사 ID: {article_id}
+**기사 제목**: {title}
+**기사 내용**: {content}
+"""
+
+
+def article_tokens(article):
+    return estimate_tokens(article['title']) + estimate_tokens(article['content']) + 20
+
+
+def pack_batches(articles, token_budget=3000, max_articles=20):
+    """
+    토큰 예산에 맞춰 기사들을 묶음으로 분할 (입력 순서 유지)
+
+    Args:
+        articles: 기사 리스트
+        token_budget: 묶음 하나의 프롬프트 토큰 예산 (고정 지시문 포함)
+        max_articles: 묶음 하나의 최대 기사 수
+
+    Returns:
+        list: 기사 리스트의 리스트 (예산을 넘는 긴 기사는 단독 묶음)
+    """
+    batches = []
+    current = []
+    used = BATCH_PROMPT_OVERHEAD_TOKENS
+    for article in articles:
+        tokens = article_tokens(article)
+        if current and (used + tokens > token_budget or len(current) >= max_articles):
+            batches.append(current)
+            current = []
+            used = BATCH_PROMPT_OVERHEAD_TOKENS
+        current.append(article)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(candidates, articles):
+    """기사 묶음용 프롬프트 (기사 ID는 A1, A2, ... 순서)"""
+    blocks = "\n".join(
+        ARTICLE_BLOCK_TEMPLATE.format(article_id=f"A{i}",
+                                      title=article['title'],
+                                      content=article['content'])
+        for i, article in enumerate(articles, 1)
+    )
+    return BATCH_PROMPT_TEMPLATE.format(count=len(articles),
+                                        candidates=', '.join(candidates),
+                                        articles=blocks)
+
+
+def parse_json_response(response_text):
+    """LLM 응답에서 JSON 본문 추출 (```json 코드블록 허용)"""
+    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```',
+                           response_text, re.DOTALL)
+    if json_match:
+        response_text = json_match.group(1)
+    return json.loads(response_text)
+
+
+def parse_batch_response(response_text, articles, keyword_field='keyword'):
+    """
+    묶음 응답을 기사별 관계 리스트로 매핑하고 메타데이터 추가
+
+    Args:
+        response_text: LLM 응답 텍스트
+        articles: 프롬프트에 넣은 기사 리스트 (ID 순서와 동일)
+        keyword_field: 관계의 'keyword' 값으로 쓸 기사 필드
+            (지역 RSS 수집기는 'source', 네이버 수집기는 'keyword')
+
+    Returns:
+        list: 기사 순서대로 관계 리스트, 응답에 빠진 기사는 None
+    """
+    result = parse_json_response(response_text)
+    by_id = {}
+    for item in result.get('results', []):
+        if isinstance(item, dict) and 'article_id' in item:
+            by_id[str(item['article_id']).strip().upper()] = item.get('relationships', [])
+
+    mapped = []
+    for i, article in enumerate(articles, 1):
+        relationships = by_id.get(f"A{i}")
+        if relationships is not None:
+            for rel in relationships:
+                rel['source_article'] = article['title']
+                rel['url'] = article['url']
+                rel['date'] = article['date']
+                rel['keyword'] = article[keyword_field]
+        mapped.append(relationships)
+    return mapped
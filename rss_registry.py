@@ -0,0 +1,105 @@
+"""
+RSS 주소 탐지 레지스트리
+작동하는 주소와 죽은 주소를 기억해 매 실행마다 탐지 패턴을 다시 시도하지 않음
+"""
+
+import time
+
+from storage_utils import load_json, save_json_atomic
+
+RSS_REGISTRY_FILE = 'rss_registry.json'
+
+DAY = 24 * 3600
+
+
+class RssRegistry:
+    """
+    언론사별 RSS 주소 상태 저장소
+
+    - working: 항목이 있는 피드. 매 실행마다 수집되므로 자연스럽게 재검증됨
+    - dead: 오류/빈 피드. TTL 동안 건너뛰고, 연속 실패할수록 TTL을 늘려 재시도
+    - 작동 주소가 있더라도 rediscover_ttl 이 지나면 탐지 패턴을 다시 확인
+    """
+
+    def __init__(self, path=RSS_REGISTRY_FILE, dead_ttl=DAY,
+                 max_dead_ttl=14 * DAY, rediscover_ttl=7 * DAY):
+        self.path = path
+        self.dead_ttl = dead_ttl
+        self.max_dead_ttl = max_dead_ttl
+        self.rediscover_ttl = rediscover_ttl
+        data = load_json(path, {})
+        self.urls = data.get('urls', {})
+        self.sources = data.get('sources', {})
+        self.skipped = 0
+
+    def record(self, url, source_name, ok):
+        """수집 결과 기록 (ok=True: 항목이 있는 피드)"""
+        entry = self.urls.setdefault(url, {'source': source_name, 'fail_count': 0})
+        entry['source'] = source_name
+        entry['checked_at'] = time.time()
+        if ok:
+            entry['status'] = 'working'
+            entry['fail_count'] = 0
+        else:
+            entry['status'] = 'dead'
+            entry['fail_count'] = entry.get('fail_count', 0) + 1
+
+    def is_dead(self, url):
+        """죽은 주소이고 재시도 TTL이 아직 지나지 않았는지"""
+        entry = self.urls.get(url)
+        if not entry or entry.get('status') != 'dead':
+            return False
+        ttl = min(self.dead_ttl * 2 ** (entry['fail_count'] - 1), self.max_dead_ttl)
+        return time.time() - entry['checked_at'] < ttl
+
+    def known_good(self, source_name):
+        """언론사의 작동 확인된 주소"""
+        return [url for url, entry in self.urls.items()
+                if entry['source'] == source_name and entry.get('status') == 'working']
+
+    def candidate_urls(self, source_name, configured_urls):
+        """
+        이번 실행에서 요청할 주소 목록
+
+        작동 주소가 알려져 있으면 그것만 사용하고(처음 보는 설정 주소는 한 번 시도),
+        없으면 설정된 주소 중 죽은 주소를 제외하고 시도
+        """
+        known = self.known_good(source_name)
+        if known:
+            new_configured = [u for u in configured_urls if u not in self.urls]
+            return known + new_configured
+        urls = [u for u in configured_urls if not self.is_dead(u)]
+        self.skipped += len(configured_urls) - len(urls)
+        return urls
+
+    def discovery_urls(self, source_name, base_url, patterns, exclude=()):
+        """
+        자동 탐지로 시도할 주소 목록
+
+        작동 주소가 있고 최근에 탐지했으면 빈 리스트. 죽은 주소는 TTL 동안 제외
+        """
+        last = self.sources.get(source_name, {}).get('discovered_at', 0)
+        if self.known_good(source_name) and time.time() - last < self.rediscover_ttl:
+            return []
+        urls = []
+        for pattern in patterns:
+            url = base_url.rstrip('/') + pattern
+            if url in exclude or url in urls:
+                continue
+            if self.is_dead(url):
+                self.skipped += 1
+                continue
+            urls.append(url)
+        return urls
+
+    def mark_discovered(self, source_name):
+        self.sources.setdefault(source_name, {})['discovered_at'] = time.time()
+
+    def save(self):
+        save_json_atomic(self.path, {'urls': self.urls, 'sources': self.sources})
+
+    def summary(self):
+        working = sum(1 for e in self.urls.values() if e.get('status') == 'working')
+        dead = sum(1 for e in self.urls.values() if e.get('status') == 'dead')
+        return (f"RSS 레지스트리: 작동 {working}개, 죽은 주소 {dead}개, "
+                f"이번 실행에서 건너뛴 요청 {self.skipped}개")
@@ -3,74 +3,115 @@
 Phase 2: 온라인 커뮤니티, 카페, 블로그의 반응 및 프레임 분석
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
+import re
 import pandas as pd
 from datetime import datetime
-import time
-import re
-from anthropic import Anthropic
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from candidate_matcher import CandidateMatcher
+from echo_frames import merge_echo_frames
+from prompt_compactor import PromptCompactor, print_compaction_summary
+from llm_telemetry import print_llm_summary
+from relationship_batching import parse_json_response
+import llm_client
+import http_client
+from rate_limiter import get_limiter, print_limiter_summaries
+
+NAVER_SEARCH_URL = "https://search.naver.com/search.naver"
+
+# 반응이 프롬프트 예산 1개를 넘으면 예산 크기 묶음별로 동시에 분석한 뒤 합침 (ECHO_MAP_REDUCE=0 이면
+# 기존처럼 예산만큼만 잘라서 한 번에 분석)
+MAP_WORKERS = 4
+
+
+def map_reduce_enabled():
+    return os.environ.get('ECHO_MAP_REDUCE', '1') != '0'
 
-# Claude API 설정
-client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
 
 class SocialEchoCollector:
     """커뮤니티 및 소셜 미디어의 '에코 체임버' 효과와 여론 프레임을 분석하는 클래스"""
     
-    def __init__(self):
+    def __init__(self, context_token_budget=None, search_url=None, map_workers=MAP_WORKERS):
+        """
+        Args:
+            context_token_budget: 프레임 분석 요청 1건에 넣을 반응 토큰 예산 (넘는 반응은 묶음으로 나눠
+                분석 후 합침, 기본: prompt_compactor.DEFAULT_BUDGETS['echo'])
+            search_url: 네이버 검색 주소 (기본: NAVER_SEARCH_URL 환경변수 또는 실제 네이버,
+                벤치마크는 로컬 서버 주소 사용)
+            map_workers: 후보자 1명의 묶음 분석을 동시에 진행할 수
+        """
+        self.map_workers = map_workers
+        self.search_url = search_url or os.environ.get('NAVER_SEARCH_URL', NAVER_SEARCH_URL)
         with open('candidates_data.json', 'r', encoding='utf-8') as f:
             data = json.load(f)
         self.candidates = [c['name'] for c in data['candidates']]
+        self.compactor = PromptCompactor(
+            CandidateMatcher.from_file(),
+            {'echo': context_token_budget} if context_token_budget else None)
         self.echo_data = []
 
-    def collect_naver_community(self, keyword, search_type='cafe', max_pages=3):
-        """네이버 카페 또는 블로그에서 커뮤니티 반응 수집 (실질적 에코 체임버)"""
-        results = []
-        base_url = f"https://search.naver.com/search.naver?where={search_type}&query={keyword}"
+    def _fetch_community_page(self, keyword, search_type, page):
+        """검색 결과 1페이지 (429 는 공용 'naver' 속도 제한기가 속도를 낮추고 재시도)"""
+        params = {'where': search_type, 'query': keyword, 'start': (page - 1) * 10 + 1}
+        response = get_limiter('naver').call(
+            lambda: http_client.get(self.search_url, params=params,
+                                    retry_statuses=http_client.LIMITED_RETRY_STATUSES).raise_for_status(),
+            est_tokens=0)
+        soup = BeautifulSoup(response.text, 'html.parser')
         
-        print(f"  > 네이버 {search_type} 검색 중: {keyword}")
+        # 검색 결과 항목 추출 (카페/블로그 패턴에 따라 조정 필요)
+        items = soup.select('.api_ani_send') # 네이버 검색 결과 공통 클래스 시도
+        if not items:
+            items = soup.select('.total_wrap') # 대안 패턴
         
-        try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-            response = requests.get(base_url, headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 검색 결과 항목 추출 (카페/블로그 패턴에 따라 조정 필요)
-            items = soup.select('.api_ani_send') # 네이버 검색 결과 공통 클래스 시도
-            if not items:
-                items = soup.select('.total_wrap') # 대안 패턴
-                
-            for item in items[:20]: # 페이지당 상위 20개
-                title = item.select_one('.api_txt_lines.total_tit')
-                desc = item.select_one('.api_txt_lines.dsc_txt')
-                
-                if title and desc:
-                    results.append({
-                        'title': title.get_text(strip=True),
-                        'snippet': desc.get_text(strip=True),
-                        'source_type': search_type,
-                        'keyword': keyword
-                    })
+        results = []
+        for item in items[:20]: # 페이지당 상위 20개
+            title = item.select_one('.api_txt_lines.total_tit')
+            desc = item.select_one('.api_txt_lines.dsc_txt')
             
-            return results
-        except Exception as e:
-            print(f"    ❌ 수집 오류: {e}")
-            return []
+            if title and desc:
+                results.append({
+                    'title': title.get_text(strip=True),
+                    'snippet': desc.get_text(strip=True),
+                    'source_type': search_type,
+                    'keyword': keyword
+                })
+        return results
 
-    def analyze_echo_frames(self, candidate_name, raw_data):
-        """수집된 커뮤니티 반응에서 주된 '프레임'과 '에코' 강도 분석"""
-        if not raw_data:
-            return None
-            
-        combined_text = "\n".join([f"- {d['title']}: {d['snippet']}" for d in raw_data])
+    def collect_naver_community(self, keyword, search_type='cafe', max_pages=3):
+        """
+        네이버 카페 또는 블로그에서 커뮤니티 반응 수집 (실질적 에코 체임버)
+        
+        max_pages 개 페이지를 동시에 요청하고 페이지 순서대로 합침 (같은 반응이 반복되는 것도
+        에코 강도의 근거이므로 중복은 제거하지 않음)
+        """
+        if max_pages <= 0:
+            return []
+        print(f"  > 네이버 {search_type} 검색 중: {keyword} ({max_pages}페이지)")
+        
+        with ThreadPoolExecutor(max_workers=max_pages) as executor:
+            futures = [executor.submit(self._fetch_community_page, keyword, search_type, page)
+                       for page in range(1, max_pages + 1)]
         
-        prompt = f"""
+        results = []
+        for page, future in enumerate(futures, 1):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                print(f"    ❌ 수집 오류 ({keyword} {search_type}, page: {page}): {e}")
+        return results
+
+    @staticmethod
+    def _frame_prompt(candidate_name, combined_text):
+        return f"""
 다음은 충북도지사 후보 '{candidate_name}'에 대한 온라인 커뮤니티(카페, 블로그 등)의 반응들입니다. 
 이 데이터에서 나타나는 '에코 체임버(반복되는 여론의 틀)'를 분석하세요.
 
-**수집 데이터**:
+**수집 데이터** (끝의 (×N)은 같은 반응이 N번 반복되었다는 뜻):
 {combined_text}
 
 **분석 요청 사항 (JSON 형식으로 답하세요)**:
@@ -94,53 +135,98 @@ class SocialEchoCollector:
 2. 정치적 중립을 유지하세요.
 """
 
+    def _analyze_text(self, candidate_name, combined_text):
         try:
-            message = client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            response_text = message.content[0].text
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(1)
-            
-            return json.loads(response_text)
+            return llm_client.generate('echo_frames', self._frame_prompt(candidate_name, combined_text),
+                                       max_tokens=2000, parse=parse_json_response)
         except Exception as e:
-            print(f"    ❌ 분석 오류: {e}")
+            print(f"    ❌ [{candidate_name}] 분석 오류: {e}")
+            return None
+
+    def analyze_echo_frames(self, candidate_name, raw_data):
+        """
+        수집된 커뮤니티 반응에서 주된 '프레임'과 '에코' 강도 분석
+        
+        중복을 합친 반응이 프롬프트 예산 1개 안에 들어가면 한 번에 분석하고, 넘으면 예산 크기
+        묶음들을 동시에 분석(map)한 뒤 merge_echo_frames 로 합침(reduce). 일부 묶음 분석이
+        실패해도 나머지 묶음으로 결과를 만듦
+        """
+        if not raw_data:
+            return None
+        
+        chunks = (self.compactor.chunk_snippets(raw_data, names=[candidate_name], site='echo_frames')
+                  if map_reduce_enabled() else [])
+        if len(chunks) <= 1:
+            # 중복 반응은 반복 횟수로 합치고 후보자 언급 반응 우선으로 토큰 예산 안에서 자름
+            combined_text = chunks[0]['text'] if chunks else self.compactor.compact_snippets(
+                raw_data, names=[candidate_name], site='echo_frames')
+            return self._analyze_text(candidate_name, combined_text)
+        
+        print(f"  🧩 [{candidate_name}] 반응 {len(raw_data)}건 → {len(chunks)}개 묶음 동시 분석")
+        with ThreadPoolExecutor(max_workers=min(self.map_workers, len(chunks))) as executor:
+            reports = list(executor.map(
+                lambda chunk: self._analyze_text(candidate_name, chunk['text']), chunks))
+        partials = [(report, chunk['reactions'])
+                    for report, chunk in zip(reports, chunks) if isinstance(report, dict)]
+        if not partials:
+            return None
+        if len(partials) < len(chunks):
+            print(f"  ⚠️ [{candidate_name}] {len(chunks) - len(partials)}개 묶음 분석 실패 (나머지로 합침)")
+        report = merge_echo_frames(candidate_name, partials)
+        if not report['top_frames']:
             return None
+        return report
 
-    def run_analysis(self):
+    def analyze_candidate(self, name, max_pages=3):
+        """후보자 1명의 카페/블로그 반응 수집 (두 출처 동시) 및 프레임 분석"""
+        keyword = f"{name} 충북도지사"
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            cafe = executor.submit(self.collect_naver_community, keyword, 'cafe', max_pages)
+            blog = executor.submit(self.collect_naver_community, keyword, 'blog', max_pages)
+            total_data = cafe.result() + blog.result()
+        
+        if not total_data:
+            print(f"  ⚠️ [{name}] 수집된 커뮤니티 반응이 없습니다.")
+            return None
+        
+        print(f"  ✅ [{name}] {len(total_data)}개의 반응 수집 완료. 프레임 분석 중...")
+        report = self.analyze_echo_frames(name, total_data)
+        if report and report.get('top_frames'):
+            top = report['top_frames'][0]
+            print(f"  📊 [{name}] 주요 프레임: {top.get('frame_name')} "
+                  f"({top.get('sentiment')}), 양극화 지수: {report.get('polarization_index')}")
+        elif report:
+            print(f"  ⚠️ [{name}] 분석 결과에 프레임이 없습니다.")
+        return report
+
+    def run_analysis(self, max_pages=3, max_workers=None):
+        """
+        모든 후보자 분석 (후보자별 수집/분석을 동시에 진행)
+        
+        네이버 요청과 LLM 호출은 공용 속도 제한기(NAVER_RPM, 제공자별 RPM/TPM)를 함께 쓰므로
+        동시 실행 수를 늘려도 전체 요청 속도는 예산 안에서 유지됨
+        
+        Args:
+            max_pages: 출처(카페/블로그)별 수집 페이지 수
+            max_workers: 동시에 분석할 후보자 수 (기본: 전체 후보자)
+        """
         print("\n" + "="*60)
         print("🚀 Step 2: 에코 체임버 및 커뮤니티 프레임 분석 시작")
         print("="*60)
         
-        final_reports = []
-        
-        for name in self.candidates:
-            print(f"\n【{name} 후보 분석】")
-            
-            # 1. 데이터 수집 (카페 + 블로그)
-            cafe_data = self.collect_naver_community(f"{name} 충북도지사", 'cafe')
-            blog_data = self.collect_naver_community(f"{name} 충북도지사", 'blog')
-            total_data = cafe_data + blog_data
-            
-            if not total_data:
-                print(f"  ⚠️ 수집된 커뮤니티 반응이 없습니다.")
-                continue
-                
-            print(f"  ✅ {len(total_data)}개의 반응 수집 완료. 프레임 분석 중...")
-            
-            # 2. 프레임 분석
-            report = self.analyze_echo_frames(name, total_data)
-            if report:
-                final_reports.append(report)
-                print(f"  📊 주요 프레임: {report['top_frames'][0]['frame_name']} ({report['top_frames'][0]['sentiment']})")
-                print(f"  📈 양극화 지수: {report['polarization_index']}")
-            
-            time.sleep(1) # API 부하 방지
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=max_workers or len(self.candidates) or 1) as executor:
+            reports = list(executor.map(
+                lambda name: self.analyze_candidate(name, max_pages), self.candidates))
+        # 결과는 후보자 명단 순서 유지
+        final_reports = [report for report in reports if report]
+        print(f"\n⏱️  {len(self.candidates)}명 분석 완료 ({time.time() - started:.1f}초)")
             
+        print_limiter_summaries()
+        print_compaction_summary()
+        print_llm_summary()
+        http_client.print_http_summary()
+        
         # 3. 결과 저장
         if final_reports:
             output_file = 'community_sentiment_analysis.json'
@@ -151,20 +237,19 @@ class SocialEchoCollector:
             # CSV로 요약본 생성
             summary_list = []
             for r in final_reports:
-                for f in r['top_frames']:
+                for f in r.get('top_frames') or []:
                     summary_list.append({
-                        'candidate': r['candidate'],
-                        'frame': f['frame_name'],
-                        'sentiment': f['sentiment'],
-                        'strength': f['echo_strength'],
-                        'polarization': r['polarization_index']
+                        'candidate': r.get('candidate'),
+                        'frame': f.get('frame_name'),
+                        'sentiment': f.get('sentiment'),
+                        'strength': f.get('echo_strength'),
+                        'polarization': r.get('polarization_index')
                     })
             pd.DataFrame(summary_list).to_csv('community_sentiment_summary.csv', index=False, encoding='utf-8-sig')
             print(f"✅ 요약 CSV 저장: community_sentiment_summary.csv")
 
 if __name__ == "__main__":
-    if not os.environ.get("ANTHROPIC_API_KEY"):
-        print("⚠️ ANTHROPIC_API_KEY 환경변수가 필요합니다.")
-    else:
+    print(llm_client.site_status('echo_frames'))
+    if llm_client.site_available('echo_frames'):
         analyzer = SocialEchoCollector()
         analyzer.run_analysis()
@@ -0,0 +1,23 @@
+"""
+로컬 캐시/저장소 파일 입출력 공통 함수
+"""
+
+import json
+import os
+
+
+def load_json(path, default):
+    """JSON 파일 로드 (없거나 깨졌으면 기본값)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def save_json_atomic(path, data):
+    """임시 파일에 쓴 뒤 교체하여 중간에 중단돼도 파일이 깨지지 않게 저장"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,34 @@
+"""
+article_store URL 정규화 테스트
+
+실행:
+    python test_article_store.py
+    python -m pytest test_article_store.py
+"""
+
+from article_store import canonicalize_url
+
+
+def test_tracking_params_removed():
+    url = 'http://News.example.com/view?utm_source=x&id=7&fbclid=a&gclid=b&utm_medium=rss#top'
+    assert canonicalize_url(url) == 'https://news.example.com/view?id=7'
+
+
+def test_article_identifying_params_kept():
+    url = 'https://news.naver.com/main/read.naver?sid1=100&oid=001&aid=0012345'
+    assert canonicalize_url(url) == (
+        'https://news.naver.com/main/read.naver?aid=0012345&oid=001&sid1=100')
+    assert canonicalize_url('https://a.kr/news?ref=1') != canonicalize_url('https://a.kr/news?ref=2')
+
+
+def test_scheme_port_and_trailing_slash():
+    assert canonicalize_url('http://a.kr:80/news/123/') == 'https://a.kr/news/123'
+    assert canonicalize_url('https://a.kr:443/') == 'https://a.kr/'
+    assert canonicalize_url('') == ''
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✅ {name}")
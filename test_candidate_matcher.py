@@ -0,0 +1,65 @@
+"""
+candidate_matcher 다중 패턴 매칭 테스트 (겹치는 이름, 별칭, 영문명)
+
+실행:
+    python test_candidate_matcher.py
+    python -m pytest test_candidate_matcher.py
+"""
+
+from candidate_matcher import CandidateMatcher
+
+
+def make_matcher():
+    return CandidateMatcher({
+        '김영환': ['Kim Young-hwan', '김 지사'],
+        '김영': [],
+        '영환': [],
+        '신용한': ['신 전 부위원장'],
+    })
+
+
+def test_overlapping_names_all_reported():
+    matches = make_matcher().find_all("김영환 지사가 말했다")
+    assert [(m[0], m[2], m[3]) for m in matches] == [
+        ('김영', 0, 2), ('김영환', 0, 3), ('영환', 1, 3)]
+
+
+def test_pattern_inside_other_via_failure_link():
+    # '김김영환' 에서 첫 '김' 뒤 실패 링크를 따라가야 '김영환' 을 찾음
+    names = {m[0] for m in make_matcher().find_all("김김영환")}
+    assert names == {'김영', '김영환', '영환'}
+
+
+def test_aliases_and_english_name_case_insensitive():
+    matcher = make_matcher()
+    text = "KIM YOUNG-HWAN met 신 전 부위원장 and 김 지사"
+    assert matcher.mentioned(text) == ['김영환', '신용한']
+    aliases = [m[1] for m in matcher.find_all(text)]
+    assert aliases == ['Kim Young-hwan', '신 전 부위원장', '김 지사']
+    # 원문 위치가 유지되어 슬라이스가 매칭 문자열과 같음
+    for _, alias, start, end in matcher.find_all(text):
+        assert text[start:end].lower() == alias.lower()
+
+
+def test_mentioned_keeps_roster_order():
+    assert make_matcher().mentioned("신용한, 그리고 김영환") == ['김영환', '김영', '영환', '신용한']
+
+
+def test_no_mentions():
+    matcher = make_matcher()
+    assert matcher.find_all("충북 지역 소식") == []
+    assert matcher.mentioned(None) == []
+    assert matcher.mentions_any("") is False
+    assert matcher.mentions_any("…신용한") is True
+
+
+def test_duplicate_alias_registered_once():
+    matcher = CandidateMatcher({'신용한': ['신용한', '']})
+    assert len(matcher.find_all("신용한")) == 1
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✅ {name}")
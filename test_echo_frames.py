@@ -0,0 +1,91 @@
+"""
+echo_frames 묶음별 프레임 분석 합치기 테스트
+
+실행:
+    python test_echo_frames.py
+    python -m pytest test_echo_frames.py
+"""
+
+from echo_frames import MAX_MERGED_FRAMES, merge_echo_frames
+
+
+def frame(name, strength, sentiment='부정', arguments=()):
+    return {'frame_name': name, 'echo_strength': strength, 'sentiment': sentiment,
+            'key_arguments': list(arguments)}
+
+
+def test_same_frame_merged_by_normalised_name():
+    partials = [
+        ({'top_frames': [frame("'무능 프레임'", 0.8, '부정', ['a', 'b'])]}, 3),
+        ({'top_frames': [frame("무능 프레임", 0.4, '긍정', ['b', 'c'])]}, 1),
+    ]
+    merged = merge_echo_frames('김영환', partials)
+    assert len(merged['top_frames']) == 1
+    top = merged['top_frames'][0]
+    assert top['frame_name'] == "'무능 프레임'"        # 처음 나온 이름 유지
+    assert top['echo_strength'] == round((0.8 * 3 + 0.4 * 1) / 4, 2)
+    assert top['sentiment'] == '부정'                  # 가중 다수결
+    assert top['key_arguments'] == ['a', 'b', 'c']
+    assert merged['map_reduce'] == {'chunks': 2, 'reactions': 4}
+
+
+def test_duplicate_frame_within_chunk_counted_once():
+    partials = [
+        ({'top_frames': [frame('무능 프레임', 0.8, '부정', ['a']),
+                         frame("'무능프레임'", 0.9, '긍정', ['b'])]}, 2),
+        ({'top_frames': [frame('무능 프레임', 0.9, '부정')]}, 1),
+    ]
+    top = merge_echo_frames('김영환', partials)['top_frames'][0]
+    # 묶음 안 중복을 모두 더하면 1.43 으로 어느 묶음 값보다 커짐
+    assert top['echo_strength'] == 0.9
+    assert top['key_arguments'] == ['a', 'b']
+    # 첫 묶음은 가장 강한 프레임의 감성(긍정)만 가중치 2로 반영
+    assert top['sentiment'] == '긍정'
+
+
+def test_frame_missing_from_chunk_counts_as_zero():
+    partials = [({'top_frames': [frame('반복', 0.5)]}, 1),
+                ({'top_frames': [frame('반복', 0.5)]}, 1),
+                ({'top_frames': [frame('한번', 1.0)]}, 2)]
+    merged = merge_echo_frames('신용한', partials)
+    assert [(f['frame_name'], f['echo_strength']) for f in merged['top_frames']] == [
+        ('한번', 0.5), ('반복', 0.25)]
+
+
+def test_top_frames_capped_and_sorted():
+    frames = [frame(f'프레임{i}', i / 10) for i in range(MAX_MERGED_FRAMES + 3)]
+    merged = merge_echo_frames('김영환', [({'top_frames': frames}, 1)])
+    strengths = [f['echo_strength'] for f in merged['top_frames']]
+    assert len(strengths) == MAX_MERGED_FRAMES
+    assert strengths == sorted(strengths, reverse=True)
+
+
+def test_scalar_fields_and_bad_values():
+    partials = [
+        ({'top_frames': [frame('', 0.9), frame('x', 'n/a')], 'polarization_index': 0.9,
+          'viral_potential': '높음', 'summary': '작은 묶음'}, 1),
+        ({'top_frames': None, 'polarization_index': 'bad', 'viral_potential': '낮음',
+          'summary': '큰 묶음'}, 3),
+        ({'polarization_index': 0.1, 'summary': '큰 묶음'}, 2),
+    ]
+    merged = merge_echo_frames('김영환', partials)
+    assert [f['frame_name'] for f in merged['top_frames']] == ['x']
+    assert merged['top_frames'][0]['echo_strength'] == 0.0
+    assert merged['polarization_index'] == round((0.9 * 1 + 0.1 * 2) / 3, 2)
+    assert merged['viral_potential'] == '낮음'
+    assert merged['summary'] == '큰 묶음 / 작은 묶음'
+
+
+def test_empty_partials():
+    merged = merge_echo_frames('김영환', [])
+    assert merged['top_frames'] == []
+    assert merged['polarization_index'] == 0.0
+    assert merged['viral_potential'] == '중간'
+    assert merged['map_reduce'] == {'chunks': 0, 'reactions': 0}
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✅ {name}")
@@ -0,0 +1,92 @@
+"""
+feed_stream 워터마크 테스트 (최신순 / 오래된 순 / 날짜 없는 피드)
+
+실행:
+    python test_feed_stream.py
+    python -m pytest test_feed_stream.py
+"""
+
+from email.utils import formatdate
+
+from feed_stream import read_feed
+
+BASE_TS = 1760000000
+
+
+def rss(items):
+    """items: (guid, 발행 시각 오프셋(초) 또는 None) 리스트 -> RSS 바이트"""
+    body = []
+    for guid, offset in items:
+        date = f"<pubDate>{formatdate(BASE_TS + offset)}</pubDate>" if offset is not None else ""
+        body.append(f"<item><title>{guid}</title><link>http://x/{guid}</link>"
+                    f"<guid>{guid}</guid>{date}</item>")
+    return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'{"".join(body)}</channel></rss>').encode('utf-8')
+
+
+def ids(result):
+    return [e['id'] for e in result.entries]
+
+
+def test_newest_first_stops_at_watermark():
+    first = read_feed(rss([('g3', 300), ('g2', 200), ('g1', 100)]))
+    assert ids(first) == ['g3', 'g2', 'g1']
+    assert first.watermark['descending'] is True
+    assert first.watermark['id'] == 'g3'
+
+    second = read_feed(rss([('g5', 500), ('g4', 400), ('g3', 300), ('g2', 200)]),
+                       first.watermark)
+    assert ids(second) == ['g5', 'g4']
+    assert second.stopped_early is True
+    assert second.watermark['id'] == 'g5'
+
+
+def test_newest_first_deleted_watermark_item_stops_by_time():
+    first = read_feed(rss([('g3', 300), ('g2', 200), ('g1', 100)]))
+    second = read_feed(rss([('g4', 400), ('g2', 200), ('g1', 100)]), first.watermark)
+    assert ids(second) == ['g4']
+    assert second.stopped_early is True
+
+
+def test_oldest_first_keeps_new_items():
+    first = read_feed(rss([('g1', 100), ('g2', 200), ('g3', 300)]))
+    assert ids(first) == ['g1', 'g2', 'g3']
+    assert first.watermark['descending'] is False
+    assert first.watermark['id'] == 'g3'  # 피드 첫 항목이 아니라 가장 최신 항목
+
+    second = read_feed(rss([('g1', 100), ('g2', 200), ('g3', 300), ('g4', 400)]),
+                       first.watermark)
+    assert ids(second) == ['g4']
+    assert second.stopped_early is False
+    assert second.skipped == 3
+
+    third = read_feed(rss([('g2', 200), ('g3', 300), ('g4', 400), ('g5', 500)]),
+                      second.watermark)
+    assert ids(third) == ['g5']
+
+
+def test_no_new_items_keeps_watermark():
+    first = read_feed(rss([('g1', 100), ('g2', 200)]))
+    again = read_feed(rss([('g1', 100), ('g2', 200)]), first.watermark)
+    assert ids(again) == []
+    assert again.valid is True
+    assert again.watermark == first.watermark
+
+
+def test_undated_feed_filters_by_guid():
+    first = read_feed(rss([('a', None), ('b', None)]))
+    second = read_feed(rss([('c', None), ('a', None), ('b', None)]), first.watermark)
+    assert ids(second) == ['c']
+
+
+def test_max_items():
+    result = read_feed(rss([('g3', 300), ('g2', 200), ('g1', 100)]), max_items=2)
+    assert ids(result) == ['g3', 'g2']
+    assert result.stopped_early is True
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✅ {name}")
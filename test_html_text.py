@@ -0,0 +1,46 @@
+"""
+html_text 요약문 텍스트 변환 테스트
+
+실행:
+    python test_html_text.py
+    python -m pytest test_html_text.py
+"""
+
+from html_text import html_to_text
+
+
+def test_plain_text_returned_as_is():
+    assert html_to_text("충북도지사 후보 토론회") == "충북도지사 후보 토론회"
+    assert html_to_text('') == ''
+    assert html_to_text(None) == ''
+
+
+def test_tags_removed_and_entities_decoded():
+    markup = '<p>김영환 &amp; 신용한 <b>맞대결</b></p><br/>&#39;접전&#39;'
+    assert html_to_text(markup) == "김영환 & 신용한 맞대결'접전'"
+
+
+def test_escaped_tags_stay_as_text():
+    assert html_to_text('&lt;b&gt;굵게&lt;/b&gt;') == '<b>굵게</b>'
+
+
+def test_comments_script_and_style_dropped():
+    markup = ('앞<!-- 광고 <b>x</b> -->'
+              '<script type="text/javascript">var a = "<p>";</script>'
+              '<STYLE>p > b { color: red }</STYLE>뒤')
+    assert html_to_text(markup) == '앞뒤'
+
+
+def test_quoted_angle_bracket_in_attribute():
+    assert html_to_text('<a title="a > b" href=\'/x\'>링크</a>') == '링크'
+
+
+def test_comparison_operator_is_not_a_tag():
+    assert html_to_text('지지율 a < b 이고 3 <5') == '지지율 a < b 이고 3 <5'
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✅ {name}")
@@ -0,0 +1,195 @@
+"""
+llm_client 모델 정책 테스트 (장애 시 다음 모델로 전환, 헤지 요청, 제공자 확인)
+
+실제 API 대신 _call_provider / _acall_provider 를 모델별로 동작을 정한 가짜 호출로 바꿔서 실행
+(응답 캐시와 호출 기록 파일은 끔)
+
+실행:
+    python test_llm_client.py
+    python -m pytest test_llm_client.py
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+
+os.environ['LLM_CACHE'] = '0'
+os.environ['LLM_TELEMETRY'] = '0'
+
+import llm_client
+import llm_policy
+from llm_policy import FULL, ModelPolicy
+from llm_telemetry import telemetry
+
+SITE = 'test_site'
+PRIMARY = ('anthropic', 'primary-model')
+SECONDARY = ('gemini', 'secondary-model')
+PROVIDER_ENV = ('ANTHROPIC_API_KEY', 'GEMINI_API_KEY', 'LLM_BASE_URL',
+                'ANTHROPIC_BASE_URL', 'GEMINI_BASE_URL')
+
+
+@contextlib.contextmanager
+def environ(**values):
+    """제공자 키/주소 환경변수를 values 로만 설정하고 끝나면 되돌림"""
+    saved = {k: os.environ.get(k) for k in PROVIDER_ENV}
+    for k in PROVIDER_ENV:
+        os.environ.pop(k, None)
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+@contextlib.contextmanager
+def fake_models(behaviour, hedge_after=None):
+    """
+    behaviour: 모델 이름 -> ('ok', 지연 초) 또는 ('error', 예외)
+    SITE 정책은 PRIMARY → SECONDARY 순서
+    """
+    calls = []
+    cancelled = []
+    lock = threading.Lock()
+
+    def call(provider, model, prompt, max_tokens):
+        with lock:
+            calls.append(model)
+        kind, arg = behaviour[model]
+        if kind == 'error':
+            raise arg
+        time.sleep(arg)
+        return f"answer from {model}", {'input_tokens': 1, 'output_tokens': 1}
+
+    async def acall(provider, model, prompt, max_tokens):
+        calls.append(model)
+        kind, arg = behaviour[model]
+        if kind == 'error':
+            raise arg
+        try:
+            await asyncio.sleep(arg)
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+        return f"answer from {model}", {'input_tokens': 1, 'output_tokens': 1}
+
+    policy = ModelPolicy(path=os.devnull)
+    policy.sites[SITE] = {FULL: [PRIMARY, SECONDARY], 'hedge_after': hedge_after}
+    saved = (llm_client._call_provider, llm_client._acall_provider, llm_policy._policy)
+    llm_client._call_provider, llm_client._acall_provider = call, acall
+    llm_policy._policy = policy
+    try:
+        with environ(ANTHROPIC_API_KEY='test', GEMINI_API_KEY='test'):
+            yield calls, cancelled
+    finally:
+        llm_client._call_provider, llm_client._acall_provider, llm_policy._policy = saved
+
+
+def site_records(since):
+    return [r for r in telemetry.records[since:] if r['site'] == SITE]
+
+
+def test_failover_to_next_model():
+    failovers = telemetry.events.get('failover', 0)
+    start = len(telemetry.records)
+    with fake_models({'primary-model': ('error', ConnectionError("down")),
+                      'secondary-model': ('ok', 0)}) as (calls, _):
+        assert llm_client.generate(SITE, "prompt") == "answer from secondary-model"
+    assert calls == ['primary-model', 'secondary-model']
+    assert telemetry.events['failover'] == failovers + 1
+    records = site_records(start)
+    assert [(r['model'], r['error'] is None) for r in records] == [
+        ('primary-model', False), ('secondary-model', True)]
+
+
+def test_failover_async():
+    with fake_models({'primary-model': ('error', ConnectionError("down")),
+                      'secondary-model': ('ok', 0)}) as (calls, _):
+        result = asyncio.run(llm_client.agenerate(SITE, "prompt"))
+    assert result == "answer from secondary-model"
+    assert calls == ['primary-model', 'secondary-model']
+
+
+def test_parse_error_does_not_fail_over():
+    def parse(text):
+        raise ValueError("not json")
+
+    with fake_models({'primary-model': ('ok', 0), 'secondary-model': ('ok', 0)}) as (calls, _):
+        try:
+            llm_client.generate(SITE, "prompt", parse=parse)
+        except llm_client.LLMResponseParseError as e:
+            assert e.response_text == "answer from primary-model"
+        else:
+            raise AssertionError("파싱 실패가 발생하지 않음")
+    assert calls == ['primary-model']
+
+
+def test_last_model_error_is_raised():
+    with fake_models({'primary-model': ('error', ConnectionError("a")),
+                      'secondary-model': ('error', TimeoutError("b"))}):
+        try:
+            llm_client.generate(SITE, "prompt")
+        except TimeoutError:
+            pass
+        else:
+            raise AssertionError("마지막 모델의 오류가 발생하지 않음")
+
+
+def test_hedge_wins_when_primary_is_slow():
+    hedges = telemetry.events.get('hedge', 0)
+    won = telemetry.events.get('hedge_won', 0)
+    with fake_models({'primary-model': ('ok', 0.5), 'secondary-model': ('ok', 0)},
+                     hedge_after=0.05) as (calls, _):
+        started = time.perf_counter()
+        assert llm_client.generate(SITE, "prompt") == "answer from secondary-model"
+        assert time.perf_counter() - started < 0.4  # 느린 첫 모델을 기다리지 않음
+    assert calls == ['primary-model', 'secondary-model']
+    assert telemetry.events['hedge'] == hedges + 1
+    assert telemetry.events['hedge_won'] == won + 1
+
+
+def test_hedge_async_cancels_loser():
+    start = len(telemetry.records)
+    won = telemetry.events.get('hedge_won', 0)
+    with fake_models({'primary-model': ('ok', 5), 'secondary-model': ('ok', 0)},
+                     hedge_after=0.05) as (calls, cancelled):
+        result = asyncio.run(llm_client.agenerate(SITE, "prompt"))
+    assert result == "answer from secondary-model"
+    assert cancelled == ['primary-model']
+    assert telemetry.events['hedge_won'] == won + 1
+    # 성공으로 기록된 호출은 이긴 요청 하나, 취소된 요청은 오류로 기록
+    records = site_records(start)
+    assert [r['model'] for r in records if r['error'] is None] == ['secondary-model']
+    assert [r['model'] for r in records if r['error']] == ['primary-model']
+
+
+def test_no_hedge_when_primary_is_fast():
+    hedges = telemetry.events.get('hedge', 0)
+    with fake_models({'primary-model': ('ok', 0), 'secondary-model': ('ok', 0)},
+                     hedge_after=0.5) as (calls, _):
+        assert llm_client.generate(SITE, "prompt") == "answer from primary-model"
+    assert calls == ['primary-model']
+    assert telemetry.events.get('hedge', 0) == hedges
+
+
+def test_site_available_requires_provider():
+    with environ():
+        assert llm_client.site_available('news_extract') is False
+        status = llm_client.site_status('news_extract')
+        assert 'ANTHROPIC_API_KEY' in status and 'GEMINI_API_KEY' in status
+    with environ(GEMINI_API_KEY='test'):
+        assert llm_client.site_available('news_extract') is True
+    with environ(LLM_BASE_URL='http://127.0.0.1:1'):
+        assert llm_client.site_available('echo_frames') is True
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✅ {name}")
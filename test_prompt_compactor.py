@@ -0,0 +1,100 @@
+"""
+prompt_compactor 압축/묶음 분할 테스트 (예산 경계, 중복 합치기, 우선순위)
+
+실행:
+    python test_prompt_compactor.py
+    python -m pytest test_prompt_compactor.py
+"""
+
+import os
+
+from candidate_matcher import CandidateMatcher
+from prompt_compactor import PromptCompactor
+from tokens import CHARS_PER_TOKEN, estimate_tokens
+
+os.environ.pop('PROMPT_COMPACT', None)
+
+MATCHER = CandidateMatcher({'김영환': [], '신용한': []})
+
+
+def compactor(article=500, echo=1500):
+    return PromptCompactor(MATCHER, budgets={'article': article, 'echo': echo})
+
+
+def snippet(title, text):
+    return {'title': title, 'snippet': text}
+
+
+def test_compact_keeps_mentions_and_drops_boilerplate():
+    text = ("[청주=뉴시스] 홍길동 기자 = 김영환 지사와 신용한 교수가 맞붙었다. "
+            "날씨가 맑았다. 김영환 지사와 신용한 교수가 맞붙었다. "
+            "무단 전재 및 재배포 금지.")
+    assert compactor().compact(text) == "김영환 지사와 신용한 교수가 맞붙었다. 날씨가 맑았다."
+
+
+def test_compact_prefers_two_candidate_sentences_at_budget():
+    both = "김영환 지사와 신용한 교수가 만났다."
+    one = "신용한 교수는 따로 일정을 소화했다."
+    budget = estimate_tokens(both)
+    result = compactor(article=budget).compact(f"{one} {both}")
+    assert result == both
+
+
+def test_compact_without_mentions_keeps_leading_sentences():
+    text = "첫 문장이다. 둘째 문장이다. 셋째 문장이다."
+    budget = estimate_tokens("첫 문장이다.") + estimate_tokens("둘째 문장이다.")
+    assert compactor(article=budget).compact(text) == "첫 문장이다. 둘째 문장이다."
+
+
+def test_compact_truncates_unpunctuated_text_to_budget():
+    result = compactor(article=10).compact("김영환" + "가" * 100)
+    assert len(result) == int(10 * CHARS_PER_TOKEN)
+
+
+def test_compact_disabled():
+    os.environ['PROMPT_COMPACT'] = '0'
+    try:
+        assert compactor().compact("무단 전재 금지") == "무단 전재 금지"
+    finally:
+        del os.environ['PROMPT_COMPACT']
+
+
+def test_snippets_merge_repeats_and_prioritise_mentions():
+    items = [snippet("잡담", "오늘 점심 메뉴"),
+             snippet("김영환 지지", "김영환 최고"),
+             snippet("김영환 지지", "김영환 최고!"),
+             snippet("신용한", "신용한 공약 좋다")]
+    lines = ["- 김영환 지지: 김영환 최고 (×2)", "- 신용한: 신용한 공약 좋다"]
+    budget = sum(estimate_tokens(line) for line in lines)
+    assert compactor(echo=budget).compact_snippets(items).split("\n") == lines
+    # names 로 대상 후보를 좁히면 다른 후보 언급은 우선순위 없음
+    only = compactor(echo=estimate_tokens(lines[1])).compact_snippets(items, names=['신용한'])
+    assert only == lines[1]
+
+
+def test_chunks_fill_budget_exactly_and_keep_everything():
+    items = [snippet(f"반응{i}", "가나다라마바") for i in range(5)]
+    cost = estimate_tokens("- 반응0: 가나다라마바")  # 줄마다 같은 토큰 수
+    chunks = compactor(echo=cost * 2).chunk_snippets(items)
+    assert [c['reactions'] for c in chunks] == [2, 2, 1]
+    assert all(len(c['text'].split("\n")) == c['reactions'] for c in chunks)
+    assert "\n".join(c['text'] for c in chunks).count("가나다라마바") == 5
+
+
+def test_chunks_count_repeats_and_cut_overlong_line():
+    items = [snippet("김영환", "같은 말")] * 3 + [snippet("긴 글", "가" * 200)]
+    chunks = compactor(echo=20).chunk_snippets(items)
+    assert chunks[0] == {'text': "- 김영환: 같은 말 (×3)", 'reactions': 3}
+    assert chunks[1]['reactions'] == 1
+    assert len(chunks[1]['text']) == int(20 * CHARS_PER_TOKEN)
+
+
+def test_chunks_empty():
+    assert compactor().chunk_snippets([]) == []
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✅ {name}")
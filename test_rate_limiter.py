@@ -0,0 +1,95 @@
+"""
+rate_limiter 토큰 버킷 / AIMD 적응 제어 테스트 (시계를 주입해 실제로 기다리지 않음)
+
+실행:
+    python test_rate_limiter.py
+    python -m pytest test_rate_limiter.py
+"""
+
+from rate_limiter import AdaptiveRateLimiter, TokenBucket, is_rate_limit_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def spacing(limiter, n=4):
+    """시간이 흐르지 않을 때 연속 예약의 대기 시간 간격 (= 현재 요청 간격)"""
+    waits = [limiter._reserve(1) for _ in range(n)]
+    return [round(b - a, 6) for a, b in zip(waits, waits[1:])]
+
+
+def test_bucket_burst_then_spacing():
+    bucket = TokenBucket(60, now=0.0)
+    assert [bucket.reserve(1, 0.0) for _ in range(60)] == [0.0] * 60
+    assert bucket.reserve(1, 0.0) == 1.0
+    assert bucket.reserve(1, 0.0) == 2.0
+    assert bucket.reserve(1, 3.0) == 0.0  # 3초 동안 3개 충전
+
+
+def test_rate_limit_slows_down_immediately():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter('t', rpm=60, clock=clock)
+    assert limiter._reserve(1) == 0.0  # 버킷이 가득 찬 상태
+    for attempt in range(3):
+        limiter._on_rate_limited(attempt, RateLimited())
+    assert limiter.factor == 0.125
+    # 잔량이 남아 있었어도 바로 낮춘 속도(60rpm x 0.125 = 8초 간격)로 대기
+    waits = [limiter._reserve(1) for _ in range(3)]
+    assert waits[0] > 0
+    assert spacing(limiter) == [8.0, 8.0, 8.0]
+
+
+def test_recovers_gradually_after_successes():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter('t', rpm=60, clock=clock)
+    for attempt in range(3):
+        limiter._on_rate_limited(attempt, RateLimited())
+
+    for _ in range(5):
+        limiter._on_success()
+    clock.now += 10_000  # 충분히 쉬어도 용량이 배율만큼이라 버스트가 작음
+    assert round(limiter.factor, 3) == 0.375
+    assert round(limiter.requests.capacity, 6) == 22.5
+    for _ in range(22):
+        limiter._reserve(1)
+    partial = spacing(limiter)[-1]
+    assert round(partial, 3) == round(1 / 0.375, 3)
+
+    for _ in range(20):
+        limiter._on_success()
+    assert limiter.factor == 1.0
+    clock.now += 10_000
+    assert [limiter._reserve(1) for _ in range(60)] == [0.0] * 60
+    assert spacing(limiter) == [1.0, 1.0, 1.0]
+
+
+def test_min_factor_and_token_bucket_scaled():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter('t', rpm=6, tpm=600, clock=clock, min_factor=0.1)
+    for attempt in range(10):
+        limiter._on_rate_limited(attempt, RateLimited())
+    assert limiter.factor == 0.1
+    assert limiter.requests.capacity == 1.0          # 요청 1건은 항상 담을 수 있음
+    assert round(limiter.tokens.rate, 6) == round(600 / 60 * 0.1, 6)
+
+
+def test_rate_limit_detection():
+    assert is_rate_limit_error(RateLimited())
+    assert is_rate_limit_error(Exception("429 RESOURCE_EXHAUSTED"))
+    assert not is_rate_limit_error(Exception("기사 https://x/429 파싱 실패"))
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith('test_') and callable(fn):
+            fn()
+            print(f"✅ {name}")
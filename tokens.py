@@ -0,0 +1,13 @@
+"""
+문자 수 기반 토큰 수 추정 (묶음 분할, 프롬프트 압축, 사용량 기록, stub 서버가 함께 씀)
+"""
+
+import math
+
+# 한글 기준 대략적인 문자/토큰 비율 (보수적으로 추정)
+CHARS_PER_TOKEN = 1.5
+
+
+def estimate_tokens(text):
+    """문자 수 기반 토큰 수 추정"""
+    return math.ceil(len(text or '') / CHARS_PER_TOKEN)